@@ -0,0 +1,197 @@
+"""Reproducible benchmarks for TOW.PY.
+
+Every scene is run with the SDL dummy video driver, so no display is needed,
+and every frame advances the simulation by the same time so runs are
+repeatable. For each scene, object count and sprite size the frames per
+second, frame latency percentiles and peak Python memory are reported and
+compared against a stored baseline. The run fails when any benchmark is
+slower than the baseline by more than the threshold.
+
+    python benchmarks/run.py
+    python benchmarks/run.py --scenes moving pong --counts 100 1000
+    python benchmarks/run.py --renderer cells --broadphase
+    python benchmarks/run.py --save-baseline
+
+Baselines are only comparable on the machine they were recorded on.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from towpy import TextOnlyWindow, PygameBackend, HeadlessBackend
+from towpy.profiler import percentile
+from scenes import SCENES, CAMERA_SCENES
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+FRAME_TIME = 16
+
+# (Object counts, sprite sizes) run for each scene unless given
+DEFAULTS = {
+    "static": ((100, 1000), (2, 8)),
+    "moving": ((100, 1000), (2, 8)),
+    "colliders": ((50, 200), (2,)),
+    "large_sprites": ((10, 50), (40, 120)),
+    "pong": ((30, 300), (2,)),
+    "world": ((1000, 30000), (2,)),
+}
+
+
+class BenchmarkBackend(PygameBackend):
+    """Pygame backend that never waits and always reports the same frame time."""
+
+    def tick(self, clock, target_FPS):
+        clock.tick()
+        return FRAME_TIME
+
+
+def run_benchmark(scene, count, size, args):
+    random.seed(args.seed)
+    if args.headless:
+        backend = HeadlessBackend(frame_time=FRAME_TIME)
+    else:
+        backend = BenchmarkBackend()
+
+    tracemalloc.start()
+    tow = TextOnlyWindow(
+        size=(200, 60),
+        renderer=args.renderer,
+        dirty_rects=args.dirty_rects,
+        broadphase=args.broadphase,
+        vectorised_motion=args.vectorised_motion,
+        backend=backend,
+        camera=scene in CAMERA_SCENES,
+    )
+    SCENES[scene](tow, count, size)
+    for _ in range(args.warmup):
+        tow.update()
+        tow.render()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies = []
+    start = perf_counter()
+    for _ in range(args.frames):
+        frame_start = perf_counter()
+        tow.update()
+        tow.render()
+        latencies.append((perf_counter() - frame_start) * 1000)
+    total = perf_counter() - start
+
+    return {
+        "fps": args.frames / total,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "peak_memory_kb": peak_memory / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Get a description of every benchmark slower than its baseline."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if result["fps"] < base["fps"] * (1 - threshold):
+            regressions.append(
+                "%s: %.1f fps, baseline %.1f fps" % (key, result["fps"], base["fps"])
+            )
+        if result["p95"] > base["p95"] * (1 + threshold):
+            regressions.append(
+                "%s: p95 %.2fms, baseline %.2fms" % (key, result["p95"], base["p95"])
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scenes", nargs="+", choices=sorted(SCENES), default=None)
+    parser.add_argument("--counts", nargs="+", type=int, help="Object counts.")
+    parser.add_argument("--sizes", nargs="+", type=int, help="Sprite sizes.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--renderer", choices=("surface", "cells"), default=None)
+    parser.add_argument("--dirty-rects", action="store_true")
+    parser.add_argument("--broadphase", action="store_true")
+    parser.add_argument("--vectorised-motion", action="store_true")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--json", help="Write results to this file.")
+    args = parser.parse_args()
+
+    # Benchmarks with different window options get their own baseline entries
+    options = [
+        name
+        for name in ("dirty_rects", "broadphase", "vectorised_motion", "headless")
+        if getattr(args, name)
+    ]
+    if args.renderer is not None:
+        options.insert(0, args.renderer)
+    variant = "/" + "+".join(options) if options else ""
+
+    results = {}
+    print(
+        "%-40s %10s %9s %9s %9s %11s"
+        % ("benchmark", "fps", "p50", "p95", "p99", "peak KiB")
+    )
+    for scene in args.scenes or sorted(SCENES):
+        counts, sizes = DEFAULTS[scene]
+        for count in args.counts or counts:
+            for size in args.sizes or sizes:
+                key = "%s[count=%d,size=%d]%s" % (scene, count, size, variant)
+                result = run_benchmark(scene, count, size, args)
+                results[key] = result
+                print(
+                    "%-40s %10.1f %7.2fms %7.2fms %7.2fms %11.0f"
+                    % (
+                        key,
+                        result["fps"],
+                        result["p50"],
+                        result["p95"],
+                        result["p99"],
+                        result["peak_memory_kb"],
+                    )
+                )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print("Saved baseline to %s" % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at %s, nothing to compare." % args.baseline)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    if regressions:
+        return 1
+    print("No regressions over %d%% against baseline." % (args.threshold * 100))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
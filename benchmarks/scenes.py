@@ -0,0 +1,167 @@
+"""Benchmark scenes. Every scene takes a window, an object count and a sprite
+size in characters, and fills the window with objects to simulate."""
+
+import os
+import random
+import tempfile
+from towpy import TextObject
+from towpy.component import MovementComponent, ColliderComponent
+
+
+def sprite(size, char="#"):
+    return [char * size] * size
+
+
+class Wrapping(TextObject):
+    """TextObject that wraps around the edges of the window."""
+
+    def __init__(self, text, pos, bounds):
+        TextObject.__init__(self, text, pos)
+        self.bounds = bounds
+
+    def update(self, dt):
+        self.position[0] %= self.bounds[0]
+        self.position[1] %= self.bounds[1]
+
+
+def random_position(tow):
+    return [random.randrange(tow.WIDTH), random.randrange(tow.HEIGHT)]
+
+
+def random_mover(tow, text, speed=0.1):
+    obj = Wrapping(text, random_position(tow), (tow.WIDTH, tow.HEIGHT))
+    obj.add_component(MovementComponent(speed))
+    obj.movementcomponent.move(
+        random.uniform(-speed, speed), random.uniform(-speed, speed)
+    )
+    return obj
+
+
+def static(tow, count, size):
+    """Objects that never move or change."""
+    for _ in range(count):
+        tow.add_object(TextObject(sprite(size), random_position(tow)))
+
+
+def moving(tow, count, size):
+    """Objects moving with a MovementComponent."""
+    for _ in range(count):
+        tow.add_object(random_mover(tow, sprite(size, "@")))
+
+
+def colliders(tow, count, size):
+    """Moving objects where every object collides with every other one."""
+    objects = [random_mover(tow, sprite(size, "o")) for _ in range(count)]
+    for obj in objects:
+        collider = ColliderComponent()
+        for other in objects:
+            if other is not obj:
+                collider.add_collider(other, obj.movementcomponent.reverse_x)
+        obj.add_component(collider)
+        tow.add_object(obj)
+
+
+def large_sprites(tow, count, size):
+    """Objects loaded from a sprite file with load_from_file."""
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    lines = ["".join(random.choice("#%&*+=") for _ in range(size)) for _ in range(size)]
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(lines))
+    try:
+        for _ in range(count):
+            obj = TextObject("", random_position(tow))
+            obj.load_from_file(path, (200, 200, 200), None)
+            tow.add_object(obj)
+    finally:
+        os.remove(path)
+
+
+class Ball(TextObject):
+    def __init__(self, pos, size):
+        TextObject.__init__(self, sprite(size, "@"), pos)
+        self.start_pos = list(pos)
+
+    def reverse_ball(self, paddle):
+        self.movementcomponent.reverse_x()
+        ball_center_y = self.position[1] + (self.size[1] // 2)
+        paddle_center_y = paddle.position[1] + (paddle.size[1] // 2)
+        self.movementcomponent.current_speed_y += (
+            (ball_center_y - paddle_center_y) / paddle.size[1] / 4
+        )
+
+    def reset_ball(self):
+        self.position = list(self.start_pos)
+        self.movementcomponent.stop_y()
+
+
+class Paddle(TextObject):
+    def __init__(self, pos, ball, size):
+        TextObject.__init__(self, ["=" * size] + ["|" * size] * 4 + ["=" * size], pos)
+        self.ball = ball
+
+    def update(self, dt):
+        self.movementcomponent.follow(self.ball, 15)
+
+
+def pong(tow, count, size):
+    """Many games of pong, one ball and two AI paddles each, sharing walls."""
+    for _ in range(max(1, count // 3)):
+        y = random.randrange(tow.HEIGHT // 4, tow.HEIGHT * 3 // 4)
+        ball = Ball([tow.WIDTH // 2, y], size)
+        ball.add_component(MovementComponent(0.3))
+        ball.movementcomponent.move_left()
+        ball.movementcomponent.current_speed_y = random.uniform(-0.2, 0.2)
+
+        paddles = [
+            Paddle([20, y], ball, size),
+            Paddle([tow.WIDTH - 20, y], ball, size),
+        ]
+        collider = ColliderComponent()
+        for paddle in paddles:
+            paddle.add_component(MovementComponent((0, 0.3)))
+            collider.add_collider(paddle, ball.reverse_ball, pass_back=True)
+        collider.add_collider((0, 0, tow.WIDTH, 1), ball.movementcomponent.reverse_y)
+        collider.add_collider(
+            (0, tow.HEIGHT - 1, tow.WIDTH, 1), ball.movementcomponent.reverse_y
+        )
+        collider.add_collider((0, 0, 1, tow.HEIGHT), ball.reset_ball)
+        collider.add_collider((tow.WIDTH - 1, 0, 1, tow.HEIGHT), ball.reset_ball)
+        ball.add_component(collider)
+
+        tow.add_object(ball)
+        for paddle in paddles:
+            tow.add_object(paddle)
+
+
+class Scout(TextObject):
+    """Moving TextObject the camera follows."""
+
+    def update(self, dt):
+        self.window.camera.centre_on(self.position)
+
+
+def world(tow, count, size):
+    """Objects with components standing still across a world 8 windows wide
+    and high, seen through a camera following one moving object."""
+    for _ in range(count):
+        pos = [random.randrange(tow.WIDTH * 8), random.randrange(tow.HEIGHT * 8)]
+        obj = TextObject(sprite(size, "*"), pos)
+        obj.add_component(MovementComponent(0.1))
+        tow.add_object(obj)
+
+    scout = Scout(sprite(size, "@"), [tow.WIDTH * 4, tow.HEIGHT * 4])
+    scout.add_component(MovementComponent(0.2))
+    scout.movementcomponent.move(0.2, 0.1)
+    tow.add_object(scout)
+
+
+SCENES = {
+    "static": static,
+    "moving": moving,
+    "colliders": colliders,
+    "large_sprites": large_sprites,
+    "pong": pong,
+    "world": world,
+}
+# Scenes viewed through a camera
+CAMERA_SCENES = {"world"}
@@ -0,0 +1,38 @@
+"""Fireworks example using a ParticleEmitter"""
+
+import random
+from towpy import TextOnlyWindow, TextObject
+from towpy.particles import ParticleEmitter
+
+
+class Launcher(TextObject):
+    def __init__(self, emitter):
+        TextObject.__init__(self, [" "], [0, 0])
+        self.emitter = emitter
+        self.time = 0
+
+    def update(self, dt):
+        self.time += dt
+        if self.time >= 400:
+            self.time = 0
+            origin = (
+                random.uniform(0.2, 0.8) * self.emitter.size[0],
+                random.uniform(0.2, 0.6) * self.emitter.size[1],
+            )
+            self.emitter.emit(2000, origin)
+
+
+if __name__ == "__main__":
+    tow = TextOnlyWindow(size=(120, 40))
+    emitter = ParticleEmitter(
+        [0, 0],
+        (120, 40),
+        glyphs="@*+.",
+        colours=[(255, 255, 200), (255, 200, 0), (255, 80, 0), (120, 0, 0)],
+        lifetime=(600, 1400),
+        speed=(0.02, 0.25),
+        gravity=(0, 0.0002),
+    )
+    tow.add_object(emitter)
+    tow.add_object(Launcher(emitter))
+    tow.run()
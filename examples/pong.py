@@ -1,7 +1,8 @@
 """Pong example using TOW.PY"""
 
 from towpy import TextObject
-from towpy.component import ColliderComponent, MovementComponent, ControlComponent
+from towpy.component import Component, ColliderComponent, MovementComponent
+from towpy.component import ControlComponent
 from towpy import TextOnlyWindow
 import pygame
 
@@ -33,6 +34,20 @@ class Ball(TextObject):
         self.movementcomponent.stop_y()
 
 
+class FollowComponent(Component):
+
+    # The AI only decides where to go 10 times a second
+    interval = 100
+
+    def __init__(self, target, max_distance=0):
+        Component.__init__(self)
+        self.target = target
+        self.max_distance = max_distance
+
+    def update(self, dt):
+        self.root.movementcomponent.follow(self.target, self.max_distance)
+
+
 class Paddle(TextObject):
 
     SPRITE = ["==", "||", "||", "||", "||", "=="]
@@ -42,6 +57,8 @@ class Paddle(TextObject):
         self.set_position(start_pos)
         self.player_controlled = player_controlled
         self.ball = ball
+        if not player_controlled:
+            self.add_component(FollowComponent(ball, 15))
 
     def set_position(self, pos):
         self.start_pos = pos
@@ -50,10 +67,6 @@ class Paddle(TextObject):
     def reset_paddle(self, other_object=None):
         self.position = list(self.start_pos)
 
-    def update(self, dt):
-        if not self.player_controlled:
-            self.movementcomponent.follow(self.ball, 15)
-
 
 class Score(TextObject):
     SPRITE = ["0"]
@@ -67,67 +80,83 @@ class Score(TextObject):
         self.set_sprite(str(self.score))
 
 
-tow = TextOnlyWindow(size=(80, 32))
-
-divider = TextObject(["|"] * 80, [0, 0])
-ball = Ball([0, 0])
-paddle1 = Paddle([0, 0], player_controlled=True)
-paddle2 = Paddle([0, 0], ball=ball, player_controlled=True)
-score1 = Score([tow.WIDTH // 4, 0])
-score2 = Score([tow.WIDTH - (tow.WIDTH // 4), 0])
-
-divider.position = [(tow.WIDTH // 2) - (divider.size[0] // 2), 0]
-ball.set_position(
-    [(tow.WIDTH // 2) - (ball.size[0] // 2), (tow.HEIGHT // 2) - (ball.size[1] // 2),]
-)
-paddle1.set_position([20, (tow.HEIGHT // 2) - (paddle1.size[1] // 2)])
-paddle2.set_position(
-    [tow.WIDTH - 20 - paddle2.size[0], (tow.HEIGHT // 2) - (paddle2.size[1] // 2),]
-)
-
-paddle1.add_component(MovementComponent((0, 0.3)))
-paddle2.add_component(MovementComponent((0, 0.3)))
-ball.add_component(MovementComponent(0.3))
-ball.movementcomponent.move_left()
-
-control_component = ControlComponent()
-control_component.on_key_hold(pygame.K_w, paddle1.movementcomponent.move_up)
-control_component.on_key_hold(pygame.K_s, paddle1.movementcomponent.move_down)
-control_component.on_key_hold(
-    [pygame.K_w, pygame.K_s], paddle1.movementcomponent.stop, reverse=True
-)
-paddle1.add_component(control_component)
-
-control_component = ControlComponent()
-control_component.on_key_hold(pygame.K_UP, paddle2.movementcomponent.move_up)
-control_component.on_key_hold(pygame.K_DOWN, paddle2.movementcomponent.move_down)
-control_component.on_key_hold(
-    [pygame.K_UP, pygame.K_DOWN], paddle2.movementcomponent.stop, reverse=True
-)
-paddle2.add_component(control_component)
-
-ball_collider = ColliderComponent()
-ball_collider.add_collider(paddle1, ball.reverse_ball, pass_back=True)
-ball_collider.add_collider(paddle2, ball.reverse_ball, pass_back=True)
-ball_collider.add_collider((0, 0, tow.WIDTH, 1), ball.movementcomponent.reverse_y)
-ball_collider.add_collider(
-    (0, tow.HEIGHT - 1, tow.WIDTH, 1), ball.movementcomponent.reverse_y
-)
-ball_collider.add_collider(
-    (0, 0, 1, tow.HEIGHT),
-    [ball.reset_ball, paddle1.reset_paddle, paddle2.reset_paddle, score2.add_score],
-)
-ball_collider.add_collider(
-    (tow.WIDTH - 1, 0, 1, tow.HEIGHT),
-    [ball.reset_ball, paddle1.reset_paddle, paddle2.reset_paddle, score1.add_score],
-)
-ball.add_component(ball_collider)
-
-tow.add_object(divider)
-tow.add_object(ball)
-tow.add_object(paddle1)
-tow.add_object(paddle2)
-tow.add_object(score1)
-tow.add_object(score2)
-
-tow.run()
+def setup(tow):
+    """Add a game of pong to a window. Returns the ball, paddles and scores."""
+    divider = TextObject(["|"] * 80, [0, 0])
+    ball = Ball([0, 0])
+    paddle1 = Paddle([0, 0], player_controlled=True)
+    paddle2 = Paddle([0, 0], ball=ball, player_controlled=False)
+    score1 = Score([tow.WIDTH // 4, 0])
+    score2 = Score([tow.WIDTH - (tow.WIDTH // 4), 0])
+
+    divider.position = [(tow.WIDTH // 2) - (divider.size[0] // 2), 0]
+    ball.set_position(
+        [
+            (tow.WIDTH // 2) - (ball.size[0] // 2),
+            (tow.HEIGHT // 2) - (ball.size[1] // 2),
+        ]
+    )
+    paddle1.set_position([20, (tow.HEIGHT // 2) - (paddle1.size[1] // 2)])
+    paddle2.set_position(
+        [
+            tow.WIDTH - 20 - paddle2.size[0],
+            (tow.HEIGHT // 2) - (paddle2.size[1] // 2),
+        ]
+    )
+
+    paddle1.add_component(MovementComponent((0, 0.3)))
+    paddle2.add_component(MovementComponent((0, 0.3)))
+    ball.add_component(MovementComponent(0.3))
+    ball.movementcomponent.move_left()
+
+    control_component = ControlComponent()
+    control_component.on_key_hold(pygame.K_w, paddle1.movementcomponent.move_up)
+    control_component.on_key_hold(pygame.K_s, paddle1.movementcomponent.move_down)
+    control_component.on_key_hold(
+        [pygame.K_w, pygame.K_s], paddle1.movementcomponent.stop, reverse=True
+    )
+    paddle1.add_component(control_component)
+
+    # Stopping when no key is held would undo every move of the AI
+    if paddle2.player_controlled:
+        control_component = ControlComponent()
+        control_component.on_key_hold(pygame.K_UP, paddle2.movementcomponent.move_up)
+        control_component.on_key_hold(
+            pygame.K_DOWN, paddle2.movementcomponent.move_down
+        )
+        control_component.on_key_hold(
+            [pygame.K_UP, pygame.K_DOWN], paddle2.movementcomponent.stop, reverse=True
+        )
+        paddle2.add_component(control_component)
+
+    ball_collider = ColliderComponent()
+    ball_collider.add_collider(paddle1, ball.reverse_ball, pass_back=True)
+    ball_collider.add_collider(paddle2, ball.reverse_ball, pass_back=True)
+    ball_collider.add_collider((0, 0, tow.WIDTH, 1), ball.movementcomponent.reverse_y)
+    ball_collider.add_collider(
+        (0, tow.HEIGHT - 1, tow.WIDTH, 1), ball.movementcomponent.reverse_y
+    )
+    ball_collider.add_collider(
+        (0, 0, 1, tow.HEIGHT),
+        [ball.reset_ball, paddle1.reset_paddle, paddle2.reset_paddle, score2.add_score],
+    )
+    ball_collider.add_collider(
+        (tow.WIDTH - 1, 0, 1, tow.HEIGHT),
+        [ball.reset_ball, paddle1.reset_paddle, paddle2.reset_paddle, score1.add_score],
+    )
+    ball.add_component(ball_collider)
+
+    tow.add_object(divider)
+    tow.add_object(ball)
+    tow.add_object(paddle1)
+    tow.add_object(paddle2)
+    tow.add_object(score1)
+    tow.add_object(score2)
+
+    return ball, paddle1, paddle2, score1, score2
+
+
+if __name__ == "__main__":
+    tow = TextOnlyWindow(size=(80, 32))
+    setup(tow)
+    tow.run()
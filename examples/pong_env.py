@@ -0,0 +1,45 @@
+"""Pong as a headless environment, stepped many times in parallel with VecEnv.
+The left paddle is controlled by actions, the right paddle is left idle."""
+
+import random
+import time
+import pygame
+from towpy.vecenv import Environment, VecEnv
+from pong import setup
+
+
+class PongEnv(Environment):
+
+    # Nothing, up or down
+    actions = [(), (pygame.K_w,), (pygame.K_s,)]
+
+    def __init__(self):
+        Environment.__init__(self, size=(80, 32))
+
+    def build(self, window):
+        self.ball, _, _, self.score1, self.score2 = setup(window)
+        self.scores = (0, 0)
+
+    def reward(self):
+        scores = (self.score1.score, self.score2.score)
+        reward = (scores[0] - self.scores[0]) - (scores[1] - self.scores[1])
+        self.scores = scores
+        return reward
+
+    def done(self):
+        return max(self.scores) >= 5
+
+
+if __name__ == "__main__":
+    steps = 1000
+    with VecEnv(PongEnv, 16) as envs:
+        observations = envs.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            actions = [random.randrange(3) for _ in range(envs.num_envs)]
+            observations, rewards, dones = envs.step(actions)
+        elapsed = time.perf_counter() - start
+    print(
+        "%d envs on %d processes: %.0f steps per second"
+        % (envs.num_envs, envs.processes, steps * envs.num_envs / elapsed)
+    )
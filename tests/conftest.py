@@ -0,0 +1,4 @@
+import os
+
+# Windows are never shown while testing
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
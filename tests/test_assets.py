@@ -0,0 +1,47 @@
+import os
+from towpy import TextObject
+from towpy.assets import sprite_assets
+
+
+def test_same_sprite_is_shared():
+    first = TextObject(["<o>", "/ \\"], (0, 0), (1, 2, 3))
+    second = TextObject(["<o>", "/ \\"], (10, 0), (1, 2, 3))
+    other = TextObject(["<o>", "/ \\"], (10, 0), (4, 5, 6))
+    assert first.default_text is second.default_text
+    assert first.default_text is not other.default_text
+    assert first.get_cells() is second.get_cells()
+
+
+def test_copy_on_write():
+    first = TextObject("abc", (0, 0))
+    second = TextObject("abc", (0, 0))
+    first.set_colour_at((0, 1), (9, 9, 9))
+    assert first.default_text is not second.default_text
+    assert first.default_text[0][1] == ("b", (9, 9, 9), None)
+    assert second.default_text[0][1] == ("b", (255, 255, 255), None)
+    assert TextObject("abc", (0, 0)).default_text is second.default_text
+
+    text = second.own_text()
+    assert text is second.own_text()
+    text.fill("#")
+    second.mark_dirty()
+    assert TextObject("abc", (0, 0)).default_text[0][0][0] == "a"
+
+
+def test_load_from_file_reads_modified_files_again(tmp_path):
+    path = tmp_path / "sprite.txt"
+    path.write_text("ab\ncd")
+    first = TextObject("", (0, 0))
+    first.load_from_file(str(path), (255, 255, 255), None)
+    second = TextObject("", (0, 0))
+    sprite_assets.reset_stats()
+    second.load_from_file(str(path), (255, 255, 255), None)
+    assert first.default_text is second.default_text
+    assert sprite_assets.hits == 1
+
+    path.write_text("xy")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second.load_from_file(str(path), (255, 255, 255), None)
+    assert [cell[0] for cell in second.default_text[0]] == ["x", "y"]
+    assert [cell[0] for cell in first.default_text[0]] == ["a", "b"]
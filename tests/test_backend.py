@@ -0,0 +1,31 @@
+import io
+import pytest
+from towpy import TextOnlyWindow, TextObject, AnsiBackend
+
+
+class Interrupted(TextObject):
+
+    def update(self, dt):
+        raise KeyboardInterrupt
+
+
+def test_ansi_terminal_restored_when_run_is_interrupted():
+    stream = io.StringIO()
+    tow = TextOnlyWindow((10, 5), backend=AnsiBackend(stream))
+    tow.target_FPS = 0
+    tow.add_object(Interrupted("x", (0, 0)))
+    assert "\x1b[?1049h\x1b[?25l" in stream.getvalue()
+    with pytest.raises(KeyboardInterrupt):
+        tow.run()
+    assert stream.getvalue().endswith("\x1b[0m\x1b[?25h\x1b[?1049l")
+
+
+def test_ansi_close_only_restores_once():
+    stream = io.StringIO()
+    backend = AnsiBackend(stream)
+    backend.close()
+    assert stream.getvalue() == ""
+    backend.open((80, 32), "TOW.PY")
+    backend.close()
+    backend.close()
+    assert stream.getvalue().count("\x1b[?1049l") == 1
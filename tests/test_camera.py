@@ -0,0 +1,81 @@
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, MovementComponent
+from towpy import config
+
+
+def make_window(**kwargs):
+    return TextOnlyWindow(
+        (20, 10),
+        renderer="cells",
+        camera=True,
+        backend=HeadlessBackend(frame_time=16),
+        **kwargs
+    )
+
+
+def cells(columns, rows):
+    width, height = config.cell_size
+    return [columns * width, rows * height]
+
+
+def test_only_objects_in_view_are_visible():
+    tow = make_window()
+    inside = TextObject("a", cells(5, 5))
+    edge = TextObject("bb", cells(19, 9))
+    outside = TextObject("c", cells(40, 5))
+    for text_object in (outside, inside, edge):
+        tow.add_object(text_object)
+    assert tow.camera.visible() == [outside, inside, edge][1:]
+
+    tow.camera.move(*cells(30, 0))
+    assert tow.camera.visible() == [outside]
+    tow.render()
+    assert tow.backend.get_text()[5][10] == "c"
+
+
+def test_objects_moved_in_place_are_rehashed():
+    tow = make_window()
+    text_object = TextObject("a", cells(40, 5))
+    tow.add_object(text_object)
+    assert tow.camera.visible() == []
+
+    text_object.position[0] = cells(3, 0)[0]
+    assert tow.camera.visible() == [text_object]
+    text_object.position = cells(3, 40)
+    assert tow.camera.visible() == []
+
+
+def test_moving_objects_are_rehashed():
+    tow = make_window()
+    mover = TextObject(">", cells(18, 0))
+    mover.add_component(MovementComponent(1))
+    mover.movementcomponent.move_right()
+    tow.add_object(mover)
+    assert tow.camera.visible() == [mover]
+    for _ in range(4):
+        tow.update()
+        tow.render()
+    assert tow.camera.visible() == []
+
+
+def test_motion_system_objects_are_rehashed():
+    tow = make_window(vectorised_motion=True)
+    mover = TextObject(">", cells(18, 0))
+    mover.add_component(MovementComponent(1))
+    mover.movementcomponent.move_right()
+    tow.add_object(mover)
+    for _ in range(4):
+        tow.update()
+        tow.render()
+    assert tow.camera.visible() == []
+    tow.camera.centre_on(mover.position)
+    tow.render()
+    assert tow.camera.visible() == [mover]
+
+
+def test_sprite_changes_are_rehashed():
+    tow = make_window()
+    text_object = TextObject("a", cells(-5, 0))
+    tow.add_object(text_object)
+    assert tow.camera.visible() == []
+    text_object.set_sprite("a" * 10)
+    assert tow.camera.visible() == [text_object]
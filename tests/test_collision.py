@@ -0,0 +1,80 @@
+import pytest
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend
+from towpy import ColliderComponent, MovementComponent
+from towpy.pool import ObjectPool
+
+
+def make_window(**kwargs):
+    return TextOnlyWindow(
+        (20, 10), backend=HeadlessBackend(frame_time=16), **kwargs
+    )
+
+
+def collider_with(target):
+    hits = []
+    player = TextObject("@", (0, 0))
+    collider = ColliderComponent()
+    player.add_component(collider)
+    collider.add_collider(target, lambda: hits.append(target))
+    return player, hits
+
+
+def test_target_outside_window_is_hit():
+    tow = make_window()
+    target = TextObject("#", (0, 0))
+    player, hits = collider_with(target)
+    tow.add_object(player)
+    tow.update()
+    assert hits == [target]
+
+
+def test_removed_target_is_not_hit():
+    tow = make_window()
+    target = TextObject("#", (0, 0))
+    player, hits = collider_with(target)
+    tow.add_object(player)
+    tow.add_object(target)
+    tow.remove_object(target)
+    tow.update()
+    tow.render()
+    tow.update()
+    assert hits == []
+
+    tow.add_object(target)
+    tow.update()
+    assert hits == [target]
+
+
+def test_pooled_target_is_hit_again_once_reused():
+    tow = make_window()
+    pool = ObjectPool(lambda: TextObject("#", (0, 0)))
+    target = pool.spawn(tow)
+    player, hits = collider_with(target)
+    tow.add_object(player)
+    tow.remove_object(target)
+    tow.render()
+    tow.update()
+    assert hits == []
+
+    assert pool.acquire() is target
+    tow.update()
+    assert hits == [target]
+
+
+@pytest.mark.parametrize("broadphase", [False, True])
+def test_removed_objects_stop_moving_and_colliding_straight_away(broadphase):
+    tow = make_window(broadphase=broadphase, vectorised_motion=True)
+    bullet = TextObject("-", (0, 0))
+    bullet.add_component(MovementComponent(1))
+    bullet.movementcomponent.move_right()
+    wall = TextObject("#", (0, 0))
+    player, hits = collider_with(wall)
+    tow.add_object(bullet)
+    tow.add_object(wall)
+    tow.add_object(player)
+
+    tow.remove_object(bullet)
+    tow.remove_object(player)
+    tow.update()
+    assert bullet.position[0] == 0
+    assert hits == []
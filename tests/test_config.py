@@ -0,0 +1,34 @@
+import json
+from towpy import config
+
+
+def use_cache(monkeypatch, tmp_path):
+    path = tmp_path / "fonts.json"
+    monkeypatch.setattr(config, "FONT_CACHE", str(path))
+    monkeypatch.setattr(config, "_font_cache", True)
+    return path
+
+
+def test_cached_font_used_while_it_exists(monkeypatch, tmp_path):
+    cache = use_cache(monkeypatch, tmp_path)
+    font = tmp_path / "font.ttf"
+    font.write_bytes(b"font")
+    config._store_font(str(font), (8, 16))
+    assert config._cached_font()["cell_size"] == [8, 16]
+
+    font.unlink()
+    assert config._cached_font() is None
+    assert json.loads(cache.read_text())
+
+
+def test_default_font_not_cached(monkeypatch, tmp_path):
+    cache = use_cache(monkeypatch, tmp_path)
+    config._store_font(None, (8, 16))
+    assert not cache.exists()
+
+    cache.write_text(
+        json.dumps(
+            {config._font_key(): {"path": None, "mtime": None, "cell_size": [8, 16]}}
+        )
+    )
+    assert config._cached_font() is None
@@ -0,0 +1,75 @@
+import random
+import pygame
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, PygameBackend
+from towpy import MovementComponent
+
+
+class SurfaceBackend(PygameBackend):
+    """Draws into an off screen surface instead of a display."""
+
+    def open(self, size, caption):
+        pygame.init()
+        self.surface = pygame.Surface(size)
+        return self.surface
+
+    def present_surface(self, rects=None):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_window(dirty_rects):
+    return TextOnlyWindow(
+        (30, 12), dirty_rects=dirty_rects, backend=SurfaceBackend()
+    )
+
+
+def scene(tow, seed):
+    random.seed(seed)
+    objects = []
+    for i in range(12):
+        text_object = TextObject("#" * (i % 3 + 1), (i * 20, i * 15))
+        text_object.add_component(MovementComponent(0.05))
+        text_object.movementcomponent.move(
+            random.uniform(-0.05, 0.05), random.uniform(-0.05, 0.05)
+        )
+        tow.add_object(text_object)
+        objects.append(text_object)
+    return objects
+
+
+def test_dirty_rects_match_full_rendering():
+    full = make_window(False)
+    dirty = make_window(True)
+    full_objects = scene(full, 1)
+    dirty_objects = scene(dirty, 1)
+    for frame in range(30):
+        for objects in (full_objects, dirty_objects):
+            if frame == 10:
+                objects[3].hidden = True
+                objects[4].set_sprite("@@@@")
+            if frame == 20:
+                objects[3].hidden = False
+        for tow in (full, dirty):
+            tow.step(16)
+            tow.render()
+        assert pygame.image.tobytes(full.surface, "RGB") == pygame.image.tobytes(
+            dirty.surface, "RGB"
+        )
+
+
+def test_hidden_object_removed_and_added_again():
+    tow = make_window(True)
+    text_object = TextObject("x", (0, 0))
+    text_object.hidden = True
+    tow.add_object(text_object)
+    tow.render()
+    tow.remove_object(text_object)
+    tow.render()
+    tow.add_object(text_object)
+    tow.add_object(TextObject("y", (0, 0)))
+    tow.render()
+    text_object.hidden = False
+    text_object.changed = True
+    tow.render()
@@ -0,0 +1,75 @@
+import pygame
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, ControlComponent
+from towpy.keyboard import Keyboard
+
+
+def key(type, code):
+    return pygame.event.Event(type, key=code)
+
+
+def make_window():
+    return TextOnlyWindow(
+        (20, 10), renderer="cells", backend=HeadlessBackend(frame_time=16)
+    )
+
+
+def test_events_go_only_to_handlers_of_their_key():
+    keyboard = Keyboard()
+    log = []
+    keyboard.add_handler(pygame.K_a, lambda: log.append("a"))
+    keyboard.add_handler([pygame.K_a, pygame.K_b], lambda: log.append("ab"))
+    keyboard.add_handler(pygame.K_b, lambda: log.append("b up"), up=True)
+    keyboard.update([key(pygame.KEYDOWN, pygame.K_a)])
+    assert log == ["a", "ab"]
+    assert keyboard.pressed == {pygame.K_a}
+    assert keyboard[pygame.K_a]
+
+    keyboard.update([key(pygame.KEYDOWN, pygame.K_b), key(pygame.KEYUP, pygame.K_b)])
+    assert log == ["a", "ab", "ab", "b up"]
+    assert keyboard.released == {pygame.K_b}
+    assert not keyboard[pygame.K_b]
+    assert keyboard[pygame.K_a]
+
+
+def test_removed_handler_is_not_called():
+    keyboard = Keyboard()
+    log = []
+
+    def handler():
+        log.append("a")
+
+    keyboard.add_handler(pygame.K_a, handler)
+    keyboard.remove_handler(pygame.K_a, handler)
+    keyboard.update([key(pygame.KEYDOWN, pygame.K_a)])
+    assert log == []
+    assert pygame.K_a not in keyboard.down_handlers
+
+
+def test_control_component_dispatch():
+    tow = make_window()
+    log = []
+    control = ControlComponent()
+    control.on_key_down(pygame.K_a, lambda: log.append("down"))
+    control.on_key_down(pygame.K_a, lambda: log.append("up"), reverse=True)
+    control.on_key_hold(pygame.K_d, lambda: log.append("hold"))
+    text_object = TextObject("x", (0, 0))
+    text_object.add_component(control)
+    tow.add_object(text_object)
+
+    for event in (
+        key(pygame.KEYDOWN, pygame.K_a),
+        key(pygame.KEYUP, pygame.K_a),
+        key(pygame.KEYDOWN, pygame.K_d),
+        None,
+        key(pygame.KEYUP, pygame.K_d),
+    ):
+        if event is not None:
+            tow.backend.post(event)
+        tow.update()
+    assert log == ["down", "up", "hold", "hold"]
+
+    tow.remove_object(text_object)
+    tow.backend.post(key(pygame.KEYDOWN, pygame.K_a))
+    tow.update()
+    assert log == ["down", "up", "hold", "hold"]
+    assert not tow.keyboard.down_handlers
@@ -0,0 +1,54 @@
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, MovementComponent
+from towpy import config
+
+
+def make_window(**kwargs):
+    tow = TextOnlyWindow(
+        (10, 3),
+        renderer="cells",
+        backend=HeadlessBackend(frame_time=16),
+        **kwargs
+    )
+    tow.add_layer("background", -1, static=True)
+    return tow
+
+
+def cells(columns, rows):
+    width, height = config.cell_size
+    return [columns * width, rows * height]
+
+
+def frame(tow):
+    tow.render()
+    return tow.backend.get_text()
+
+
+def test_static_layer_redrawn_after_move_in_place():
+    tow = make_window()
+    text_object = TextObject("#", cells(0, 0))
+    tow.add_object(text_object, "background")
+    assert frame(tow)[0] == "#         "
+    text_object.position[0] += cells(2, 0)[0]
+    assert frame(tow)[0] == "  #       "
+
+
+def test_static_layer_redrawn_after_hiding():
+    tow = make_window()
+    text_object = TextObject("#", cells(0, 1))
+    tow.add_object(text_object, "background")
+    assert frame(tow)[1] == "#         "
+    text_object.hidden = True
+    assert frame(tow)[1] == "          "
+    text_object.hidden = False
+    assert frame(tow)[1] == "#         "
+
+
+def test_static_layer_redrawn_after_motion_system_move():
+    tow = make_window(vectorised_motion=True)
+    text_object = TextObject("#", cells(0, 2))
+    text_object.add_component(MovementComponent(1))
+    tow.add_object(text_object, "background")
+    assert frame(tow)[2] == "#         "
+    text_object.movementcomponent.current_speed_x = cells(3, 0)[0] / 16
+    tow.step(16)
+    assert frame(tow)[2] == "   #      "
@@ -0,0 +1,46 @@
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, Component
+from towpy.backend import Backend
+
+
+class SleepingBackend(HeadlessBackend):
+    """Headless, but sleeping for real while the window is idle."""
+
+    def wait_events(self, timeout):
+        Backend.wait_events(self, timeout)
+
+
+class Counter(Component):
+
+    interval = 150
+
+    def __init__(self):
+        Component.__init__(self)
+        self.updates = 0
+
+    def update(self, dt):
+        self.updates += 1
+
+
+def test_idle_sleep_left_out_of_dt():
+    tow = TextOnlyWindow((10, 5), backend=SleepingBackend())
+    tow.add_object(TextObject("x", (0, 0)))
+    pacer = tow.enable_pacing(target_FPS=0, idle_frames=1, idle_timeout=200)
+    for _ in range(4):
+        tow.update()
+        tow.render()
+    assert pacer.idle_time >= 150
+    assert tow.dt < 100
+    assert tow.scheduler.time >= pacer.idle_time
+
+
+def test_interval_components_due_over_idle_sleep():
+    tow = TextOnlyWindow((10, 5), backend=SleepingBackend())
+    counter = Counter()
+    text_object = TextObject("x", (0, 0))
+    text_object.add_component(counter)
+    tow.add_object(text_object)
+    pacer = tow.enable_pacing(target_FPS=30, idle_frames=1, idle_timeout=1000)
+    while pacer.idle_time < 300:
+        tow.update()
+        tow.render()
+    assert counter.updates >= 2
@@ -0,0 +1,34 @@
+import io
+import pygame
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend
+from towpy.recording import Player
+
+
+def test_skipped_frames_are_recorded():
+    tow = TextOnlyWindow(
+        (10, 5), renderer="cells", backend=HeadlessBackend(frame_time=16)
+    )
+    tow.add_object(TextObject("x", (0, 0)))
+    pacer = tow.enable_pacing(target_FPS=0, idle_frames=None)
+    file = io.BytesIO()
+    tow.start_recording(file, keyframe_interval=4)
+    for frame in range(10):
+        if frame == 5:
+            tow.backend.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        tow.update()
+        tow.render()
+    assert pacer.skipped["unchanged"] == 9
+
+    file.seek(0)
+    player = Player(file)
+    assert len(player) == 10
+    dts = []
+    events = []
+    while player.next():
+        dts.append(player.dt)
+        events.extend(player.events)
+        assert player.get_text()[0].startswith("x")
+    assert dts == [16] * 10
+    assert [(event.type, event.key) for event in events] == [
+        (pygame.KEYDOWN, pygame.K_a)
+    ]
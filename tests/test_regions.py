@@ -0,0 +1,55 @@
+import pytest
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend
+
+
+def chars(text_object):
+    return ["".join(cell[0] or "." for cell in row) for row in text_object.default_text]
+
+
+def test_fill_is_clipped_to_the_text_object():
+    text_object = TextObject(["abcd", "efgh", "ijkl"], (0, 0))
+    text_object.fill("#", (1, 2, 5, 5), colour=(1, 2, 3))
+    assert chars(text_object) == ["abcd", "ef##", "ij##"]
+    assert text_object.default_text[1][1] == ("f", (255, 255, 255), None)
+    assert text_object.default_text[1][2] == ("#", (1, 2, 3), None)
+
+
+def test_fill_with_mask_and_transparency():
+    text_object = TextObject(["abcd", "efgh"], (0, 0))
+    text_object.fill(None, (0, 1, 2, 3), mask=["x x", " x "])
+    assert chars(text_object) == ["a.c.", "ef.h"]
+    with pytest.raises(ValueError):
+        text_object.fill("##")
+
+
+def test_blit_skips_missing_characters_and_clips():
+    text_object = TextObject(["....", "...."], (0, 0))
+    text_object.fill("-")
+    source = TextObject(["XY", "Z"], (0, 0))
+    source.apply_mask([" x"])
+    text_object.blit(source, (1, 2))
+    assert chars(text_object) == ["----", "---Y"]
+    text_object.blit(source, (-1, -1))
+    assert chars(text_object) == ["----", "---Y"]
+    text_object.blit(source.default_text, (0, -1))
+    assert chars(text_object) == ["Y---", "---Y"]
+
+
+def test_apply_mask_leaves_cells_outside_the_mask():
+    text_object = TextObject(["abcd", "efgh", "ijkl"], (0, 0))
+    text_object.apply_mask([" xxx", "xx"], (1, 0))
+    assert chars(text_object) == ["abcd", ".fgh", "ijkl"]
+
+
+def test_masked_cells_show_what_is_beneath():
+    tow = TextOnlyWindow(
+        (4, 1), renderer="cells", backend=HeadlessBackend(frame_time=16)
+    )
+    tow.add_object(TextObject("....", (0, 0)))
+    text_object = TextObject("abcd", (0, 0))
+    tow.add_object(text_object)
+    tow.render()
+    assert tow.backend.get_text() == ["abcd"]
+    text_object.apply_mask(["x  x"])
+    tow.render()
+    assert tow.backend.get_text() == ["a..d"]
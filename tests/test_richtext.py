@@ -0,0 +1,33 @@
+from towpy.richtext import RichText, Palette, DIRECT, palette
+from towpy.framebuffer import cells_from_rich_text
+
+
+def test_palette_stops_growing_at_max_size():
+    colours = Palette(max_size=3)
+    assert colours.index((1, 2, 3)) == 1
+    assert colours.index((4, 5, 6)) == 2
+    value = colours.index((7, 8, 9))
+    assert value & DIRECT
+    assert len(colours) == 3
+    assert colours.index((7, 8, 9)) == value
+    assert colours.index((1, 2, 3)) == 1
+    assert colours.colour(value) == (7, 8, 9)
+    assert colours.colour(1) == (1, 2, 3)
+    assert colours.colour(0) is None
+
+
+def test_rich_text_colours_once_palette_is_full(monkeypatch):
+    monkeypatch.setattr(palette, "max_size", len(palette))
+    size = len(palette)
+    text = RichText.from_text("ab", (250, 1, 2), None)
+    text.set_background_at((0, 1), (3, 250, 4))
+    assert len(palette) == size
+    assert text[0] == [("a", (250, 1, 2), None), ("b", (250, 1, 2), (3, 250, 4))]
+    assert [cell[3:] for cell in text.characters()] == [
+        ((250, 1, 2), None),
+        ((250, 1, 2), (3, 250, 4)),
+    ]
+
+    codes, fg, bg = cells_from_rich_text(text)
+    assert fg.tolist() == [[0xFA0102, 0xFA0102]]
+    assert bg.tolist() == [[1 << 24, 0x03FA04]]
@@ -0,0 +1,72 @@
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, Component
+from towpy import MovementComponent, ColliderComponent
+
+
+class Follow(Component):
+
+    interval = 100
+
+    def __init__(self):
+        Component.__init__(self)
+        self.elapsed = []
+
+    def update(self, dt):
+        self.elapsed.append(dt)
+
+
+def make_window(**kwargs):
+    return TextOnlyWindow(
+        (20, 10), backend=HeadlessBackend(frame_time=16), **kwargs
+    )
+
+
+def mover(x=0):
+    text_object = TextObject(">", (x, 0))
+    text_object.add_component(MovementComponent(1))
+    text_object.add_component(ColliderComponent())
+    text_object.movementcomponent.move_right()
+    return text_object
+
+
+def test_system_integrated_movers_are_not_scheduled():
+    tow = make_window(broadphase=True, vectorised_motion=True)
+    movers = [mover() for _ in range(100)]
+    for text_object in movers:
+        tow.add_object(text_object)
+    tow.update()
+    assert tow.scheduler.active() == []
+    assert movers[0].position[0] == 16
+
+
+def test_movers_without_systems_are_scheduled():
+    tow = make_window()
+    movers = [mover() for _ in range(3)]
+    for text_object in movers:
+        tow.add_object(text_object)
+    tow.update()
+    assert tow.scheduler.active() == movers
+    assert movers[0].position[0] == 16
+
+
+def test_mover_scheduled_once_removed_from_its_system():
+    tow = make_window(broadphase=True, vectorised_motion=True)
+    text_object = mover()
+    tow.add_object(text_object)
+    assert tow.scheduler.active() == []
+    tow.remove_object(text_object)
+    tow.render()
+    other = make_window()
+    other.add_object(text_object)
+    assert other.scheduler.active() == [text_object]
+
+
+def test_interval_components_run_when_due():
+    tow = make_window()
+    follow = Follow()
+    text_object = TextObject("x", (0, 0))
+    text_object.add_component(follow)
+    tow.add_object(text_object)
+    assert tow.scheduler.active() == []
+    for _ in range(20):
+        tow.update()
+    assert follow.elapsed == [112, 96, 96]
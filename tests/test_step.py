@@ -0,0 +1,100 @@
+import asyncio
+from towpy import TextOnlyWindow, TextObject, HeadlessBackend, Component
+
+
+class Counter(Component):
+
+    def __init__(self):
+        Component.__init__(self)
+        self.updates = 0
+
+    def update(self, dt):
+        self.updates += 1
+
+
+class AsyncCounter(Counter):
+
+    async def update(self, dt):
+        await asyncio.sleep(0)
+        self.updates += 1
+
+
+class Grouped(TextObject):
+    """Updates its components itself, twice a step."""
+
+    def handle_components(self, dt):
+        for component in self.components:
+            component.update(dt)
+            component.update(dt)
+
+
+def make_window():
+    return TextOnlyWindow((20, 10), backend=HeadlessBackend(frame_time=16))
+
+
+def grouped():
+    text_object = Grouped("x", (0, 0))
+    text_object.add_component(Counter())
+    return text_object
+
+
+def test_overridden_handle_components_used_by_every_step():
+    tow = make_window()
+    text_object = grouped()
+    tow.add_object(text_object)
+    tow.step(16)
+    tow.enable_profiler().begin_frame()
+    tow.step(16)
+    asyncio.run(tow.step_async(16))
+    assert text_object.counter.updates == 6
+
+
+def test_step_async_awaits_coroutine_updates():
+    tow = make_window()
+    text_object = TextObject("x", (0, 0))
+    text_object.add_component(AsyncCounter())
+    text_object.add_component(Counter())
+    tow.add_object(text_object)
+    asyncio.run(tow.step_async(16))
+    assert text_object.asynccounter.updates == 1
+    assert text_object.counter.updates == 1
+
+
+def test_step_async_is_profiled():
+    tow = make_window()
+    text_object = TextObject("x", (0, 0))
+    text_object.add_component(AsyncCounter())
+    tow.add_object(text_object)
+    profiler = tow.enable_profiler()
+    profiler.begin_frame()
+    asyncio.run(tow.step_async(16))
+    assert text_object in profiler.object_costs
+    assert "AsyncCounter" in profiler.component_costs
+
+
+def test_object_added_again_not_interpolated_from_old_position():
+    tow = make_window()
+    tow.set_fixed_timestep(10)
+    text_object = TextObject("x", (0, 0))
+    tow.add_object(text_object)
+    tow.update()
+    tow.render()
+    assert text_object.render_position is not None
+    tow.remove_object(text_object)
+    tow.render()
+    text_object.position = [100, 100]
+    tow.add_object(text_object)
+    tow.render()
+    assert text_object.previous_position is None
+    assert text_object.render_position is None
+
+
+def test_text_objects_listed_in_order_added():
+    tow = make_window()
+    first, second, third = (TextObject(char, (0, 0)) for char in "abc")
+    for text_object in (first, second, third):
+        tow.add_object(text_object)
+    tow.remove_object(second)
+    tow.render()
+    assert tow.text_objects == [first, third]
+    assert tow.text_objects[-1] is third
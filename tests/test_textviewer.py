@@ -0,0 +1,85 @@
+import threading
+import time
+from towpy import TextOnlyWindow, HeadlessBackend
+from towpy.textviewer import TextViewer
+
+
+def write_lines(path, count, mode="w"):
+    with open(path, mode) as file:
+        for i in range(count):
+            file.write("line %d\n" % i)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def make_viewer(path, **kwargs):
+    tow = TextOnlyWindow(
+        (10, 3), renderer="cells", backend=HeadlessBackend(frame_time=16)
+    )
+    viewer = TextViewer(str(path), (0, 0), (10, 3), **kwargs)
+    viewer.index.poll = 0.01
+    tow.add_object(viewer)
+    return tow, viewer
+
+
+def frame(tow):
+    tow.step(16)
+    tow.render()
+    return [row.rstrip() for row in tow.backend.get_text()]
+
+
+def test_scroll(tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 200)
+    tow, viewer = make_viewer(path)
+    wait_for(lambda: viewer.index.complete)
+    assert frame(tow) == ["line 0", "line 1", "line 2"]
+    viewer.scroll(100)
+    assert frame(tow) == ["line 100", "line 101", "line 102"]
+    viewer.page(-1)
+    viewer.scroll(0, 5)
+    assert frame(tow) == ["97", "98", "99"]
+    viewer.scroll_to(1000)
+    assert frame(tow) == ["line 197", "line 198", "line 199"]
+    viewer.close()
+
+
+def test_follow(tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 10)
+    tow, viewer = make_viewer(path, follow=True)
+    wait_for(lambda: viewer.index.line_count == 10)
+    assert frame(tow) == ["line 7", "line 8", "line 9"]
+    write_lines(path, 70, "a")
+    wait_for(lambda: viewer.index.line_count == 80)
+    assert frame(tow) == ["line 67", "line 68", "line 69"]
+    viewer.close()
+
+
+def test_truncate(tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 100)
+    tow, viewer = make_viewer(path, follow=True)
+    wait_for(lambda: viewer.index.line_count == 100)
+    write_lines(path, 2)
+    wait_for(lambda: viewer.index.line_count == 2 and viewer.index.complete)
+    assert frame(tow) == ["line 0", "line 1", ""]
+    viewer.close()
+
+
+def test_removed_viewer_closes_file(tmp_path):
+    path = tmp_path / "log.txt"
+    write_lines(path, 10)
+    threads = threading.active_count()
+    tow, viewer = make_viewer(path, follow=True)
+    wait_for(lambda: viewer.index.line_count == 10)
+    assert threading.active_count() == threads + 1
+    tow.remove_object(viewer)
+    frame(tow)
+    assert threading.active_count() == threads
+    assert viewer.index.get_lines(0, 3) == []
@@ -0,0 +1,32 @@
+import pygame
+from towpy import TextObject
+from towpy.vecenv import Environment, VecEnv
+
+
+class MoverEnv(Environment):
+
+    actions = [(), (pygame.K_d,)]
+
+    def __init__(self):
+        Environment.__init__(self, size=(8, 4))
+
+    def build(self, window):
+        window.add_object(TextObject("@", (0, 0)))
+
+
+def test_observations_readable_after_close():
+    with VecEnv(MoverEnv, 2, processes=1) as envs:
+        observations = envs.reset()
+        observations, rewards, dones = envs.step([0, 1])
+        expected = int(observations.sum())
+    assert envs.closed
+    assert int(observations.sum()) == expected
+    assert observations[0, 0, 0, 0] == ord("@")
+    assert rewards.tolist() == [0, 0]
+
+
+def test_in_process_environments():
+    with VecEnv(MoverEnv, 3, processes=0) as envs:
+        observations = envs.reset()
+    assert observations.shape == (3, 3, 4, 8)
+    assert observations[2, 0, 0, 0] == ord("@")
@@ -1,4 +1,12 @@
 from towpy.tow import TextOnlyWindow
 from towpy.textobject import TextObject
+from towpy.backend import PygameBackend, HeadlessBackend, AnsiBackend
 from towpy.component import *
 from towpy.config import *
+
+
+def __getattr__(name):
+    # Font and cell size are loaded on first use, see towpy.config
+    if name in ("font", "cell_size"):
+        return getattr(config, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,153 @@
+import os
+import pygame
+from typing import Tuple, Generic, NoReturn
+from weakref import WeakValueDictionary
+from towpy import config
+from towpy.config import glyph_cache
+from towpy.framebuffer import cells_from_rich_text
+from towpy.richtext import RichText
+
+Colour = Tuple[int, int, int]
+
+
+def prerender(rich_text: RichText) -> "pygame.Surface":
+    """Render every character of some RichText onto a transparent surface
+    the size of the text.
+
+    Arguments:
+    rich_text -- The RichText to render.
+    """
+    cell_width, cell_height = config.cell_size
+    sprite = pygame.Surface(
+        (rich_text.width * cell_width, rich_text.height * cell_height),
+        pygame.SRCALPHA,
+    )
+    blits = [
+        (
+            glyph_cache.get(char, colour, background),
+            (col * cell_width, row * cell_height),
+        )
+        for row, col, char, colour, background in rich_text.characters()
+    ]
+    sprite.blits(blits, doreturn=False)
+    return sprite
+
+
+class SpriteAsset:
+    """A parsed sprite shared between every TextObject made from the same
+    source. The pre rendered surface and cell arrays are built once, on first
+    use, for all of them. The RichText of an asset must not be edited, a
+    TextObject takes its own copy before changing it.
+
+    Arguments:
+    text -- The parsed RichText.
+    """
+
+    __slots__ = ("text", "surface", "cells", "__weakref__")
+
+    def __init__(self, text: RichText):
+        self.text = text
+        self.surface = None
+        self.cells = None
+
+    def get_surface(self) -> "pygame.Surface":
+        if self.surface is None:
+            self.surface = prerender(self.text)
+        return self.surface
+
+    def get_cells(self) -> "Cells":
+        if self.cells is None:
+            self.cells = cells_from_rich_text(self.text)
+        return self.cells
+
+    def invalidate(self) -> NoReturn:
+        """Rebuild the surface and cells on next use."""
+        self.surface = None
+        self.cells = None
+
+
+class AssetCache:
+    """Interns parsed sprites so identical sprites are only parsed, and
+    rendered, once. Sprites are keyed by their content and colours, sprite
+    files by their path and modification time. Assets are held weakly and
+    are dropped once no TextObject uses them.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._assets = WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def get(self, text: Generic, colour: Colour, background: Colour) -> SpriteAsset:
+        """Get the shared asset of a sprite, parsing it on a cache miss.
+
+        Arguments:
+        text -- Some text format, e.g. string or list of chars to be converted.
+        colour -- (R, G, B) colour format for font.
+        background -- (R, G, B) colour format for background.
+        """
+        content = text if type(text) is str else tuple(text)
+        key = ("text", content, self.__hashable(colour), self.__hashable(background))
+        try:
+            return self.__lookup(key, text, colour, background)
+        except TypeError:
+            # Lines given as lists of characters are not hashable
+            return SpriteAsset(RichText.from_text(text, colour, background))
+
+    def load(self, file: str, colour: Colour, background: Colour) -> SpriteAsset:
+        """Get the shared asset of a sprite file, reading it if it is not
+        cached or has been modified since.
+
+        Arguments:
+        file -- Location of file to load from.
+        colour -- (R, G, B) colour format for font.
+        background -- (R, G, B) colour format for background.
+        """
+        path = os.path.abspath(file)
+        key = (
+            "file",
+            path,
+            os.stat(path).st_mtime_ns,
+            self.__hashable(colour),
+            self.__hashable(background),
+        )
+        asset = self._assets.get(key)
+        if asset is not None:
+            self.hits += 1
+            return asset
+
+        with open(path) as f:
+            return self.__lookup(key, f.read(), colour, background)
+
+    def clear(self) -> NoReturn:
+        """Forget every asset. TextObjects keep the assets they use."""
+        self._assets.clear()
+
+    def reset_stats(self) -> NoReturn:
+        """Reset the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def __lookup(
+        self, key: Tuple, text: Generic, colour: Colour, background: Colour
+    ) -> SpriteAsset:
+        asset = self._assets.get(key)
+        if asset is not None:
+            self.hits += 1
+            return asset
+
+        self.misses += 1
+        asset = SpriteAsset(RichText.from_text(text, colour, background))
+        self._assets[key] = asset
+        return asset
+
+    @staticmethod
+    def __hashable(colour: Colour) -> Colour:
+        return None if colour is None else tuple(colour)
+
+
+# Shared by every TextObject
+sprite_assets = AssetCache()
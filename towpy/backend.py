@@ -0,0 +1,257 @@
+import sys
+import time
+import pygame
+from collections import deque
+from typing import Tuple, List, Sequence, TextIO, NoReturn
+from towpy import config
+from towpy.richtext import NO_COLOUR, unpack_colour
+from towpy.framebuffer import np
+
+Size = Tuple[int, int]
+Colour = Tuple[int, int, int]
+Rect = Tuple[int, int, int, int]
+
+
+class Backend:
+    """Where a TextOnlyWindow presents frames and gets its events from.
+    Backends without a surface can only be used with the cell renderer.
+    """
+
+    has_surface = False
+
+    def open(self, size: Size, caption: str) -> "pygame.Surface":
+        """Open the output. Returns the surface to draw on, if any.
+
+        Arguments:
+        size -- Size of the window in pixels.
+        caption -- Title of the window.
+        """
+        return None
+
+    def poll_events(self) -> List["pygame.event.Event"]:
+        """Get every event since the last poll."""
+        return []
+
+    def wait_events(self, timeout: int) -> NoReturn:
+        """Sleep until an event arrives or a timeout passes, without taking
+        the event from the next poll.
+
+        Arguments:
+        timeout -- Longest time in ms to wait.
+        """
+        time.sleep(timeout / 1000)
+
+    def get_pressed(self) -> Sequence:
+        """Get a snapshot of held keys like pygame.key.get_pressed(), or None
+        if held keys should be tracked from key events instead.
+        """
+        return None
+
+    def tick(self, clock: "pygame.time.Clock", target_FPS: int) -> int:
+        """Wait for the next frame. Returns ms since the last frame.
+
+        Arguments:
+        clock -- The pygame clock of the window.
+        target_FPS -- Frames per second to limit to.
+        """
+        return clock.tick(target_FPS)
+
+    def present_surface(self, rects: List[Rect] = None) -> NoReturn:
+        """Show the surface, or only some areas of it.
+
+        Arguments:
+        rects -- Areas of the surface to show, None for everything.
+        """
+        raise NotImplementedError("Backend has no surface to present.")
+
+    def present_cells(
+        self, framebuffer: "CellFramebuffer", changed: "np.ndarray"
+    ) -> NoReturn:
+        """Show the cells of a framebuffer that changed.
+
+        Arguments:
+        framebuffer -- The CellFramebuffer of the window.
+        changed -- Boolean grid of cells that changed since the last frame.
+        """
+        raise NotImplementedError("This should be an overrided method.")
+
+    def close(self) -> NoReturn:
+        pass
+
+
+class PygameBackend(Backend):
+    """Presents frames in a pygame display window."""
+
+    has_surface = True
+
+    def __init__(self):
+        self.surface = None
+        # Event taken while waiting, given back by the next poll
+        self.__waited = []
+
+    def open(self, size: Size, caption: str) -> "pygame.Surface":
+        if not pygame.get_init():
+            pygame.init()
+        self.surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+        return self.surface
+
+    def poll_events(self) -> List["pygame.event.Event"]:
+        events, self.__waited = self.__waited, []
+        events.extend(pygame.event.get())
+        return events
+
+    def wait_events(self, timeout: int) -> NoReturn:
+        if self.__waited or pygame.event.peek():
+            return
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.__waited.append(event)
+
+    def get_pressed(self) -> Sequence:
+        return pygame.key.get_pressed()
+
+    def present_surface(self, rects: List[Rect] = None) -> NoReturn:
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+    def present_cells(
+        self, framebuffer: "CellFramebuffer", changed: "np.ndarray"
+    ) -> NoReturn:
+        pygame.display.update(framebuffer.rasterise(self.surface, changed))
+
+    def close(self) -> NoReturn:
+        """Uninitialises pygame library if needed."""
+        if pygame.get_init():
+            pygame.quit()
+
+
+class HeadlessBackend(Backend):
+    """Keeps frames in memory without any display. The cell grid of the last
+    frame can be read back for assertions and events can be posted by hand.
+    Frames are not limited and run as fast as possible.
+
+    Arguments:
+    frame_time -- If given, every frame advances time by this many ms instead
+                  of the real time since the last frame.
+    """
+
+    def __init__(self, frame_time: int = None):
+        self.frame_time = frame_time
+        self.framebuffer = None
+        self.__events = deque()
+
+    def post(self, event: "pygame.event.Event") -> NoReturn:
+        """Queue an event for the next poll.
+
+        Arguments:
+        event -- A pygame event, e.g. pygame.event.Event(pygame.KEYDOWN, key=k).
+        """
+        self.__events.append(event)
+
+    def poll_events(self) -> List["pygame.event.Event"]:
+        events = list(self.__events)
+        self.__events.clear()
+        return events
+
+    def wait_events(self, timeout: int) -> NoReturn:
+        # Time is not waited for, like frames
+        pass
+
+    def tick(self, clock: "pygame.time.Clock", target_FPS: int) -> int:
+        dt = clock.tick()
+        if self.frame_time is not None:
+            return self.frame_time
+        return dt
+
+    def present_cells(
+        self, framebuffer: "CellFramebuffer", changed: "np.ndarray"
+    ) -> NoReturn:
+        self.framebuffer = framebuffer
+
+    def get_text(self) -> List[str]:
+        """Get the characters of the last frame as one string per row."""
+        if self.framebuffer is None:
+            return []
+        return ["".join(map(chr, row)) for row in self.framebuffer.codes.tolist()]
+
+    def get_cell(self, column: int, row: int) -> Tuple[str, Colour, Colour]:
+        """Get (Character, Foreground Colour, Background Colour) of a cell in
+        the last frame.
+
+        Arguments:
+        column -- Column of the cell.
+        row -- Row of the cell.
+        """
+        framebuffer = self.framebuffer
+        return (
+            chr(framebuffer.codes[row, column]),
+            unpack_colour(int(framebuffer.fg[row, column])),
+            unpack_colour(int(framebuffer.bg[row, column])),
+        )
+
+
+class AnsiBackend(Backend):
+    """Presents frames in a terminal using ANSI escape sequences. Only cells
+    that changed are written, moving the cursor and switching colour only
+    when needed. Keyboard input is not read from the terminal.
+
+    Arguments:
+    stream -- Text stream of the terminal, stdout by default.
+    """
+
+    def __init__(self, stream: TextIO = None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.rows = 0
+        # Colours the terminal is currently set to
+        self.__fg = self.__bg = None
+        self.__open = False
+
+    def open(self, size: Size, caption: str) -> "pygame.Surface":
+        self.rows = size[1] // config.cell_size[1]
+        # Set title, switch to the alternate screen, hide cursor and clear it
+        self.stream.write("\x1b]0;%s\x07\x1b[?1049h\x1b[?25l\x1b[2J" % caption)
+        self.stream.flush()
+        self.__open = True
+        return None
+
+    def present_cells(
+        self, framebuffer: "CellFramebuffer", changed: "np.ndarray"
+    ) -> NoReturn:
+        rows, cols = np.nonzero(changed)
+        codes = framebuffer.codes[rows, cols].tolist()
+        fg = framebuffer.fg[rows, cols].tolist()
+        bg = framebuffer.bg[rows, cols].tolist()
+
+        out = []
+        cursor = None
+        current_fg, current_bg = self.__fg, self.__bg
+        for row, col, code, colour, background in zip(
+            rows.tolist(), cols.tolist(), codes, fg, bg
+        ):
+            if cursor != (row, col):
+                out.append("\x1b[%d;%dH" % (row + 1, col + 1))
+            # Foreground of a space is never seen
+            if colour != current_fg and colour != NO_COLOUR:
+                out.append("\x1b[38;2;%d;%d;%dm" % unpack_colour(colour))
+                current_fg = colour
+            if background != current_bg:
+                out.append("\x1b[48;2;%d;%d;%dm" % unpack_colour(background))
+                current_bg = background
+            out.append(chr(code))
+            cursor = (row, col + 1)
+
+        self.__fg, self.__bg = current_fg, current_bg
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+    def close(self) -> NoReturn:
+        if not self.__open:
+            return
+        # Reset colours, show cursor and go back to the screen of the shell
+        self.__fg = self.__bg = None
+        self.stream.write("\x1b[0m\x1b[?25h\x1b[?1049l")
+        self.stream.flush()
+        self.__open = False
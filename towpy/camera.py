@@ -0,0 +1,166 @@
+from typing import Tuple, List, NoReturn
+from towpy import config
+from towpy.collision import SpatialHash
+from towpy.textobject import TextObject
+
+Position = Tuple[int, int]
+Size = Tuple[int, int]
+Rect = Tuple[float, float, float, float]
+
+
+class Camera:
+    """Scrollable viewport over a world larger than the window. TextObjects
+    are positioned in world pixels and drawn relative to the camera. Every
+    TextObject of the window is kept in a spatial hash, so finding the ones
+    in view costs about the same however large the world is.
+
+    TextObjects tell the camera when they move or change size and only those
+    are rehashed before the next query, so objects standing still cost
+    nothing however many there are.
+
+    Arguments:
+    size -- Size of the viewport in pixels.
+    position -- World pixel position of the top left of the viewport.
+    bucket_cells -- Width and height of each spatial hash bucket in cells.
+    """
+
+    def __init__(
+        self, size: Size, position: Position = (0, 0), bucket_cells: int = 16
+    ):
+        self.size = tuple(size)
+        self.position = list(position)
+        self.index = SpatialHash(bucket_cells)
+        # Rect every object was hashed with and its draw order
+        self.__rects = {}
+        self.__order = {}
+        # TextObjects that moved since the last query
+        self.__moved = {}
+        self.__next_order = 0
+
+    def __len__(self) -> int:
+        return len(self.__rects)
+
+    def move(self, x: float, y: float) -> NoReturn:
+        """Scroll the viewport.
+
+        Arguments:
+        x -- Pixels to scroll right.
+        y -- Pixels to scroll down.
+        """
+        self.position[0] += x
+        self.position[1] += y
+
+    def centre_on(self, pos: Position) -> NoReturn:
+        """Scroll the viewport so a world position is in its centre.
+
+        Arguments:
+        pos -- World pixel position.
+        """
+        self.position[0] = pos[0] - self.size[0] // 2
+        self.position[1] = pos[1] - self.size[1] // 2
+
+    def get_offset(self) -> Position:
+        """Get the position of the viewport snapped to the cell grid, which
+        is subtracted from world positions when drawing.
+        """
+        x, y = self.position
+        return (x - (x % config.cell_size[0]), y - (y % config.cell_size[1]))
+
+    def get_rect(self) -> Rect:
+        """Get the area of the world in view."""
+        x, y = self.get_offset()
+        return (x, y, self.size[0], self.size[1])
+
+    def to_world(self, pos: Position) -> Position:
+        """Convert a window pixel position, e.g. of the mouse, to the world.
+
+        Arguments:
+        pos -- Pixel position in the window.
+        """
+        x, y = self.get_offset()
+        return (pos[0] + x, pos[1] + y)
+
+    def to_screen(self, pos: Position) -> Position:
+        """Convert a world pixel position to the window.
+
+        Arguments:
+        pos -- World pixel position.
+        """
+        x, y = self.get_offset()
+        return (pos[0] - x, pos[1] - y)
+
+    def add(self, text_object: TextObject) -> NoReturn:
+        """Start tracking a TextObject. Objects added later are drawn on top.
+
+        Arguments:
+        text_object -- The TextObject to track.
+        """
+        if text_object not in self.__order:
+            self.__order[text_object] = self.__next_order
+            self.__next_order += 1
+        self.refresh(text_object)
+
+    def remove(self, text_object: TextObject) -> NoReturn:
+        """Stop tracking a TextObject.
+
+        Arguments:
+        text_object -- The TextObject to stop tracking.
+        """
+        rect = self.__rects.pop(text_object)
+        self.index.remove(text_object, rect)
+        del self.__order[text_object]
+        self.__moved.pop(text_object, None)
+
+    def moved(self, text_object: TextObject) -> NoReturn:
+        """Rehash a TextObject before the next query, as it moved or changed
+        size.
+
+        Arguments:
+        text_object -- The tracked TextObject.
+        """
+        self.__moved[text_object] = None
+
+    def refresh(self, text_object: TextObject) -> NoReturn:
+        """Rehash a TextObject after it moved or changed size.
+
+        Arguments:
+        text_object -- The tracked TextObject.
+        """
+        x, y = text_object.get_draw_position()
+        rect = (x, y, text_object.size[0], text_object.size[1])
+        last_rect = self.__rects.get(text_object)
+        if rect == last_rect:
+            return
+        if last_rect is not None:
+            self.index.remove(text_object, last_rect)
+        self.index.insert(text_object, rect)
+        self.__rects[text_object] = rect
+
+    def visible(self) -> List[TextObject]:
+        """Get every TextObject overlapping the viewport, in draw order.
+        Hidden TextObjects are included.
+        """
+        if self.__moved:
+            moved, self.__moved = self.__moved, {}
+            for text_object in moved:
+                if text_object in self.__rects:
+                    self.refresh(text_object)
+
+        x, y, width, height = self.get_rect()
+        rects = self.__rects
+        found = [
+            text_object
+            for text_object in self.index.query((x, y, width, height))
+            if self.__overlaps(rects[text_object], x, y, width, height)
+        ]
+        found.sort(key=self.__order.__getitem__)
+        return found
+
+    @staticmethod
+    def __overlaps(rect: Rect, x: float, y: float, width: float, height: float):
+        return (
+            rect[0] < x + width
+            and x < rect[0] + rect[2]
+            and rect[1] < y + height
+            and y < rect[1] + rect[3]
+        )
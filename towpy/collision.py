@@ -0,0 +1,194 @@
+from collections import defaultdict
+from typing import Tuple, Set, Iterator, Hashable, NoReturn
+from towpy import config
+
+Rect = Tuple[float, float, float, float]
+
+
+class SpatialHash:
+    """Uniform grid of buckets mapping areas of the window to the items that
+    overlap them. Items are found by area in near constant time instead of
+    checking every item.
+
+    Arguments:
+    bucket_cells -- Width and height of each bucket in character cells.
+    """
+
+    def __init__(self, bucket_cells: int = 4):
+        self.bucket_width = bucket_cells * config.cell_size[0]
+        self.bucket_height = bucket_cells * config.cell_size[1]
+        self.buckets = defaultdict(list)
+
+    def keys(self, rect: Rect) -> Iterator[Tuple[int, int]]:
+        """Iterate over the keys of every bucket a rect touches.
+
+        Arguments:
+        rect -- (X, Y, Width, Height) area in pixels.
+        """
+        x, y, width, height = rect
+        left = int(x // self.bucket_width)
+        top = int(y // self.bucket_height)
+        right = int((x + width) // self.bucket_width)
+        bottom = int((y + height) // self.bucket_height)
+        for bucket_x in range(left, right + 1):
+            for bucket_y in range(top, bottom + 1):
+                yield bucket_x, bucket_y
+
+    def insert(self, item: Hashable, rect: Rect) -> NoReturn:
+        """Add an item to every bucket its rect touches.
+
+        Arguments:
+        item -- Item to store.
+        rect -- (X, Y, Width, Height) area in pixels.
+        """
+        for key in self.keys(rect):
+            self.buckets[key].append(item)
+
+    def remove(self, item: Hashable, rect: Rect) -> NoReturn:
+        """Remove an item that was inserted with the same rect.
+
+        Arguments:
+        item -- Item to remove.
+        rect -- (X, Y, Width, Height) area the item was inserted with.
+        """
+        for key in self.keys(rect):
+            bucket = self.buckets[key]
+            bucket.remove(item)
+            if not bucket:
+                del self.buckets[key]
+
+    def query(self, rect: Rect) -> Set[Hashable]:
+        """Get every item sharing a bucket with a rect.
+
+        Arguments:
+        rect -- (X, Y, Width, Height) area in pixels.
+        """
+        found = set()
+        buckets = self.buckets
+        for key in self.keys(rect):
+            if key in buckets:
+                found.update(buckets[key])
+        return found
+
+    def clear(self) -> NoReturn:
+        self.buckets.clear()
+
+
+def target_rect(target: Hashable) -> Rect:
+    """Get the area covered by something a collider can collide with.
+
+    Arguments:
+    target -- A TextObject, (X, Y) point or (X, Y, Width, Height) rect.
+    """
+    if type(target) is tuple:
+        if len(target) == 2:
+            return (target[0], target[1], 0, 0)
+        return target
+    return (target.position[0], target.position[1], target.size[0], target.size[1])
+
+
+class CollisionWorld:
+    """Broadphase collision detection shared by every ColliderComponent in a
+    window. Points and rects colliders check against are hashed once, TextObjects
+    are rehashed every step and each collider only narrow phase checks the
+    targets sharing a bucket with it. Callbacks keep the order they were added
+    to their ColliderComponent.
+
+    Arguments:
+    bucket_cells -- Width and height of each bucket in character cells.
+    """
+
+    def __init__(self, bucket_cells: int = 4):
+        # Dict used as an ordered set, so colliders are removed in O(1)
+        self.colliders = {}
+        self.static = SpatialHash(bucket_cells)
+        self.dynamic = SpatialHash(bucket_cells)
+        self.__static_counts = defaultdict(int)
+        self.__dynamic_counts = defaultdict(int)
+
+    def add(self, collider: "ColliderComponent") -> NoReturn:
+        """Register a ColliderComponent and everything it collides with.
+
+        Arguments:
+        collider -- The ColliderComponent to register.
+        """
+        if collider.world is self:
+            return
+        collider.world = self
+        self.colliders[collider] = None
+        for target in collider.targets():
+            self.add_target(target)
+
+    def remove(self, collider: "ColliderComponent") -> NoReturn:
+        """Unregister a ColliderComponent.
+
+        Arguments:
+        collider -- The ColliderComponent to unregister.
+        """
+        if collider.world is not self:
+            return
+        collider.world = None
+        del self.colliders[collider]
+        for target in collider.targets():
+            self.remove_target(target)
+
+    def add_target(self, target: Hashable) -> NoReturn:
+        """Count a new reference to something colliders can collide with.
+
+        Arguments:
+        target -- A TextObject, (X, Y) point or (X, Y, Width, Height) rect.
+        """
+        if type(target) is tuple:
+            if self.__static_counts[target] == 0:
+                self.static.insert(target, target_rect(target))
+            self.__static_counts[target] += 1
+        else:
+            self.__dynamic_counts[target] += 1
+
+    def remove_target(self, target: Hashable) -> NoReturn:
+        """Drop a reference added with add_target.
+
+        Arguments:
+        target -- A TextObject, (X, Y) point or (X, Y, Width, Height) rect.
+        """
+        if type(target) is tuple:
+            counts = self.__static_counts
+        else:
+            counts = self.__dynamic_counts
+        counts[target] -= 1
+        if counts[target] <= 0:
+            del counts[target]
+            if type(target) is tuple:
+                self.static.remove(target, target_rect(target))
+
+    def step(self) -> NoReturn:
+        """Find colliding pairs and run the callbacks of their colliders."""
+        self.dynamic.clear()
+        for target in self.__dynamic_counts:
+            if not target.removed:
+                self.dynamic.insert(target, target_rect(target))
+
+        for collider in list(self.colliders):
+            root = collider.root
+            # Removed by an earlier callback of this step
+            if root is None or collider.world is not self:
+                continue
+            rect = target_rect(root)
+            candidates = self.static.query(rect)
+            candidates.update(self.dynamic.query(rect))
+            if not candidates:
+                continue
+
+            hits = []
+            for target in candidates:
+                hits.extend(collider.target_indices(target))
+            if not hits:
+                continue
+
+            hits.sort()
+            for i in hits:
+                if collider.world is not self:
+                    break
+                target, func, pass_back = collider.collideables[i]
+                if collider.collides_with(target):
+                    collider.run_callback(target, func, pass_back)
@@ -1,20 +1,66 @@
-from typing import Tuple, Callable, NoReturn, Generic
+from collections import defaultdict
+from typing import Tuple, Callable, NoReturn, Generic, Hashable, Iterable
 from towpy.textobject import TextObject
+from towpy.motion import SystemField
 import pygame
 
 Position = Tuple[int, int]
 
 
 class Component:
+    # Time in ms between updates, None to update every simulation step.
+    # Components with an interval are given the time since their last update.
+    interval = None
+
     def __init__(self):
         self.root = None
 
+    @property
+    def integrated(self) -> bool:
+        """Whether a system of the window updates the component in bulk, so
+        its update does not need calling every step.
+        """
+        return False
+
     def update(self, dt: int) -> NoReturn:
         raise NotImplementedError("This should be an overrided method.")
 
+    def attach(self, window: "TextOnlyWindow") -> NoReturn:
+        """Called once the root of the component has been added to a window.
+        Can be overrided to register with systems owned by the window.
+
+        Arguments:
+        window -- The TextOnlyWindow the root was added to.
+        """
+        pass
+
+    def detach(self, window: "TextOnlyWindow") -> NoReturn:
+        """Called once the root of the component has been given to
+        remove_object. Can be overrided to undo what attach did.
+
+        Arguments:
+        window -- The TextOnlyWindow the root was removed from.
+        """
+        pass
+
+    def reset(self) -> NoReturn:
+        """Called when the root is taken from an ObjectPool to be used again.
+        Can be overrided to put the component back in its starting state.
+        """
+        pass
+
 
 class MovementComponent(Component):
+    FIELDS = ("speed_x", "speed_y", "current_speed_x", "current_speed_y")
+
+    speed_x = SystemField("speed", 0)
+    speed_y = SystemField("speed", 1)
+    current_speed_x = SystemField("current_speed", 0)
+    current_speed_y = SystemField("current_speed", 1)
+
     def __init__(self, speed):
+        Component.__init__(self)
+        self.system = None
         if type(speed) is int or type(speed) is float:
             self.speed_x, self.speed_y = speed, speed
         elif (type(speed) is tuple or type(speed) is list) and len(speed) == 2:
@@ -23,9 +69,30 @@ class MovementComponent(Component):
             raise ValueError("Speed must be int/float or tuple/list of size 2")
         self.current_speed_x, self.current_speed_y = 0, 0
 
+    @property
+    def integrated(self) -> bool:
+        return self.system is not None
+
+    def attach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.motion_system is not None:
+            window.motion_system.add(self)
+
+    def detach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.motion_system is not None:
+            window.motion_system.remove(self)
+
+    def reset(self) -> NoReturn:
+        self.stop()
+
     def update(self, dt: int) -> NoReturn:
-        self.root.position[0] += self.current_speed_x * dt
-        self.root.position[1] += self.current_speed_y * dt
+        # Integrated by the MotionSystem of the window instead
+        if self.system is not None:
+            return
+
+        if self.current_speed_x:
+            self.root.position[0] += self.current_speed_x * dt
+        if self.current_speed_y:
+            self.root.position[1] += self.current_speed_y * dt
 
     def move(self, speed_x: float, speed_y: float) -> NoReturn:
         self.current_speed_x = speed_x
@@ -83,8 +150,29 @@ class MovementComponent(Component):
 
 
 class PhysicsComponent(Component):
+    FIELDS = (
+        "mass",
+        "dampening",
+        "acc_x",
+        "acc_y",
+        "vel_x",
+        "vel_y",
+        "vel_x_max",
+        "vel_y_max",
+    )
+
+    mass = SystemField("mass")
+    dampening = SystemField("dampening")
+    acc_x = SystemField("acceleration", 0)
+    acc_y = SystemField("acceleration", 1)
+    vel_x = SystemField("velocity", 0)
+    vel_y = SystemField("velocity", 1)
+    vel_x_max = SystemField("max_velocity", 0)
+    vel_y_max = SystemField("max_velocity", 1)
+
     def __init__(self, mass: float, max_vel: Generic, dampening: float = 0):
         Component.__init__(self)
+        self.system = None
         self.mass = mass
         self.dampening = dampening
         self.acc_x, self.acc_y = 0, 0
@@ -95,7 +183,27 @@ class PhysicsComponent(Component):
         else:
             self.vel_x_max, self.vel_y_max = max_vel, max_vel
 
+    @property
+    def integrated(self) -> bool:
+        return self.system is not None
+
+    def attach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.motion_system is not None:
+            window.motion_system.add(self)
+
+    def detach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.motion_system is not None:
+            window.motion_system.remove(self)
+
+    def reset(self) -> NoReturn:
+        self.acc_x, self.acc_y = 0, 0
+        self.vel_x, self.vel_y = 0, 0
+
     def update(self, dt: int) -> NoReturn:
+        # Integrated by the MotionSystem of the window instead
+        if self.system is not None:
+            return
+
         self.vel_x = self.acc_x * self.mass * self.dampening
         self.vel_y = self.acc_y * self.mass * self.dampening
 
@@ -118,41 +226,84 @@ class PhysicsComponent(Component):
 
     def set_acceleration(self, acc_x: float, acc_y: float) -> NoReturn:
         self.acc_x = acc_x
-        self.acc_y
+        self.acc_y = acc_y
 
 
 class ColliderComponent(Component):
     def __init__(self):
         Component.__init__(self)
         self.collideables = []
+        self.world = None
+        self.__indices = defaultdict(list)
+
+    @property
+    def integrated(self) -> bool:
+        return self.world is not None
+
+    def attach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.collision_world is not None:
+            window.collision_world.add(self)
+
+    def detach(self, window: "TextOnlyWindow") -> NoReturn:
+        if window.collision_world is not None:
+            window.collision_world.remove(self)
 
     def update(self, dt: int) -> NoReturn:
+        # Collisions are checked by the CollisionWorld of the window instead
+        if self.world is not None:
+            return
+
         for obj, func, pass_back in self.collideables:
-            run_func = False
-            if type(obj) == tuple and len(obj) == 2 and self.point_collision(obj):
-                run_func = True
-            elif issubclass(type(obj), TextObject) and self.other_collision(obj):
-                run_func = True
-            elif type(obj) is tuple and len(obj) == 4 and self.rect_collision(obj):
-                run_func = True
-
-            if run_func:
-                if type(func) is list:
-                    for f in func:
-                        if pass_back:
-                            f(obj)
-                        else:
-                            f()
+            if self.collides_with(obj):
+                self.run_callback(obj, func, pass_back)
+
+    def run_callback(self, obj: Generic, func: Generic, pass_back: bool) -> NoReturn:
+        # Collisions wake sleeping TextObjects
+        self.root.wake()
+        if issubclass(type(obj), TextObject):
+            obj.wake()
+        if type(func) is list:
+            for f in func:
+                if pass_back:
+                    f(obj)
                 else:
-                    if pass_back:
-                        func(obj)
-                    else:
-                        func()
+                    f()
+        else:
+            if pass_back:
+                func(obj)
+            else:
+                func()
 
     def add_collider(
         self, other: TextObject, func: Callable, pass_back=False
     ) -> NoReturn:
         self.collideables.append((other, func, pass_back))
+        if self.__is_target(other):
+            if self.world is not None and other not in self.__indices:
+                self.world.add_target(other)
+            self.__indices[other].append(len(self.collideables) - 1)
+
+    def targets(self) -> Iterable[Hashable]:
+        """Everything this collider can collide with."""
+        return self.__indices.keys()
+
+    def target_indices(self, target: Hashable) -> Iterable[int]:
+        """Indices into collideables of the entries for a target."""
+        return self.__indices.get(target, ())
+
+    def collides_with(self, obj: Generic) -> bool:
+        if type(obj) == tuple and len(obj) == 2:
+            return self.point_collision(obj)
+        elif issubclass(type(obj), TextObject):
+            return not obj.removed and self.other_collision(obj)
+        elif type(obj) is tuple and len(obj) == 4:
+            return self.rect_collision(obj)
+        return False
+
+    def __is_target(self, obj: Generic) -> bool:
+        if type(obj) is tuple:
+            return len(obj) in (2, 4)
+        return issubclass(type(obj), TextObject)
 
     def point_collision(self, point_pos: Position) -> bool:
         if (
@@ -189,26 +340,95 @@ class ControlComponent(Component):
     def __init__(self):
         Component.__init__(self)
         self.controls = []
+        self.keyboard = None
+        self.__pressed = None
+        self.__last_pressed = None
+
+    def attach(self, window: "TextOnlyWindow") -> NoReturn:
+        # Key downs are dispatched by the keyboard of the window from now on
+        self.keyboard = window.keyboard
+        for under_func, key, call, reverse in self.controls:
+            self.__add_handlers(under_func, key, call, reverse)
+
+    def detach(self, window: "TextOnlyWindow") -> NoReturn:
+        for under_func, key, call, reverse in self.controls:
+            self.keyboard.remove_handler(key, self.__wake_root)
+            self.keyboard.remove_handler(key, self.__wake_root, up=True)
+            if under_func == self.is_key_down:
+                self.keyboard.remove_handler(key, call, up=reverse)
+        self.keyboard = None
 
     def update(self, dt):
+        # Take the key state once for every control
+        if self.keyboard is not None:
+            self.__pressed = self.keyboard
+        else:
+            self.__pressed = pygame.key.get_pressed()
+
         for under_func, key, call, reverse in self.controls:
+            if under_func == self.is_key_down and self.keyboard is not None:
+                continue
             if under_func(key, reverse):
                 call()
 
-    def is_key_down(self, key):
-        pass
+        self.__last_pressed = self.__pressed
+        self.__pressed = None
+
+    def is_key_down(self, key, reverse=False):
+        """Whether a key was pressed since the last update, or released if
+        reverse.
+        """
+        keys = key if type(key) is list else [key]
+        if self.keyboard is not None:
+            changed = self.keyboard.released if reverse else self.keyboard.pressed
+            return any(k in changed for k in keys)
+
+        pressed = self.__key_state()
+        last = self.__last_pressed
+        if last is None:
+            return False
+        for k in keys:
+            if reverse and last[k] and not pressed[k]:
+                return True
+            if not reverse and pressed[k] and not last[k]:
+                return True
+        return False
 
     def is_key_hold(self, key, reverse=False):
+        pressed = self.__key_state()
         if type(key) is list:
             for k in key:
-                if pygame.key.get_pressed()[k] and reverse:
+                if pressed[k] and reverse:
                     return False
             return True
         elif type(key) is int:
-            return pygame.key.get_pressed()[key] and not reverse
+            return pressed[key] and not reverse
 
     def on_key_down(self, key, call, reverse=False):
+        """Call a function when a key is pressed, or released if reverse."""
         self.controls.append((self.is_key_down, key, call, reverse))
+        if self.keyboard is not None:
+            self.__add_handlers(self.is_key_down, key, call, reverse)
 
     def on_key_hold(self, key, call, reverse=False):
         self.controls.append((self.is_key_hold, key, call, reverse))
+        if self.keyboard is not None:
+            self.__add_handlers(self.is_key_hold, key, call, reverse)
+
+    def __add_handlers(self, under_func, key, call, reverse):
+        # Pressing or releasing a key of any control wakes a sleeping root
+        self.keyboard.add_handler(key, self.__wake_root)
+        self.keyboard.add_handler(key, self.__wake_root, up=True)
+        if under_func == self.is_key_down:
+            self.keyboard.add_handler(key, call, up=reverse)
+
+    def __wake_root(self):
+        if self.root is not None:
+            self.root.wake()
+
+    def __key_state(self):
+        if self.__pressed is not None:
+            return self.__pressed
+        if self.keyboard is not None:
+            return self.keyboard
+        return pygame.key.get_pressed()
@@ -1,5 +1,216 @@
+import os
+import json
 import pygame
+from collections import OrderedDict
+from typing import Tuple, Dict, NoReturn
 
-if not pygame.font.get_init():
-    pygame.font.init()
-font = pygame.font.SysFont("monospace", 15)
+Colour = Tuple[int, int, int]
+Size = Tuple[int, int]
+
+# The font and cell_size attributes of this module are only set up on first
+# use, see __getattr__, so importing towpy never searches the system fonts
+FONT_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "towpy",
+    "fonts.json",
+)
+
+_font_name = "monospace"
+_font_size = 15
+_font_cache = True
+
+
+def configure_font(
+    name: str = "monospace", size: int = 15, cache: bool = True
+) -> NoReturn:
+    """Set the font used by every TextObject. Must be called before the font
+    is first used, e.g. before the first window or TextObject is created.
+
+    Arguments:
+    name -- Path of a font file, or name of a system font to search for.
+    size -- Font size.
+    cache -- Store the resolved font path and cell size on disk so later
+             runs skip the system font search.
+    """
+    global _font_name, _font_size, _font_cache
+    if "font" in globals() or "cell_size" in globals():
+        raise RuntimeError("Font can only be configured before it is used!")
+    _font_name, _font_size, _font_cache = name, size, cache
+
+
+def __getattr__(name: str):
+    if name == "font":
+        return _load_font()
+    if name == "cell_size":
+        return _load_cell_size()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _load_font() -> "pygame.font.Font":
+    global font, cell_size
+    if "font" in globals():
+        return font
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+    entry = _cached_font()
+    path = entry["path"] if entry is not None else _find_font(_font_name)
+    font = pygame.font.Font(path, _font_size)
+    if "cell_size" not in globals():
+        cell_size = font.size(" ")
+    if entry is None:
+        _store_font(path, cell_size)
+    return font
+
+
+def _load_cell_size() -> Size:
+    global cell_size
+    # Cell size can come from the disk cache without loading the font at all
+    entry = _cached_font()
+    if entry is None:
+        _load_font()
+    else:
+        cell_size = tuple(entry["cell_size"])
+    return cell_size
+
+
+def _find_font(name: str) -> str:
+    """Get the path of a font file or system font, None for the pygame
+    default font if no system font matches.
+    """
+    if os.path.isfile(name):
+        return name
+    return pygame.font.match_font(name)
+
+
+def _font_key() -> str:
+    return "%s:%d:%s" % (_font_name, _font_size, pygame.version.ver)
+
+
+def _font_mtime(path: str) -> int:
+    return None if path is None else os.stat(path).st_mtime_ns
+
+
+def _read_font_cache() -> Dict:
+    try:
+        with open(FONT_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _cached_font() -> Dict:
+    """Get the cached path and cell size of the configured font, None if it
+    is not cached or the font file was removed or changed since.
+    """
+    if not _font_cache:
+        return None
+    entry = _read_font_cache().get(_font_key())
+    try:
+        path = entry["path"]
+        if not os.path.isfile(path) or _font_mtime(path) != entry["mtime"]:
+            return None
+    except (OSError, KeyError, TypeError):
+        return None
+    return entry
+
+
+def _store_font(path: str, size: Size) -> NoReturn:
+    # The pygame default font is not cached, so the search runs again in case
+    # a matching system font is installed later
+    if not _font_cache or path is None:
+        return
+    fonts = _read_font_cache()
+    fonts[_font_key()] = {
+        "path": path,
+        "mtime": _font_mtime(path),
+        "cell_size": list(size),
+    }
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE), exist_ok=True)
+        with open(FONT_CACHE, "w") as f:
+            json.dump(fonts, f)
+    except OSError:
+        # A read only cache only means the next run searches again
+        pass
+
+
+class GlyphCache:
+    """Shared cache of rasterised glyph surfaces. Every glyph is keyed by its
+    character, foreground and background colour. Once a glyph has been
+    rendered by the font, drawing it again only costs a blit. When the cache
+    grows past max_size the least recently used glyph is evicted.
+
+    Arguments:
+    font -- A pygame font object used to rasterise glyphs, the configured
+            font if None.
+    max_size -- Maximum number of glyph surfaces kept in the cache.
+    """
+
+    def __init__(self, font: "pygame.font.Font" = None, max_size: int = 4096):
+        self.font = font
+        self.hits = 0
+        self.misses = 0
+        self.max_size = 0
+        self._glyphs = OrderedDict()
+        self.set_max_size(max_size)
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    def get(
+        self, char: str, colour: Colour, background: Colour = None
+    ) -> "pygame.Surface":
+        """Return the surface for a glyph, rasterising it on a cache miss.
+
+        Arguments:
+        char -- Character to render.
+        colour -- (R, G, B) colour format for font.
+        background -- (R, G, B) colour format for background, None for none.
+        """
+        key = (char, colour, background)
+        try:
+            glyph = self._glyphs.get(key)
+        except TypeError:
+            # Colours given as lists are not hashable
+            key = (char, tuple(colour), background and tuple(background))
+            glyph = self._glyphs.get(key)
+
+        if glyph is not None:
+            self._glyphs.move_to_end(key)
+            self.hits += 1
+            return glyph
+
+        self.misses += 1
+        if self.font is None:
+            self.font = _load_font()
+        glyph = self.font.render(char, False, colour, background)
+        self._glyphs[key] = glyph
+        if len(self._glyphs) > self.max_size:
+            self._glyphs.popitem(last=False)
+        return glyph
+
+    def set_max_size(self, max_size: int) -> NoReturn:
+        """Set the maximum number of glyphs kept, evicting the least recently
+        used glyphs if the cache is already larger.
+
+        Arguments:
+        max_size -- Maximum number of glyph surfaces kept in the cache.
+        """
+        if type(max_size) is not int or max_size < 1:
+            raise ValueError("Glyph cache size must be a positive int!")
+        self.max_size = max_size
+        while len(self._glyphs) > self.max_size:
+            self._glyphs.popitem(last=False)
+
+    def clear(self) -> NoReturn:
+        """Remove every cached glyph. Hit and miss counters are kept."""
+        self._glyphs.clear()
+
+    def reset_stats(self) -> NoReturn:
+        """Reset the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+
+glyph_cache = GlyphCache()
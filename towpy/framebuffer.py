@@ -0,0 +1,213 @@
+from typing import Tuple, List, NoReturn
+from towpy import config
+from towpy.config import glyph_cache
+from towpy.richtext import NO_COLOUR, DIRECT, pack_colour, unpack_colour, palette
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Colour = Tuple[int, int, int]
+Position = Tuple[int, int]
+Cells = Tuple["np.ndarray", "np.ndarray", "np.ndarray"]
+
+SPACE = ord(" ")
+
+
+def require_numpy(feature: str) -> NoReturn:
+    """Raise an ImportError if numpy, needed by the given feature, is missing."""
+    if np is None:
+        raise ImportError("numpy is required to use the %s." % feature)
+
+
+def cells_from_rich_text(rich_text: "RichText") -> Cells:
+    """Convert RichText into codepoint, foreground and background arrays.
+    Missing characters have a codepoint of 0.
+
+    Arguments:
+    rich_text -- RichText as stored by a TextObject.
+    """
+    require_numpy("cell renderer")
+    shape = (rich_text.height, rich_text.width)
+    codes = np.frombuffer(rich_text.codes, dtype=np.uint32).reshape(shape).copy()
+    fg = _pack_colours(np.frombuffer(rich_text.fg, dtype=np.uint32))
+    bg = _pack_colours(np.frombuffer(rich_text.bg, dtype=np.uint32))
+    return codes, fg.reshape(shape), bg.reshape(shape)
+
+
+def _pack_colours(values: "np.ndarray") -> "np.ndarray":
+    """Get the packed colours of palette indices or directly stored colours."""
+    packed = np.frombuffer(palette.packed, dtype=np.uint32)
+    if not palette.full:
+        return packed[values]
+    direct = values >= DIRECT
+    colours = packed[np.where(direct, 0, values)]
+    colours[direct] = values[direct] ^ DIRECT
+    return colours
+
+
+class CellFramebuffer:
+    """Window sized grid of codepoints, foreground and background colours.
+    TextObjects are composited into the grid every frame, the grid is diffed
+    against the previous frame and only cells that changed are rasterised.
+
+    Arguments:
+    columns -- Width of the grid in cells.
+    rows -- Height of the grid in cells.
+    """
+
+    def __init__(self, columns: int, rows: int):
+        require_numpy("cell renderer")
+        self.columns = columns
+        self.rows = rows
+        self.codes = np.full((rows, columns), SPACE, dtype=np.uint32)
+        self.fg = np.full((rows, columns), NO_COLOUR, dtype=np.uint32)
+        self.bg = np.zeros((rows, columns), dtype=np.uint32)
+        self.__last_codes = self.codes.copy()
+        self.__last_fg = self.fg.copy()
+        self.__last_bg = self.bg.copy()
+        self.__full_redraw = True
+
+    def invalidate(self) -> NoReturn:
+        """Treat every cell as changed on the next diff."""
+        self.__full_redraw = True
+
+    def compose(
+        self, text_objects: List, background: Colour, offset: Position = (0, 0)
+    ) -> NoReturn:
+        """Start a new frame and composite visible TextObjects into the grid
+        in draw order.
+
+        Arguments:
+        text_objects -- TextObjects to composite, later objects on top.
+        background -- (R, G, B) colour format for the window background.
+        offset -- Position of the camera, subtracted from every position.
+        """
+        self.clear(background)
+        self.draw(text_objects, offset)
+
+    def clear(self, background: Colour) -> NoReturn:
+        """Start a new frame filled with a background colour. A grid cleared
+        without a background is transparent when blitted onto another grid.
+
+        Arguments:
+        background -- (R, G, B) colour format for the background, or None.
+        """
+        # Last frame becomes the previous grid, reuse its arrays for this one
+        self.__last_codes, self.codes = self.codes, self.__last_codes
+        self.__last_fg, self.fg = self.fg, self.__last_fg
+        self.__last_bg, self.bg = self.bg, self.__last_bg
+
+        self.codes.fill(SPACE)
+        self.fg.fill(NO_COLOUR)
+        self.bg.fill(pack_colour(background))
+
+    def draw(self, text_objects: List, offset: Position = (0, 0)) -> NoReturn:
+        """Composite visible TextObjects into the grid in draw order.
+        Positions are always snapped to the grid. A space or missing character
+        without a background leaves the cell below it visible.
+
+        Arguments:
+        text_objects -- TextObjects to composite, later objects on top.
+        offset -- Position of the camera, subtracted from every position.
+        """
+        offset_x, offset_y = offset
+        for text_object in text_objects:
+            if not text_object.hidden:
+                x, y = text_object.get_draw_position()
+                self.blit(text_object.get_cells(), (x - offset_x, y - offset_y))
+
+    def get_cells(self) -> Cells:
+        """Get the codepoint, foreground and background arrays of the grid,
+        e.g. to blit it onto another grid.
+        """
+        return (self.codes, self.fg, self.bg)
+
+    def blit(self, cells: Cells, position: List) -> NoReturn:
+        """Composite cell arrays into the grid at a pixel position.
+
+        Arguments:
+        cells -- Codepoint, foreground and background arrays.
+        position -- Pixel position of the top left cell.
+        """
+        codes, fg, bg = cells
+        col = int(position[0] // config.cell_size[0])
+        row = int(position[1] // config.cell_size[1])
+        height, width = codes.shape
+
+        # Clip to the grid
+        left, top = max(0, -col), max(0, -row)
+        right = min(width, self.columns - col)
+        bottom = min(height, self.rows - row)
+        if left >= right or top >= bottom:
+            return
+
+        src = (slice(top, bottom), slice(left, right))
+        dst = (slice(row + top, row + bottom), slice(col + left, col + right))
+        codes, fg, bg = codes[src], fg[src], bg[src]
+
+        has_bg = (bg != NO_COLOUR) & (codes != 0)
+        opaque = (codes != 0) & ((codes != SPACE) | has_bg)
+        np.copyto(self.codes[dst], codes, where=opaque)
+        np.copyto(self.fg[dst], fg, where=opaque)
+        np.copyto(self.bg[dst], bg, where=has_bg)
+
+    def diff(self) -> "np.ndarray":
+        """Get a boolean grid of cells that differ from the previous frame."""
+        if self.__full_redraw:
+            self.__full_redraw = False
+            return np.ones((self.rows, self.columns), dtype=bool)
+        return (
+            (self.codes != self.__last_codes)
+            | (self.fg != self.__last_fg)
+            | (self.bg != self.__last_bg)
+        )
+
+    def rasterise(
+        self, surface: "pygame.Surface", changed: "np.ndarray"
+    ) -> List[Tuple[int, int, int, int]]:
+        """Draw changed cells onto a surface using cached glyphs. Returns the
+        areas of the surface that were drawn as horizontal runs of cells.
+
+        Arguments:
+        surface -- A pygame surface object.
+        changed -- Boolean grid of cells to draw.
+        """
+        cell_width, cell_height = config.cell_size
+        rows, cols = np.nonzero(changed)
+        codes = self.codes[rows, cols].tolist()
+        fg = self.fg[rows, cols].tolist()
+        bg = self.bg[rows, cols].tolist()
+
+        blits = []
+        rects = []
+        run_row, run_start, run_end = -1, 0, 0
+        for row, col, code, colour, background in zip(
+            rows.tolist(), cols.tolist(), codes, fg, bg
+        ):
+            # Foreground of a space is never seen
+            colour = unpack_colour(colour) or (0, 0, 0)
+            glyph = glyph_cache.get(chr(code), colour, unpack_colour(background))
+            blits.append((glyph, (col * cell_width, row * cell_height)))
+
+            if row == run_row and col == run_end:
+                run_end += 1
+            else:
+                if run_row >= 0:
+                    rects.append(self.__run_rect(run_row, run_start, run_end))
+                run_row, run_start, run_end = row, col, col + 1
+        if run_row >= 0:
+            rects.append(self.__run_rect(run_row, run_start, run_end))
+
+        surface.blits(blits, doreturn=False)
+        return rects
+
+    def __run_rect(self, row: int, start: int, end: int) -> Tuple[int, int, int, int]:
+        return (
+            start * config.cell_size[0],
+            row * config.cell_size[1],
+            (end - start) * config.cell_size[0],
+            config.cell_size[1],
+        )
@@ -0,0 +1,89 @@
+import pygame
+from collections import defaultdict
+from typing import Callable, Generic, List, Sequence, NoReturn
+
+
+class Keyboard:
+    """Keyboard state of a window, taken once per frame. Key presses and
+    releases are routed only to the handlers registered for that key, so
+    the cost of input does not grow with the number of controls.
+    """
+
+    def __init__(self):
+        self.held = set()
+        # Keys pressed and released during the current frame
+        self.pressed = set()
+        self.released = set()
+        self.snapshot = None
+        self.down_handlers = defaultdict(list)
+        self.up_handlers = defaultdict(list)
+
+    def __getitem__(self, key: int) -> bool:
+        return self.is_pressed(key)
+
+    def is_pressed(self, key: int) -> bool:
+        """Whether a key is held down this frame.
+
+        Arguments:
+        key -- pygame key code.
+        """
+        if self.snapshot is not None:
+            return bool(self.snapshot[key])
+        return key in self.held
+
+    def update(
+        self, events: List["pygame.event.Event"], snapshot: Sequence = None
+    ) -> NoReturn:
+        """Take the keyboard state for a new frame and dispatch key events.
+
+        Arguments:
+        events -- Events of the frame.
+        snapshot -- Result of pygame.key.get_pressed() if available, otherwise
+                    held keys are tracked from the events.
+        """
+        self.snapshot = snapshot
+        self.pressed.clear()
+        self.released.clear()
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.held.add(event.key)
+                self.pressed.add(event.key)
+                handlers = self.down_handlers.get(event.key)
+            elif event.type == pygame.KEYUP:
+                self.held.discard(event.key)
+                self.released.add(event.key)
+                handlers = self.up_handlers.get(event.key)
+            else:
+                continue
+            if handlers:
+                for handler in list(handlers):
+                    handler()
+
+    def add_handler(self, key: Generic, call: Callable, up: bool = False) -> NoReturn:
+        """Call a function every time a key is pressed, or released.
+
+        Arguments:
+        key -- pygame key code or list of key codes.
+        call -- Function to call without arguments.
+        up -- Call on release instead of press.
+        """
+        handlers = self.up_handlers if up else self.down_handlers
+        for k in key if type(key) is list else [key]:
+            handlers[k].append(call)
+
+    def remove_handler(
+        self, key: Generic, call: Callable, up: bool = False
+    ) -> NoReturn:
+        """Stop calling a function added with add_handler.
+
+        Arguments:
+        key -- pygame key code or list of key codes.
+        call -- Function that was added.
+        up -- Whether it was added for release.
+        """
+        handlers = self.up_handlers if up else self.down_handlers
+        for k in key if type(key) is list else [key]:
+            if call in handlers.get(k, ()):
+                handlers[k].remove(call)
+                if not handlers[k]:
+                    del handlers[k]
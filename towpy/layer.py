@@ -0,0 +1,58 @@
+from typing import NoReturn
+from towpy.textobject import TextObject
+
+
+class Layer:
+    """A named group of TextObjects drawn together. Layers are drawn from the
+    lowest z to the highest, and the TextObjects of a layer in the order they
+    were added.
+
+    A static layer is drawn once into a window sized cache, which is then
+    drawn in a single blit until the layer changes. Moving, hiding or
+    changing the sprite or colours of one of its TextObjects marks the layer
+    dirty, including moves in place and through a MotionSystem. Call
+    mark_dirty after changing how one is drawn in any other way.
+
+    Arguments:
+    name -- Name of the layer.
+    z -- Layers with a higher z are drawn on top.
+    static -- Whether to cache the layer.
+    """
+
+    def __init__(self, name: str, z: int = 0, static: bool = False):
+        self.name = name
+        self.z = z
+        self.static = static
+        # Dict used as an ordered set, so TextObjects are removed in O(1)
+        self.text_objects = {}
+        self.dirty = True
+        # Cached surface or cell grid and the camera offset it was drawn at
+        self.cache = None
+        self.cache_offset = None
+
+    def __repr__(self) -> str:
+        return "Layer(%r, z=%d, static=%s)" % (self.name, self.z, self.static)
+
+    def add(self, text_object: TextObject) -> NoReturn:
+        """Add a TextObject on top of the layer.
+
+        Arguments:
+        text_object -- The TextObject to add.
+        """
+        self.text_objects[text_object] = None
+        text_object.layer = self
+        self.dirty = True
+
+    def remove(self, text_object: TextObject) -> NoReturn:
+        """Remove a TextObject from the layer.
+
+        Arguments:
+        text_object -- The TextObject to remove.
+        """
+        del self.text_objects[text_object]
+        text_object.layer = None
+        self.dirty = True
+
+    def mark_dirty(self) -> NoReturn:
+        """Redraw the cache of a static layer on the next render."""
+        self.dirty = True
@@ -0,0 +1,199 @@
+from typing import List, Generic, NoReturn
+from towpy.framebuffer import np, require_numpy
+
+
+class SystemField:
+    """Attribute of a component that is stored on the component itself until
+    it joins a MotionSystem. From then on it reads and writes the row of its
+    TextObject in one of the system arrays.
+
+    Arguments:
+    array -- Name of the MotionSystem array holding the field.
+    column -- Column of the array for 2D arrays, None for 1D arrays.
+    """
+
+    def __init__(self, array: str, column: int = None):
+        self.array = array
+        self.column = column
+        self.name = None
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, component: Generic, owner: type = None) -> Generic:
+        if component is None:
+            return self
+        system = component.system
+        if system is None:
+            return component.__dict__[self.name]
+        row = component.root.motion_row
+        if self.column is None:
+            return float(getattr(system, self.array)[row])
+        return float(getattr(system, self.array)[row, self.column])
+
+    def __set__(self, component: Generic, value: float) -> NoReturn:
+        system = component.system
+        if system is None:
+            component.__dict__[self.name] = value
+        elif self.column is None:
+            getattr(system, self.array)[component.root.motion_row] = value
+        else:
+            getattr(system, self.array)[component.root.motion_row, self.column] = value
+
+
+class MotionSystem:
+    """Integrates every MovementComponent and PhysicsComponent of a window in
+    one vectorised step. Each TextObject with one of these components owns a
+    row of contiguous arrays holding its position, speeds, velocities,
+    accelerations and velocity limits. Component methods keep working as they
+    read and write the row of their TextObject.
+
+    Arguments:
+    capacity -- Number of rows to allocate up front. Grows when needed.
+    """
+
+    ARRAYS_1D = ("mass", "dampening")
+    ARRAYS_2D = (
+        "positions",
+        "speed",
+        "current_speed",
+        "acceleration",
+        "velocity",
+        "max_velocity",
+        # Positions as of the last call to moved
+        "last_positions",
+    )
+
+    def __init__(self, capacity: int = 64):
+        require_numpy("motion system")
+        self.count = 0
+        self.entities = []
+        self.__components = []
+        for name in self.ARRAYS_1D:
+            setattr(self, name, np.zeros(capacity))
+        for name in self.ARRAYS_2D:
+            setattr(self, name, np.zeros((capacity, 2)))
+
+    def add(self, component: "Component") -> NoReturn:
+        """Move the fields of a component, and the position of its TextObject,
+        into the system arrays.
+
+        Arguments:
+        component -- A MovementComponent or PhysicsComponent with a root.
+        """
+        if component.system is self:
+            return
+        root = component.root
+        if root.motion_system is None:
+            self.__add_entity(root)
+        elif root.motion_system is not self:
+            raise ValueError("TextObject already belongs to another MotionSystem!")
+
+        values = {name: getattr(component, name) for name in component.FIELDS}
+        component.system = self
+        for name, value in values.items():
+            setattr(component, name, value)
+        self.__components[root.motion_row].append(component)
+
+    def remove(self, component: "Component") -> NoReturn:
+        """Move the fields of a component back onto the component. The row of
+        its TextObject is freed once no other component uses it.
+
+        Arguments:
+        component -- A component previously added to the system.
+        """
+        if component.system is not self:
+            return
+        root = component.root
+        values = {name: getattr(component, name) for name in component.FIELDS}
+        for name in component.FIELDS:
+            setattr(component, name, 0)
+        component.system = None
+        for name, value in values.items():
+            setattr(component, name, value)
+
+        components = self.__components[root.motion_row]
+        components.remove(component)
+        if not components:
+            self.__remove_entity(root)
+
+    def step(self, dt: int) -> NoReturn:
+        """Integrate every row of the system.
+
+        Arguments:
+        dt -- Difference in ms between current and last frame.
+        """
+        n = self.count
+        if n == 0:
+            return
+        positions = self.positions[:n]
+
+        # MovementComponent
+        positions += self.current_speed[:n] * dt
+
+        # PhysicsComponent
+        velocity = self.velocity[:n]
+        np.multiply(
+            self.acceleration[:n],
+            (self.mass[:n] * self.dampening[:n])[:, None],
+            out=velocity,
+        )
+        max_velocity = self.max_velocity[:n]
+        np.clip(velocity, -max_velocity, max_velocity, out=velocity)
+        positions += velocity * dt
+
+    def moved(self) -> List["TextObject"]:
+        """Get every TextObject whose position changed since the last call,
+        whether integrated by step or written to by hand.
+        """
+        n = self.count
+        positions = self.positions[:n]
+        last_positions = self.last_positions[:n]
+        rows = np.flatnonzero((positions != last_positions).any(axis=1))
+        last_positions[rows] = positions[rows]
+        entities = self.entities
+        return [entities[row] for row in rows.tolist()]
+
+    def __add_entity(self, text_object: "TextObject") -> NoReturn:
+        if self.count == len(self.positions):
+            self.__grow()
+        row = self.count
+        for name in self.ARRAYS_1D + self.ARRAYS_2D:
+            getattr(self, name)[row] = 0
+        self.positions[row] = text_object.position[:2]
+        self.last_positions[row] = self.positions[row]
+
+        text_object.motion_system = self
+        text_object.motion_row = row
+        self.entities.append(text_object)
+        self.__components.append([])
+        self.count += 1
+
+    def __remove_entity(self, text_object: "TextObject") -> NoReturn:
+        row = text_object.motion_row
+        position = self.positions[row].tolist()
+
+        # Keep rows contiguous by moving the last row into the freed one
+        last = self.count - 1
+        if row != last:
+            for name in self.ARRAYS_1D + self.ARRAYS_2D:
+                array = getattr(self, name)
+                array[row] = array[last]
+            moved = self.entities[last]
+            moved.motion_row = row
+            self.entities[row] = moved
+            self.__components[row] = self.__components[last]
+        self.entities.pop()
+        self.__components.pop()
+        self.count -= 1
+
+        text_object.motion_system = None
+        text_object.motion_row = None
+        text_object.position = position
+
+    def __grow(self) -> NoReturn:
+        for name in self.ARRAYS_1D + self.ARRAYS_2D:
+            array = getattr(self, name)
+            grown = np.zeros((max(1, len(array) * 2),) + array.shape[1:])
+            grown[: len(array)] = array
+            setattr(self, name, grown)
@@ -0,0 +1,183 @@
+from collections import deque, Counter
+from time import perf_counter
+from typing import Dict, NoReturn
+
+# Reasons a render frame is skipped
+UNCHANGED = "unchanged"
+BUDGET = "budget"
+
+
+class FramePacer:
+    """Pacing policy of a TextOnlyWindow. Render frames are skipped when
+    nothing on screen changed, or dropped when the update of a frame leaves
+    too little of the frame budget to render it. Updates are never skipped.
+    Once the scene has been unchanged for a few frames the window is idle
+    and sleeps until the next event or wake up, instead of ticking at the
+    target frame rate.
+
+    Arguments:
+    skip_unchanged -- Skip rendering frames where nothing on screen changed.
+    idle_frames -- Unchanged frames without events before sleeping, None to
+                   never sleep.
+    idle_timeout -- Longest time in ms to sleep for, so updates keep running
+                    at least this often.
+    frame_budget -- Time in ms a frame should take, None to never drop frames.
+    max_dropped -- Most render frames to drop in a row.
+    window_size -- Number of frames the rolling statistics cover.
+    """
+
+    def __init__(
+        self,
+        skip_unchanged: bool = True,
+        idle_frames: int = 2,
+        idle_timeout: int = 1000,
+        frame_budget: float = None,
+        max_dropped: int = 2,
+        window_size: int = 120,
+    ):
+        if idle_frames is not None and (
+            type(idle_frames) is not int or idle_frames < 1
+        ):
+            raise ValueError("Idle frames must be a positive int!")
+        if type(max_dropped) is not int or max_dropped < 0:
+            raise ValueError("Max dropped frames must be a non negative int!")
+        self.skip_unchanged = skip_unchanged
+        self.idle_frames = idle_frames
+        self.idle_timeout = idle_timeout
+        self.frame_budget = frame_budget
+        self.max_dropped = max_dropped
+        self.window_size = window_size
+
+        # Start time of every frame in the window and whether it was rendered
+        self.frames = deque(maxlen=window_size)
+        self.skipped = Counter()
+        self.idle_sleeps = 0
+        self.idle_time = 0
+        # Moving average of the time in ms a render takes
+        self.render_time = 0
+        self.__unchanged_frames = 0
+        self.__dropped = 0
+        self.__wake = None
+        self.__frame_start = None
+        self.__render_start = None
+
+    @property
+    def idle(self) -> bool:
+        """Whether the window will sleep before the next frame."""
+        return (
+            self.idle_frames is not None
+            and self.__unchanged_frames >= self.idle_frames
+        )
+
+    def wake_in(self, ms: float) -> NoReturn:
+        """Make sure the window is awake and updating within some time, e.g.
+        for a TextObject that blinks while nothing else changes.
+
+        Arguments:
+        ms -- Time in ms until the window should wake up.
+        """
+        wake = perf_counter() + ms / 1000
+        if self.__wake is None or wake < self.__wake:
+            self.__wake = wake
+
+    def idle_wait(self) -> int:
+        """Get the time in ms to sleep for, 0 if the window is not idle."""
+        if not self.idle:
+            return 0
+        wait = self.idle_timeout
+        if self.__wake is not None:
+            wait = min(wait, (self.__wake - perf_counter()) * 1000)
+        return max(0, int(wait))
+
+    def slept(self, ms: float) -> NoReturn:
+        """Record time slept while idle.
+
+        Arguments:
+        ms -- Time in ms slept.
+        """
+        self.idle_sleeps += 1
+        self.idle_time += ms
+
+    def begin_frame(self, events: bool) -> NoReturn:
+        """Start a new frame, once its events are handled.
+
+        Arguments:
+        events -- Whether the frame had any events, which wake the window.
+        """
+        now = perf_counter()
+        self.__frame_start = now
+        if events:
+            self.__unchanged_frames = 0
+        if self.__wake is not None and now >= self.__wake:
+            self.__wake = None
+            self.__unchanged_frames = 0
+
+    def should_render(self, changed: bool) -> str:
+        """Decide whether to render the frame. Returns the reason to skip it,
+        None to render it.
+
+        Arguments:
+        changed -- Whether anything on screen changed since the last render.
+        """
+        if changed:
+            self.__unchanged_frames = 0
+        else:
+            self.__unchanged_frames += 1
+            if self.skip_unchanged:
+                return UNCHANGED
+
+        if self.frame_budget is not None and self.__frame_start is not None:
+            update_time = (perf_counter() - self.__frame_start) * 1000
+            if (
+                update_time + self.render_time > self.frame_budget
+                and self.__dropped < self.max_dropped
+            ):
+                self.__dropped += 1
+                return BUDGET
+        self.__dropped = 0
+        return None
+
+    def begin_render(self) -> NoReturn:
+        self.__render_start = perf_counter()
+
+    def end_frame(self, skipped: str = None) -> NoReturn:
+        """Finish the frame, rendered unless given why it was skipped.
+
+        Arguments:
+        skipped -- Reason the render frame was skipped, None if rendered.
+        """
+        if skipped is not None:
+            self.skipped[skipped] += 1
+        elif self.__render_start is not None:
+            render_time = (perf_counter() - self.__render_start) * 1000
+            self.render_time += (render_time - self.render_time) * 0.1
+        self.__render_start = None
+        if self.__frame_start is not None:
+            self.frames.append((self.__frame_start, skipped is None))
+
+    def stats(self) -> Dict:
+        """Get the effective frame rates over the rolling window and the
+        number of render frames skipped for every reason. Times are in ms.
+        """
+        frames = list(self.frames)
+        span = frames[-1][0] - frames[0][0] if len(frames) > 1 else 0
+        rendered = sum(1 for _, was_rendered in frames if was_rendered)
+        update_fps = (len(frames) - 1) / span if span else 0
+        return {
+            "frames": len(frames),
+            "rendered": rendered,
+            "update_fps": update_fps,
+            "fps": update_fps * rendered / len(frames) if frames else 0,
+            "skipped": dict(self.skipped),
+            "idle": self.idle,
+            "idle_sleeps": self.idle_sleeps,
+            "idle_time": self.idle_time,
+            "render_time": self.render_time,
+        }
+
+    def reset(self) -> NoReturn:
+        """Forget every recorded frame and skip."""
+        self.frames.clear()
+        self.skipped.clear()
+        self.idle_sleeps = 0
+        self.idle_time = 0
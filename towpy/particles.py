@@ -0,0 +1,229 @@
+from typing import Tuple, Sequence, NoReturn
+from towpy import config
+from towpy.textobject import TextObject
+from towpy.richtext import palette
+from towpy.framebuffer import np, require_numpy
+
+Position = Tuple[int, int]
+Size = Tuple[int, int]
+Colour = Tuple[int, int, int]
+Range = Tuple[float, float]
+
+
+class ParticleEmitter(TextObject):
+    """Emits glyph particles over an area of cells. The position, velocity,
+    age, lifetime, glyph and colour of every particle live in numpy arrays
+    and are integrated in one vectorised step, then scattered into the cells
+    of the emitter, so a particle costs no Python objects. The emitter is
+    added to a window like any other TextObject.
+
+    Every particle steps through the glyphs and colours over its lifetime,
+    e.g. "*+." for sparks that fade. Where particles share a cell the last
+    emitted is drawn. An emitter with no particles left and no rate sleeps
+    until emit is called.
+
+    Arguments:
+    pos -- Coordinate of the top left of the area.
+    size -- Size of the area in cells (Columns, Rows).
+    glyphs -- Characters every particle steps through over its lifetime.
+    colours -- (R, G, B) colours every particle steps through over its lifetime.
+    rate -- Particles emitted per second.
+    lifetime -- (Min, Max) lifetime of a particle in ms.
+    speed -- (Min, Max) speed of a particle in pixels per ms.
+    angle -- (Min, Max) direction of a particle in degrees, 0 being right.
+    gravity -- (X, Y) acceleration of every particle in pixels per ms².
+    origin -- Pixel position particles are emitted from, relative to the top
+              left of the area. The centre of the area if None.
+    capacity -- Number of particles to allocate up front. Grows when needed.
+    seed -- Seed of the random generator, for repeatable effects.
+    """
+
+    def __init__(
+        self,
+        pos: Position,
+        size: Size,
+        glyphs: str = "*+.",
+        colours: Sequence[Colour] = ((255, 255, 255),),
+        rate: float = 0,
+        lifetime: Range = (500, 1000),
+        speed: Range = (0.05, 0.2),
+        angle: Range = (0, 360),
+        gravity: Tuple[float, float] = (0, 0),
+        origin: Position = None,
+        capacity: int = 1024,
+        seed: int = None,
+    ):
+        require_numpy("ParticleEmitter")
+        if not glyphs or not colours:
+            raise ValueError("Particles need at least one glyph and colour!")
+        columns, rows = size
+        TextObject.__init__(self, [[None] * columns] * rows, pos)
+        self.own_text()
+        self.columns = columns
+        self.rows = rows
+        self.__rate = rate
+        self.lifetime = lifetime
+        self.speed = speed
+        self.angle = angle
+        self.gravity = gravity
+        cell_width, cell_height = config.cell_size
+        if origin is None:
+            origin = (columns * cell_width / 2, rows * cell_height / 2)
+        self.origin = origin
+        self.set_glyphs(glyphs, colours)
+
+        self.count = 0
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.ages = np.zeros(capacity)
+        self.lifetimes = np.ones(capacity)
+        self.glyphs = np.zeros(capacity, np.uint32)
+        self.colours = np.zeros(capacity, np.uint32)
+        self.__random = np.random.default_rng(seed)
+        self.__emission = 0.0
+        # Whether any cell of the area is showing a particle
+        self.__drawn = False
+
+    @property
+    def rate(self) -> float:
+        """Particles emitted per second."""
+        return self.__rate
+
+    @rate.setter
+    def rate(self, rate: float) -> NoReturn:
+        self.__rate = rate
+        if rate:
+            self.wake()
+
+    def set_glyphs(self, glyphs: str, colours: Sequence[Colour]) -> NoReturn:
+        """Set the glyphs and colours particles step through over their
+        lifetime, also for live particles.
+
+        Arguments:
+        glyphs -- Characters to step through.
+        colours -- (R, G, B) colours to step through.
+        """
+        self.__glyph_table = np.array([ord(glyph) for glyph in glyphs], np.uint32)
+        self.__colour_table = np.array(
+            [palette.index(colour) for colour in colours], np.uint32
+        )
+
+    def emit(self, count: int, origin: Position = None) -> NoReturn:
+        """Emit particles, waking the emitter if it sleeps.
+
+        Arguments:
+        count -- Number of particles to emit.
+        origin -- Pixel position relative to the top left of the area, the
+                  origin of the emitter if None.
+        """
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        while end > len(self.ages):
+            self.__grow()
+
+        random = self.__random
+        x, y = self.origin if origin is None else origin
+        angles = np.radians(random.uniform(*self.angle, count))
+        speeds = random.uniform(*self.speed, count)
+        self.positions[start:end] = (x, y)
+        self.velocities[start:end, 0] = np.cos(angles) * speeds
+        self.velocities[start:end, 1] = np.sin(angles) * speeds
+        self.ages[start:end] = 0
+        self.lifetimes[start:end] = random.uniform(*self.lifetime, count)
+        self.count = end
+        self.wake()
+
+    def clear(self) -> NoReturn:
+        """Remove every live particle."""
+        self.count = 0
+
+    def update(self, dt: int) -> NoReturn:
+        """Emit particles due by the rate, then integrate and age every
+        particle and draw them into the cells of the emitter.
+        """
+        if self.rate:
+            self.__emission += self.rate * dt / 1000
+            emitted = int(self.__emission)
+            self.__emission -= emitted
+            self.emit(emitted)
+
+        n = self.count
+        if n:
+            ages = self.ages[:n]
+            ages += dt
+            alive = ages < self.lifetimes[:n]
+            if not alive.all():
+                n = self.__compact(alive)
+
+        if n:
+            velocities = self.velocities[:n]
+            if self.gravity[0] or self.gravity[1]:
+                velocities += np.multiply(self.gravity, dt)
+            self.positions[:n] += velocities * dt
+
+            progress = self.ages[:n] / self.lifetimes[:n]
+            self.glyphs[:n] = self.__over_lifetime(self.__glyph_table, progress)
+            self.colours[:n] = self.__over_lifetime(self.__colour_table, progress)
+
+        if n or self.__drawn:
+            self.__draw()
+        if not n and not self.rate:
+            self.sleep()
+
+    @staticmethod
+    def __over_lifetime(table: "np.ndarray", progress: "np.ndarray") -> "np.ndarray":
+        """Pick the entry of a table every particle is at given how far
+        through its lifetime it is.
+        """
+        steps = (progress * len(table)).astype(np.intp)
+        return table[np.minimum(steps, len(table) - 1)]
+
+    def __draw(self) -> NoReturn:
+        """Scatter every particle into the cells of the emitter."""
+        text = self.default_text
+        codes = np.frombuffer(text.codes, np.uint32)
+        fg = np.frombuffer(text.fg, np.uint32)
+        codes[:] = 0
+
+        n = self.count
+        cell_width, cell_height = config.cell_size
+        columns = (self.positions[:n, 0] // cell_width).astype(np.intp)
+        rows = (self.positions[:n, 1] // cell_height).astype(np.intp)
+        inside = (columns >= 0) & (columns < self.columns)
+        inside &= (rows >= 0) & (rows < self.rows)
+        cells = rows[inside] * self.columns + columns[inside]
+        codes[cells] = self.glyphs[:n][inside]
+        fg[cells] = self.colours[:n][inside]
+
+        self.__drawn = len(cells) > 0
+        self.mark_dirty()
+
+    def __compact(self, alive: "np.ndarray") -> int:
+        """Drop dead particles, keeping live ones in emission order."""
+        n = int(alive.sum())
+        for array in (
+            self.positions,
+            self.velocities,
+            self.ages,
+            self.lifetimes,
+            self.glyphs,
+            self.colours,
+        ):
+            array[:n] = array[: self.count][alive]
+        self.count = n
+        return n
+
+    def __grow(self) -> NoReturn:
+        for name in (
+            "positions",
+            "velocities",
+            "ages",
+            "lifetimes",
+            "glyphs",
+            "colours",
+        ):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
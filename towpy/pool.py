@@ -0,0 +1,77 @@
+from typing import Callable, NoReturn
+from towpy.textobject import TextObject
+
+
+class ObjectPool:
+    """Recycles TextObjects that come and go often, e.g. bullets or
+    particles. TextObjects are made once, with their sprite and components,
+    and go back to the pool when removed from their window instead of being
+    thrown away, so spawning them allocates nothing.
+
+    Taking a TextObject from the pool calls reset on its components, then
+    reset on the TextObject with the arguments given to acquire or spawn.
+
+    Arguments:
+    factory -- Function making a new TextObject, called when the pool is empty.
+    size -- Number of TextObjects to make up front.
+    max_size -- Most free TextObjects to keep, None for no limit.
+    """
+
+    def __init__(self, factory: Callable, size: int = 0, max_size: int = None):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+        # Number of TextObjects the factory made
+        self.created = 0
+        for _ in range(size):
+            self.free.append(self.__create())
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs) -> TextObject:
+        """Take a free TextObject, or make one if there are none, and reset
+        it. Arguments are given to its reset method.
+        """
+        text_object = self.free.pop() if self.free else self.__create()
+        text_object.removed = False
+        for component in text_object.components:
+            component.reset()
+        text_object.reset(*args, **kwargs)
+        return text_object
+
+    def spawn(
+        self, window: "TextOnlyWindow", *args, layer: str = "default", **kwargs
+    ) -> TextObject:
+        """Take a TextObject like acquire and add it to a window.
+
+        Arguments:
+        window -- The TextOnlyWindow to add it to.
+        layer -- Name of the layer to draw it in.
+        """
+        text_object = self.acquire(*args, **kwargs)
+        window.add_object(text_object, layer)
+        return text_object
+
+    def recycle(self, text_object: TextObject) -> NoReturn:
+        """Give a TextObject back to the pool. Windows do this once a pooled
+        TextObject has been removed from them.
+
+        Arguments:
+        text_object -- A TextObject of this pool, not in a window.
+        """
+        if text_object.pool is not self:
+            raise ValueError("TextObject does not belong to this pool!")
+        if text_object.window is not None:
+            raise ValueError("TextObject must be removed from its window first!")
+        text_object.sleeping = False
+        if self.max_size is not None and len(self.free) >= self.max_size:
+            text_object.pool = None
+            return
+        self.free.append(text_object)
+
+    def __create(self) -> TextObject:
+        text_object = self.factory()
+        text_object.pool = self
+        self.created += 1
+        return text_object
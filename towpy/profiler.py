@@ -0,0 +1,226 @@
+import json
+from collections import deque, defaultdict
+from time import perf_counter
+from typing import Tuple, Dict, List, Generic, NoReturn
+from weakref import WeakKeyDictionary
+from towpy.textobject import TextObject
+from towpy.config import glyph_cache
+
+Position = Tuple[int, int]
+Colour = Tuple[int, int, int]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest rank percentile of some values, 0 if there are none.
+
+    Arguments:
+    values -- Values to take the percentile of.
+    percent -- Percentile between 0 and 100.
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = int(round(percent / 100 * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+class FrameProfiler:
+    """Records where the frames of a TextOnlyWindow go. Phases are timed by
+    the window marking the end of each one, frame times and counters are kept
+    for a rolling window of frames. Costs of TextObjects and component types
+    are averaged over every frame since the profiler was enabled or reset.
+
+    Arguments:
+    window_size -- Number of frames the rolling statistics cover.
+    """
+
+    def __init__(self, window_size: int = 300):
+        self.window_size = window_size
+        self.frame_times = deque(maxlen=window_size)
+        self.frames = deque(maxlen=window_size)
+        self.object_costs = WeakKeyDictionary()
+        self.component_costs = defaultdict(float)
+        self.profiled_frames = 0
+        self.__frame = None
+        self.__frame_start = None
+        self.__mark = None
+        self.__glyph_misses = glyph_cache.misses
+        self.__glyph_hits = glyph_cache.hits
+
+    def reset(self) -> NoReturn:
+        """Forget every recorded frame and cost."""
+        self.__init__(self.window_size)
+
+    def begin_frame(self) -> NoReturn:
+        """Start timing a new frame, ending the current one if needed."""
+        now = perf_counter()
+        if self.__frame is not None:
+            self.end_frame()
+        if self.__frame_start is not None:
+            self.frame_times.append((now - self.__frame_start) * 1000)
+        self.__frame_start = now
+        self.__mark = now
+        self.__frame = {"phases": defaultdict(float), "counters": defaultdict(int)}
+
+    def end_frame(self) -> NoReturn:
+        """Finish the current frame and add it to the rolling window."""
+        if self.__frame is None:
+            return
+        counters = self.__frame["counters"]
+        counters["glyph_renders"] += glyph_cache.misses - self.__glyph_misses
+        counters["glyph_cache_hits"] += glyph_cache.hits - self.__glyph_hits
+        self.__glyph_misses = glyph_cache.misses
+        self.__glyph_hits = glyph_cache.hits
+
+        self.frames.append(self.__frame)
+        self.profiled_frames += 1
+        self.__frame = None
+
+    def mark(self, phase: str = None) -> NoReturn:
+        """Add the time since the last mark to a phase of the current frame.
+
+        Arguments:
+        phase -- Name of the phase that just ended, None to not record it.
+        """
+        now = perf_counter()
+        if self.__frame is not None and phase is not None:
+            self.__frame["phases"][phase] += (now - self.__mark) * 1000
+        self.__mark = now
+
+    def add(self, phase: str, seconds: float) -> NoReturn:
+        """Add a measured duration to a phase of the current frame.
+
+        Arguments:
+        phase -- Name of the phase.
+        seconds -- Duration in seconds.
+        """
+        if self.__frame is not None:
+            self.__frame["phases"][phase] += seconds * 1000
+
+    def count(self, counter: str, amount: int = 1) -> NoReturn:
+        """Increase a counter of the current frame, e.g. blits.
+
+        Arguments:
+        counter -- Name of the counter.
+        amount -- Amount to increase it by.
+        """
+        if self.__frame is not None:
+            self.__frame["counters"][counter] += amount
+
+    def add_object_cost(self, text_object: TextObject, seconds: float) -> NoReturn:
+        costs = self.object_costs
+        costs[text_object] = costs.get(text_object, 0) + seconds
+
+    def add_component_cost(self, component: Generic, seconds: float) -> NoReturn:
+        self.component_costs[type(component).__name__] += seconds
+
+    def stats(self, top_objects: int = 10) -> Dict:
+        """Get a summary of the recorded frames. Times are in ms and phases
+        and counters are averaged per frame.
+
+        Arguments:
+        top_objects -- Number of most expensive TextObjects to include.
+        """
+        frame_times = list(self.frame_times)
+        frames = list(self.frames)
+        count = max(1, len(frames))
+        profiled = max(1, self.profiled_frames)
+
+        phases = defaultdict(float)
+        counters = defaultdict(float)
+        for frame in frames:
+            for phase, ms in frame["phases"].items():
+                phases[phase] += ms / count
+            for counter, amount in frame["counters"].items():
+                counters[counter] += amount / count
+
+        objects = sorted(self.object_costs.items(), key=lambda item: -item[1])
+        total_time = sum(frame_times)
+        return {
+            "frames": len(frames),
+            "fps": len(frame_times) * 1000 / total_time if total_time else 0,
+            "frame_time": {
+                "mean": total_time / len(frame_times) if frame_times else 0,
+                "p50": percentile(frame_times, 50),
+                "p95": percentile(frame_times, 95),
+                "p99": percentile(frame_times, 99),
+                "max": max(frame_times, default=0),
+            },
+            "phases": dict(phases),
+            "counters": dict(counters),
+            "components": {
+                name: seconds * 1000 / profiled
+                for name, seconds in self.component_costs.items()
+            },
+            "objects": [
+                {
+                    "type": type(text_object).__name__,
+                    "id": id(text_object),
+                    "ms": seconds * 1000 / profiled,
+                }
+                for text_object, seconds in objects[:top_objects]
+            ],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Get the stats as a JSON string. Keyword arguments go to json.dumps."""
+        return json.dumps(self.stats(), **kwargs)
+
+    def dump(self, file: Generic) -> NoReturn:
+        """Write the stats as JSON.
+
+        Arguments:
+        file -- Path or writable text file.
+        """
+        if type(file) is str:
+            with open(file, "w") as f:
+                json.dump(self.stats(), f, indent=2)
+        else:
+            json.dump(self.stats(), file, indent=2)
+
+
+class ProfilerOverlay(TextObject):
+    """TextObject showing the stats of a FrameProfiler on screen.
+
+    Arguments:
+    profiler -- The FrameProfiler to show.
+    pos -- Coordinate to place the overlay.
+    colour -- (R, G, B) colour format for font.
+    background -- (R, G, B) colour format for background.
+    refresh -- Time in ms between updates of the text.
+    """
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        pos: Position,
+        colour: Colour = (255, 255, 0),
+        background: Colour = (0, 0, 0),
+        refresh: int = 500,
+    ):
+        self.profiler = profiler
+        self.colour = colour
+        self.background = background
+        self.refresh = refresh
+        self.__since_refresh = 0
+        TextObject.__init__(self, self.__text(), pos, colour, background)
+
+    def update(self, dt: int) -> NoReturn:
+        self.__since_refresh += dt
+        if self.__since_refresh >= self.refresh:
+            self.__since_refresh = 0
+            self.set_sprite(self.__text(), self.colour, self.background)
+
+    def __text(self) -> List[str]:
+        stats = self.profiler.stats(top_objects=0)
+        frame_time = stats["frame_time"]
+        lines = [
+            "FPS %6.1f" % stats["fps"],
+            "p50 %5.1fms p95 %5.1fms p99 %5.1fms"
+            % (frame_time["p50"], frame_time["p95"], frame_time["p99"]),
+        ]
+        for phase, ms in sorted(stats["phases"].items(), key=lambda item: -item[1]):
+            lines.append("%-10s %6.2fms" % (phase, ms))
+        for counter, amount in sorted(stats["counters"].items()):
+            lines.append("%-16s %8.1f" % (counter, amount))
+        return lines
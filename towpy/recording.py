@@ -0,0 +1,312 @@
+import time
+import zlib
+import struct
+from typing import List, Generic, NoReturn
+import pygame
+from towpy import config
+from towpy.backend import Backend
+from towpy.framebuffer import CellFramebuffer, np, require_numpy
+
+MAGIC = b"TOWREC1\n"
+# Columns, rows and keyframe interval
+HEADER = struct.Struct("<HHI")
+# Kind, dt in ms, number of events and payload length
+FRAME = struct.Struct("<BIHI")
+# Event type and key
+EVENT = struct.Struct("<Bi")
+COUNT = struct.Struct("<I")
+
+DELTA, KEYFRAME = 0, 1
+EVENT_TYPES = {pygame.KEYDOWN: 1, pygame.KEYUP: 2, pygame.QUIT: 3}
+PYGAME_EVENTS = {code: event_type for event_type, code in EVENT_TYPES.items()}
+
+
+class Recorder:
+    """Records what a TextOnlyWindow shows, frame by frame, into a compact
+    binary file. Every frame stores the frame time, the key and quit events
+    and only the cells that changed, as runs of cells with colours indexed
+    into a palette, compressed with zlib. Every keyframe_interval frames the
+    whole grid and palette are stored so a Player can seek.
+
+    Arguments:
+    file -- Path or writable binary file.
+    columns -- Width of the recorded grid in cells.
+    rows -- Height of the recorded grid in cells.
+    keyframe_interval -- Number of frames between keyframes.
+    """
+
+    def __init__(
+        self, file: Generic, columns: int, rows: int, keyframe_interval: int = 300
+    ):
+        require_numpy("Recorder")
+        if type(keyframe_interval) is not int or keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be a positive int!")
+        self.columns = columns
+        self.rows = rows
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self.__own_file = type(file) is str
+        self.file = open(file, "wb") if self.__own_file else file
+        self.file.write(MAGIC + HEADER.pack(columns, rows, keyframe_interval))
+
+        # Packed colours in the order they were first recorded
+        self.palette = []
+        self.__palette_indices = {}
+        self.__palette_sent = 0
+        self.__last = None
+        # Composites the frame for windows not using the cell renderer
+        self.__framebuffer = None
+
+    def capture(self, window: "TextOnlyWindow", skipped: bool = False) -> NoReturn:
+        """Record the frame a window just rendered.
+
+        Arguments:
+        window -- The window, rendered with a size matching the recorder.
+        skipped -- Whether rendering the frame was skipped, so the last frame
+                   recorded is still shown.
+        """
+        if skipped and self.__last is not None:
+            # Recorded for its frame time and events, no cells changed
+            cells = [grid.reshape(self.rows, self.columns) for grid in self.__last]
+            self.add_frame(cells, window.dt, window.events)
+            return
+        framebuffer = window.framebuffer
+        if framebuffer is None:
+            if self.__framebuffer is None:
+                self.__framebuffer = CellFramebuffer(self.columns, self.rows)
+            framebuffer = self.__framebuffer
+            window.compose_cells(framebuffer)
+        self.add_frame(framebuffer.get_cells(), window.dt, window.events)
+
+    def add_frame(
+        self, cells: "Cells", dt: int, events: List["pygame.event.Event"] = ()
+    ) -> NoReturn:
+        """Record a frame.
+
+        Arguments:
+        cells -- Codepoint, foreground and background grids of the frame.
+        dt -- Time in ms since the last frame.
+        events -- Events of the frame, only key and quit events are kept.
+        """
+        grids = [grid.ravel() for grid in cells]
+        keyframe = self.frames % self.keyframe_interval == 0
+        if keyframe:
+            changed = np.arange(grids[0].size)
+            self.__last = [grid.copy() for grid in grids]
+        else:
+            last = self.__last
+            changed = np.flatnonzero(
+                (grids[0] != last[0]) | (grids[1] != last[1]) | (grids[2] != last[2])
+            )
+            for grid, last_grid in zip(grids, last):
+                last_grid[changed] = grid[changed]
+
+        codes = grids[0][changed]
+        colours = np.concatenate((grids[1][changed], grids[2][changed]))
+        unique, inverse = np.unique(colours, return_inverse=True)
+        lookup = np.array([self.__palette_index(int(c)) for c in unique], np.uint32)
+        indices = lookup[inverse.reshape(-1)]
+
+        # A keyframe repeats the whole palette so it can be decoded alone
+        first = 0 if keyframe else self.__palette_sent
+        new_colours = np.array(self.palette[first:], np.uint32)
+        self.__palette_sent = len(self.palette)
+
+        # Runs of consecutive changed cells
+        if len(changed):
+            breaks = np.flatnonzero(np.diff(changed) != 1) + 1
+            starts = changed[np.concatenate(([0], breaks))]
+            lengths = np.diff(np.concatenate(([0], breaks, [len(changed)])))
+        else:
+            starts = lengths = changed
+
+        payload = b"".join(
+            (
+                COUNT.pack(first),
+                COUNT.pack(len(new_colours)),
+                new_colours.tobytes(),
+                COUNT.pack(len(starts)),
+                starts.astype(np.uint32).tobytes(),
+                lengths.astype(np.uint32).tobytes(),
+                codes.astype(np.uint32).tobytes(),
+                indices.tobytes(),
+            )
+        )
+        payload = zlib.compress(payload, 1)
+
+        recorded = [
+            EVENT.pack(EVENT_TYPES[event.type], getattr(event, "key", 0))
+            for event in events
+            if event.type in EVENT_TYPES
+        ]
+        self.file.write(
+            FRAME.pack(KEYFRAME if keyframe else DELTA, dt, len(recorded), len(payload))
+        )
+        self.file.write(b"".join(recorded))
+        self.file.write(payload)
+        self.frames += 1
+
+    def close(self) -> NoReturn:
+        """Finish the recording."""
+        self.file.flush()
+        if self.__own_file:
+            self.file.close()
+
+    def __palette_index(self, colour: int) -> int:
+        index = self.__palette_indices.get(colour)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(colour)
+            self.__palette_indices[colour] = index
+        return index
+
+
+class Player:
+    """Plays back a recording made by a Recorder. The grid of the current
+    frame is kept in a CellFramebuffer, so it can be shown on any backend.
+    Seeking decodes from the keyframe before the frame asked for.
+
+    Arguments:
+    file -- Path or readable, seekable binary file.
+    """
+
+    def __init__(self, file: Generic):
+        require_numpy("Player")
+        self.__own_file = type(file) is str
+        self.file = open(file, "rb") if self.__own_file else file
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a TOW.PY recording!")
+        self.columns, self.rows, self.keyframe_interval = HEADER.unpack(
+            self.file.read(HEADER.size)
+        )
+        self.framebuffer = CellFramebuffer(self.columns, self.rows)
+        self.palette = np.zeros(0, np.uint32)
+        # Index of the current frame, -1 before the first
+        self.frame = -1
+        self.dt = 0
+        self.events = []
+        self.changed = np.zeros((self.rows, self.columns), bool)
+
+        # File offset of every frame and index of every keyframe
+        self.__offsets = []
+        self.__keyframes = []
+        offset = self.file.tell()
+        size = self.file.seek(0, 2)
+        while offset + FRAME.size <= size:
+            self.file.seek(offset)
+            kind, _, events, length = FRAME.unpack(self.file.read(FRAME.size))
+            end = offset + FRAME.size + events * EVENT.size + length
+            # A recording cut short ends at the last whole frame
+            if end > size:
+                break
+            if kind == KEYFRAME:
+                self.__keyframes.append(len(self.__offsets))
+            self.__offsets.append(offset)
+            offset = end
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def next(self) -> bool:
+        """Advance to the next frame. Returns False at the end."""
+        if self.frame + 1 >= len(self.__offsets):
+            return False
+        self.__decode(self.frame + 1)
+        return True
+
+    def seek(self, frame: int) -> NoReturn:
+        """Go to a frame, decoding from the keyframe before it.
+
+        Arguments:
+        frame -- Index of the frame.
+        """
+        if not 0 <= frame < len(self.__offsets):
+            raise IndexError("Frame out of range")
+        keyframe = max(k for k in self.__keyframes if k <= frame)
+        start = self.frame + 1 if keyframe <= self.frame < frame else keyframe
+        changed = np.zeros((self.rows, self.columns), bool)
+        for i in range(start, frame + 1):
+            self.__decode(i)
+            changed |= self.changed
+        self.changed = changed
+
+    def get_text(self) -> List[str]:
+        """Get the characters of the current frame as one string per row."""
+        return ["".join(map(chr, row)) for row in self.framebuffer.codes.tolist()]
+
+    def play(
+        self, backend: Backend = None, speed: float = 1.0, caption: str = "TOW.PY"
+    ) -> NoReturn:
+        """Play the recording from the current frame to the end.
+
+        Arguments:
+        backend -- Backend to show frames on, None to only decode them.
+        speed -- Playback speed, 0 to play as fast as possible.
+        caption -- Title of the window.
+        """
+        if backend is not None:
+            cell_width, cell_height = config.cell_size
+            backend.open(
+                (self.columns * cell_width, self.rows * cell_height), caption
+            )
+            if self.frame >= 0:
+                self.framebuffer.invalidate()
+                backend.present_cells(self.framebuffer, self.framebuffer.diff())
+
+        start = time.perf_counter()
+        elapsed = 0
+        while self.next():
+            elapsed += self.dt / 1000
+            if backend is not None:
+                backend.poll_events()
+                backend.present_cells(self.framebuffer, self.changed)
+            if speed:
+                delay = elapsed / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+    def close(self) -> NoReturn:
+        if self.__own_file:
+            self.file.close()
+
+    def __decode(self, frame: int) -> NoReturn:
+        """Read a frame and apply its cells to the grid."""
+        self.file.seek(self.__offsets[frame])
+        kind, self.dt, events, length = FRAME.unpack(self.file.read(FRAME.size))
+        recorded = self.file.read(events * EVENT.size)
+        self.events = [
+            pygame.event.Event(PYGAME_EVENTS[event_type], key=key)
+            for event_type, key in EVENT.iter_unpack(recorded)
+        ]
+        payload = memoryview(zlib.decompress(self.file.read(length)))
+
+        first, colours = struct.unpack_from("<II", payload)
+        pos = 8
+        new_colours = np.frombuffer(payload, np.uint32, colours, pos)
+        pos += new_colours.nbytes
+        self.palette = np.concatenate((self.palette[:first], new_colours))
+
+        (runs,) = COUNT.unpack_from(payload, pos)
+        pos += COUNT.size
+        starts = np.frombuffer(payload, np.uint32, runs, pos)
+        pos += starts.nbytes
+        lengths = np.frombuffer(payload, np.uint32, runs, pos)
+        pos += lengths.nbytes
+        cells = int(lengths.sum())
+        codes = np.frombuffer(payload, np.uint32, cells, pos)
+        pos += codes.nbytes
+        indices = np.frombuffer(payload, np.uint32, cells * 2, pos)
+
+        # Expand runs back into cell indices
+        starts = starts.astype(np.int64)
+        lengths = lengths.astype(np.int64)
+        changed = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        changed += np.arange(cells)
+
+        framebuffer = self.framebuffer
+        framebuffer.codes.ravel()[changed] = codes
+        framebuffer.fg.ravel()[changed] = self.palette[indices[:cells]]
+        framebuffer.bg.ravel()[changed] = self.palette[indices[cells:]]
+        self.changed = np.zeros((self.rows, self.columns), bool)
+        self.changed.ravel()[changed] = True
+        self.frame = frame
@@ -0,0 +1,384 @@
+from array import array
+from typing import Tuple, List, Iterator, Callable, Generic, NoReturn
+
+Position = Tuple[int, int]
+Colour = Tuple[int, int, int]
+Cell = Tuple[str, Colour, Colour]
+# (Line, Column, Lines, Columns) area of a RichText
+Region = Tuple[int, int, int, int]
+
+# Packed value used for characters without a colour, e.g. no background
+NO_COLOUR = 1 << 24
+# Flag of colours stored as their packed value instead of a palette index
+DIRECT = 1 << 31
+
+
+def pack_colour(colour: Colour) -> int:
+    """Pack a (R, G, B) colour into a single int. None packs to NO_COLOUR."""
+    if colour is None:
+        return NO_COLOUR
+    return (colour[0] << 16) | (colour[1] << 8) | colour[2]
+
+
+def unpack_colour(value: int) -> Colour:
+    """Unpack a colour packed by pack_colour back into (R, G, B) format."""
+    if value == NO_COLOUR:
+        return None
+    return ((value >> 16) & 255, (value >> 8) & 255, value & 255)
+
+
+class Palette:
+    """Interns colours so RichText can store a small index per character
+    instead of a colour tuple. Index 0 is always no colour (None).
+
+    Colours are never removed, so the palette stops growing at max_size
+    colours. New colours are then stored as their packed value with the
+    DIRECT flag set, so colours made every frame, e.g. animated or heatmap
+    colours, do not use more and more memory.
+
+    Arguments:
+    max_size -- Most colours to intern.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.colours = [None]
+        self.packed = array("I", [NO_COLOUR])
+        self.__indices = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.colours)
+
+    @property
+    def full(self) -> bool:
+        """Whether new colours are stored directly instead of interned."""
+        return len(self.colours) >= self.max_size
+
+    def index(self, colour: Colour) -> int:
+        """Get the palette index of a colour, adding it if needed.
+
+        Arguments:
+        colour -- (R, G, B) colour format, or None for no colour.
+        """
+        try:
+            return self.__indices[colour]
+        except KeyError:
+            pass
+        except TypeError:
+            # Colours given as lists are not hashable
+            colour = tuple(colour)
+            if colour in self.__indices:
+                return self.__indices[colour]
+
+        if self.full:
+            return DIRECT | pack_colour(colour)
+        index = len(self.colours)
+        self.colours.append(colour)
+        self.packed.append(pack_colour(colour))
+        self.__indices[colour] = index
+        return index
+
+    def colour(self, value: int) -> Colour:
+        """Get the colour of a palette index or directly stored colour.
+
+        Arguments:
+        value -- A value given by index.
+        """
+        if value & DIRECT:
+            return unpack_colour(value ^ DIRECT)
+        return self.colours[value]
+
+    def colour_lookup(self) -> Callable[[int], Colour]:
+        """Get a function like colour, a plain lookup while no colour is
+        stored directly.
+        """
+        return self.colour if self.full else self.colours.__getitem__
+
+
+# Shared by every RichText so equal colours always have equal indices
+palette = Palette()
+
+
+class RichText:
+    """Compact storage of the characters of a TextObject. Characters are held
+    as a flat array of codepoints with palette indexed foreground and
+    background arrays, row by row. Lines shorter than the widest line are
+    padded with missing characters (codepoint 0).
+
+    Iterating a RichText yields each line as a list of
+    (Character, Foreground Colour, Background Colour) tuples.
+
+    Arguments:
+    width -- Width in characters.
+    height -- Height in characters.
+    codes -- Optional array of width * height codepoints.
+    fg -- Optional array of width * height foreground palette indices.
+    bg -- Optional array of width * height background palette indices.
+    """
+
+    __slots__ = ("width", "height", "codes", "fg", "bg")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        codes: array = None,
+        fg: array = None,
+        bg: array = None,
+    ):
+        self.width = width
+        self.height = height
+        empty = bytes(4 * width * height)
+        self.codes = array("I", empty) if codes is None else codes
+        self.fg = array("I", empty) if fg is None else fg
+        self.bg = array("I", empty) if bg is None else bg
+
+    @classmethod
+    def from_text(
+        cls, text: Generic, colour: Colour, background: Colour
+    ) -> "RichText":
+        """Create RichText from a string or list of lines.
+
+        Arguments:
+        text -- Some text format, e.g. string or list of chars to be converted.
+        colour -- (R, G, B) colour format for font.
+        background -- (R, G, B) colour format for background.
+        """
+        lines = text
+        # If string we need to break into list of lines
+        if type(text) is str:
+            lines = text.split("\n")
+
+        width = max((len(line) for line in lines), default=0)
+
+        fg, bg = palette.index(colour), palette.index(background)
+        codes, fgs, bgs = [], [], []
+        for line in lines:
+            padding = [0] * (width - len(line))
+            codes.extend(0 if char is None else ord(char) for char in line)
+            codes.extend(padding)
+            fgs.extend([fg] * len(line))
+            fgs.extend(padding)
+            bgs.extend([bg] * len(line))
+            bgs.extend(padding)
+
+        return cls(
+            width,
+            len(lines),
+            array("I", codes),
+            array("I", fgs),
+            array("I", bgs),
+        )
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[List[Cell]]:
+        for row in range(self.height):
+            yield self[row]
+
+    def __getitem__(self, row: int) -> List[Cell]:
+        if row < 0:
+            row += self.height
+        if not 0 <= row < self.height:
+            raise IndexError("RichText row out of range")
+        colour = palette.colour_lookup()
+        start = row * self.width
+        end = start + self.width
+        return [
+            (chr(code) if code else None, colour(fg), colour(bg))
+            for code, fg, bg in zip(
+                self.codes[start:end], self.fg[start:end], self.bg[start:end]
+            )
+        ]
+
+    def characters(self) -> Iterator[Tuple[int, int, str, Colour, Colour]]:
+        """Iterate over every character that is not missing.
+        Yields (Row, Column, Character, Foreground Colour, Background Colour).
+        """
+        colour = palette.colour_lookup()
+        width = self.width
+        for i, code in enumerate(self.codes):
+            if code:
+                yield (
+                    i // width,
+                    i % width,
+                    chr(code),
+                    colour(self.fg[i]),
+                    colour(self.bg[i]),
+                )
+
+    def copy(self) -> "RichText":
+        """Get an independent copy of the RichText."""
+        return RichText(
+            self.width,
+            self.height,
+            array("I", self.codes),
+            array("I", self.fg),
+            array("I", self.bg),
+        )
+
+    def set_colour_at(self, pos: Position, colour: Colour) -> NoReturn:
+        """Set the font colour of a character.
+
+        Arguments:
+        pos -- (Line, Column) of the character.
+        colour -- (R, G, B) colour format for font.
+        """
+        self.fg[self.__index(pos)] = palette.index(colour)
+
+    def set_background_at(self, pos: Position, colour: Colour) -> NoReturn:
+        """Set the background colour of a character.
+
+        Arguments:
+        pos -- (Line, Column) of the character.
+        colour -- (R, G, B) colour format for background.
+        """
+        self.bg[self.__index(pos)] = palette.index(colour)
+
+    def set_colour(
+        self, colour: Colour, region: Region = None, mask: Generic = None
+    ) -> NoReturn:
+        """Set the font colour of every character in a region.
+
+        Arguments:
+        colour -- (R, G, B) colour format for font.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        mask -- Rows of flags over the region, only cells with a truthy flag
+                that is not a space are changed. None changes every cell.
+        """
+        self.__fill(region, mask, ((self.fg, palette.index(colour)),))
+
+    def set_background(
+        self, colour: Colour, region: Region = None, mask: Generic = None
+    ) -> NoReturn:
+        """Set the background colour of every character in a region.
+
+        Arguments:
+        colour -- (R, G, B) colour format for background, None for none.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        mask -- Rows of flags over the region, see set_colour.
+        """
+        self.__fill(region, mask, ((self.bg, palette.index(colour)),))
+
+    def fill(
+        self,
+        char: str,
+        region: Region = None,
+        colour: Colour = None,
+        background: Colour = None,
+        mask: Generic = None,
+    ) -> NoReturn:
+        """Fill a region with a character.
+
+        Arguments:
+        char -- Character to fill with, None for missing characters.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        colour -- (R, G, B) colour format for font, None to keep.
+        background -- (R, G, B) colour format for background, None to keep.
+        mask -- Rows of flags over the region, see set_colour.
+        """
+        values = [(self.codes, 0 if char is None else ord(char))]
+        if colour is not None:
+            values.append((self.fg, palette.index(colour)))
+        if background is not None:
+            values.append((self.bg, palette.index(background)))
+        self.__fill(region, mask, values)
+
+    def blit(self, source: "RichText", pos: Position = (0, 0)) -> NoReturn:
+        """Copy another RichText on top of this one. Missing characters of the
+        source leave the characters below them unchanged. Anything outside
+        this RichText is cut off.
+
+        Arguments:
+        source -- The RichText to copy.
+        pos -- (Line, Column) to place the top left of the source at.
+        """
+        top, left, bottom, right = self.__clip(
+            (pos[0], pos[1], source.height, source.width)
+        )
+        src_col = left - pos[1]
+        width = right - left
+        for row in range(top, bottom):
+            src = (row - pos[0]) * source.width + src_col
+            dst = row * self.width + left
+            codes = source.codes[src : src + width]
+            if 0 not in codes:
+                self.codes[dst : dst + width] = codes
+                self.fg[dst : dst + width] = source.fg[src : src + width]
+                self.bg[dst : dst + width] = source.bg[src : src + width]
+                continue
+            for i, code in enumerate(codes):
+                if code:
+                    self.codes[dst + i] = code
+                    self.fg[dst + i] = source.fg[src + i]
+                    self.bg[dst + i] = source.bg[src + i]
+
+    def apply_mask(self, mask: Generic, pos: Position = (0, 0)) -> NoReturn:
+        """Remove every character where a mask is falsy or a space, leaving
+        the cell transparent. Cells outside the mask are kept.
+
+        Arguments:
+        mask -- Rows of flags, e.g. a list of strings.
+        pos -- (Line, Column) to place the top left of the mask at.
+        """
+        region = (pos[0], pos[1], len(mask), max(map(len, mask), default=0))
+        inverse = [[not self.__flag(flag) for flag in row] for row in mask]
+        self.__fill(region, inverse, ((self.codes, 0),))
+
+    def __fill(self, region: Region, mask: Generic, values: List) -> NoReturn:
+        """Set arrays to a value in every cell of a region.
+
+        Arguments:
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        mask -- Rows of flags over the region, None for every cell.
+        values -- Pairs of (Array, Value) to set.
+        """
+        if region is None:
+            region = (0, 0, self.height, self.width)
+        top, left, bottom, right = self.__clip(region)
+        width = right - left
+        if width <= 0:
+            return
+
+        if mask is None:
+            # Full width regions are one contiguous run of the arrays
+            if width == self.width:
+                runs = [(top * self.width, (bottom - top) * width)]
+            else:
+                runs = [(row * self.width + left, width) for row in range(top, bottom)]
+            for data, value in values:
+                for start, length in runs:
+                    data[start : start + length] = array("I", [value]) * length
+            return
+
+        for row, flags in zip(range(top, bottom), mask[top - region[0] :]):
+            start = row * self.width
+            for col, flag in enumerate(flags[left - region[1] :], left):
+                if col >= right:
+                    break
+                if self.__flag(flag):
+                    for data, value in values:
+                        data[start + col] = value
+
+    def __clip(self, region: Region) -> Tuple[int, int, int, int]:
+        """Get (Top, Left, Bottom, Right) of a region cut to the RichText."""
+        line, column, lines, columns = region
+        top, left = max(0, line), max(0, column)
+        bottom = min(self.height, line + lines)
+        right = min(self.width, column + columns)
+        return top, left, max(top, bottom), max(left, right)
+
+    @staticmethod
+    def __flag(flag: Generic) -> bool:
+        return bool(flag) and flag != " "
+
+    def __index(self, pos: Position) -> int:
+        row, col = pos
+        if row < 0:
+            row += self.height
+        if col < 0:
+            col += self.width
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError("RichText position out of range")
+        return row * self.width + col
@@ -0,0 +1,187 @@
+import heapq
+from typing import Tuple, List, NoReturn
+from towpy.textobject import TextObject
+
+
+class Scheduler:
+    """Decides which TextObjects and components of a window are updated in a
+    simulation step, so the cost of a step grows with the number of active
+    objects instead of every object.
+
+    Awake TextObjects that override update or have components updated every
+    step, other than components integrated by a system of the window, are
+    active and kept in a list in the order they were added. The list
+    is only rebuilt when an object falls asleep, wakes up or changes. Sleeping
+    objects are not updated until woken, and components with an interval are
+    only updated when due. Both are kept in one priority queue ordered by
+    simulation time, so nothing is checked before it is due.
+    """
+
+    def __init__(self):
+        # Simulation time in ms, advanced by every step
+        self.time = 0
+        self.__order = {}
+        self.__next_order = 0
+        # Active TextObjects, as a dict used as an ordered set
+        self.__active = {}
+        self.__active_list = []
+        self.__active_changed = False
+        # (Due Time, Sequence, Component or TextObject) entries, where entries
+        # whose due time no longer matches are stale and skipped
+        self.__queue = []
+        self.__sequence = 0
+        self.__due = {}
+        self.__last_update = {}
+
+    def __len__(self) -> int:
+        return len(self.__active)
+
+    def add(self, text_object: TextObject) -> NoReturn:
+        """Start scheduling a TextObject added to the window.
+
+        Arguments:
+        text_object -- The TextObject.
+        """
+        if text_object not in self.__order:
+            self.__order[text_object] = self.__next_order
+            self.__next_order += 1
+        self.refresh(text_object)
+
+    def remove(self, text_object: TextObject) -> NoReturn:
+        """Stop scheduling a TextObject.
+
+        Arguments:
+        text_object -- The TextObject.
+        """
+        self.__order.pop(text_object, None)
+        self.__deactivate(text_object)
+        self.__due.pop(text_object, None)
+        for component in text_object.components:
+            self.__due.pop(component, None)
+            self.__last_update.pop(component, None)
+
+    def refresh(self, text_object: TextObject) -> NoReturn:
+        """Schedule a TextObject again after it gained components or the
+        interval of one of its components changed.
+
+        Arguments:
+        text_object -- The scheduled TextObject.
+        """
+        if text_object not in self.__order:
+            return
+        self.__deactivate(text_object)
+        for component in text_object.components:
+            self.__due.pop(component, None)
+        if text_object.sleeping:
+            return
+
+        if (
+            type(text_object).update is not TextObject.update
+            or type(text_object).handle_components
+            is not TextObject.handle_components
+            or any(
+                component.interval is None and not component.integrated
+                for component in text_object.components
+            )
+        ):
+            self.__active[text_object] = None
+            self.__active_changed = True
+        for component in text_object.components:
+            if component.interval is not None:
+                self.__last_update[component] = self.time
+                self.__schedule(component, component.interval)
+
+    def sleep(self, text_object: TextObject, ms: float = None) -> NoReturn:
+        """Stop updating a sleeping TextObject, waking it after some time.
+
+        Arguments:
+        text_object -- The TextObject, already flagged as sleeping.
+        ms -- Simulation time in ms to sleep for, None to sleep until woken.
+        """
+        self.refresh(text_object)
+        self.__due.pop(text_object, None)
+        if ms is not None and text_object in self.__order:
+            self.__schedule(text_object, ms)
+
+    def wake(self, text_object: TextObject) -> NoReturn:
+        """Update a TextObject again, already flagged as awake.
+
+        Arguments:
+        text_object -- The TextObject.
+        """
+        self.__due.pop(text_object, None)
+        self.refresh(text_object)
+
+    def active(self) -> List[TextObject]:
+        """Get the TextObjects to update every step, in the order added."""
+        if self.__active_changed:
+            self.__active_list = sorted(self.__active, key=self.__order.__getitem__)
+            self.__active_changed = False
+        return self.__active_list
+
+    def advance(self, dt: int) -> List[Tuple["Component", int]]:
+        """Advance simulation time, waking TextObjects whose sleep is over.
+        Returns every component now due, with the time in ms since it was
+        last updated, and schedules its next update.
+
+        Arguments:
+        dt -- Difference in ms simulated by the step.
+        """
+        self.time += dt
+        queue = self.__queue
+        due = []
+        due_times = []
+        while queue and queue[0][0] <= self.time:
+            when, _, item = heapq.heappop(queue)
+            if self.__due.get(item) != when:
+                continue
+            del self.__due[item]
+            if isinstance(item, TextObject):
+                item.wake()
+                continue
+            due.append((item, self.time - self.__last_update[item]))
+            due_times.append(when)
+            self.__last_update[item] = self.time
+
+        # Scheduled once every due item is taken, so a step never runs a
+        # component twice. The next update is an interval after the one that
+        # was due, so steps not lining up with intervals do not slow it down.
+        for (component, _), when in zip(due, due_times):
+            interval = component.interval
+            if interval is None:
+                self.refresh(component.root)
+            elif when + interval > self.time:
+                self.__schedule(component, when + interval - self.time)
+            else:
+                self.__schedule(component, interval)
+        return due
+
+    def skip(self, ms: float) -> NoReturn:
+        """Advance simulation time without stepping, e.g. over time the
+        window slept. Whatever comes due is handled by the next advance.
+
+        Arguments:
+        ms -- Time in ms to skip.
+        """
+        self.time += ms
+
+    def next_due(self) -> float:
+        """Get the simulation time in ms until something is due, None if
+        nothing is scheduled.
+        """
+        queue = self.__queue
+        while queue and self.__due.get(queue[0][2]) != queue[0][0]:
+            heapq.heappop(queue)
+        if not queue:
+            return None
+        return max(0, queue[0][0] - self.time)
+
+    def __schedule(self, item: object, delay: float) -> NoReturn:
+        when = self.time + delay
+        self.__due[item] = when
+        heapq.heappush(self.__queue, (when, self.__sequence, item))
+        self.__sequence += 1
+
+    def __deactivate(self, text_object: TextObject) -> NoReturn:
+        if self.__active.pop(text_object, 0) is None:
+            self.__active_changed = True
@@ -1,11 +1,36 @@
+import pygame
 from typing import Tuple, Generic, List, NoReturn, final
-from towpy.config import font
+from towpy import config
+from towpy.framebuffer import cells_from_rich_text
+from towpy.assets import prerender, sprite_assets
 
 
 Position = Tuple[int, int]
 Size = Tuple[int, int]
 Colour = Tuple[int, int, int]
-RichText = List[Tuple[Position, Colour, Colour]]
+Region = Tuple[int, int, int, int]
+
+
+class PositionList(list):
+    """Position of a TextObject, telling it when it is changed in place,
+    e.g. position[0] += 1.
+
+    Arguments:
+    owner -- The TextObject.
+    pos -- (X, Y) pixel position.
+    """
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: "TextObject", pos: Position):
+        list.__init__(self, pos)
+        self.owner = owner
+
+    def __setitem__(self, index: int, value: float) -> NoReturn:
+        # Writing the same value, e.g. moving at no speed, is not a move
+        if list.__getitem__(self, index) != value:
+            list.__setitem__(self, index, value)
+            self.owner.mark_moved()
 
 
 class TextObject:
@@ -16,12 +41,87 @@ class TextObject:
         colour: Colour = (255, 255, 255),
         background: Colour = None,
     ):
+        self.motion_system = None
+        self.motion_row = None
+        # Window and layer of the window the TextObject is drawn in
+        self.window = None
+        self.layer = None
+        # Whether moves in place are noticed, see track_moves
+        self.__tracked = False
         self.position = list(pos)
+        # Position at the previous fixed simulation step and the position
+        # interpolated between the two, set by the window when in use
+        self.previous_position = None
+        self.render_position = None
+        self.dirty = True
+        self.changed = True
+        self.__surface = None
+        self.__cells = None
+        # Shared SpriteAsset of default_text, None once it has its own copy
+        self.__asset = None
         self.set_sprite(text, colour, background)
-        self.hidden = False
+        self.__hidden = False
         self.position_gridded = True
         self.components = []
-        self.size = self.get_size()
+        # Sleeping TextObjects and their components are not updated
+        self.sleeping = False
+        # ObjectPool the TextObject goes back to once removed from its window
+        self.pool = None
+        # Given to remove_object and not added back since, so it can not be hit
+        self.removed = False
+
+    @property
+    def position(self) -> List:
+        """Pixel position of the TextObject. While the TextObject is part of a
+        MotionSystem its position is a writable row of the system arrays.
+        """
+        if self.motion_system is None:
+            return self.__position
+        return self.motion_system.positions[self.motion_row]
+
+    @position.setter
+    def position(self, pos: List) -> NoReturn:
+        if self.motion_system is None:
+            self.__position = PositionList(self, pos) if self.__tracked else pos
+        else:
+            self.motion_system.positions[self.motion_row] = pos
+        self.mark_moved()
+
+    @property
+    def hidden(self) -> bool:
+        """Whether the TextObject is left out when drawing."""
+        return self.__hidden
+
+    @hidden.setter
+    def hidden(self, hidden: bool) -> NoReturn:
+        if hidden != self.__hidden:
+            self.__hidden = hidden
+            if self.layer is not None:
+                self.layer.dirty = True
+
+    def track_moves(self, tracked: bool) -> NoReturn:
+        """Notice the position being changed in place, not only assigned. The
+        window turns this on when a camera or static layer needs to know.
+
+        Arguments:
+        tracked -- Whether to track moves in place.
+        """
+        self.__tracked = tracked
+        position = self.__position
+        if tracked and type(position) is not PositionList:
+            self.__position = PositionList(self, position)
+        elif not tracked and type(position) is PositionList:
+            self.__position = list(position)
+
+    def mark_moved(self) -> NoReturn:
+        """Note that the TextObject moved or changed size, so the camera
+        rehashes it. Called whenever its position or sprite changes.
+        """
+        if self.layer is not None:
+            self.layer.dirty = True
+        window = self.window
+        if window is not None and window.camera is not None:
+            window.camera.moved(self)
 
     def update(self, dt: int) -> NoReturn:
         """Update TextObject. This method is expected to be overrided.
@@ -32,78 +132,176 @@ class TextObject:
         pass
 
     def handle_components(self, dt):
+        # Components with an interval are updated by the window when due
         for component in self.components:
-            component.update(dt)
+            if component.interval is None:
+                component.update(dt)
+
+    def reset(self, *args, **kwargs) -> NoReturn:
+        """Called with the arguments given to an ObjectPool when a pooled
+        TextObject is taken to be used again. This method is expected to be
+        overrided to put the TextObject back in its starting state.
+        """
+        pass
+
+    def on_remove(self) -> NoReturn:
+        """Called once the TextObject has left its window. This method is
+        expected to be overrided to release what the TextObject holds.
+        """
+        pass
+
+    def sleep(self, ms: float = None) -> NoReturn:
+        """Stop updating the TextObject and its components until woken by
+        wake, a collision, a key of one of its controls or after some time.
+        Movement integrated by a MotionSystem carries on, stop it first.
+
+        Arguments:
+        ms -- Time in ms to sleep for, None to sleep until woken.
+        """
+        self.sleeping = True
+        if self.window is not None:
+            self.window.scheduler.sleep(self, ms)
+
+    def wake(self) -> NoReturn:
+        """Start updating a sleeping TextObject again."""
+        if not self.sleeping:
+            return
+        self.sleeping = False
+        if self.window is not None:
+            self.window.scheduler.wake(self)
 
     @final
     def set_sprite(self, text, colour=(255, 255, 255), background=None):
-        self.default_text = self.__load_text(text, colour, background)
+        self.__use_asset(self.__load_text(text, colour, background))
+
+    @final
+    def mark_dirty(self) -> NoReturn:
+        """Flag the pre rendered surface as out of date so it is rebuilt on
+        the next render. Only needed if default_text is edited directly, in
+        which case call own_text first as the text may be shared.
+        """
+        if self.__asset is not None:
+            self.__asset.invalidate()
+        self.__changed()
+
+    @final
+    def own_text(self) -> "RichText":
+        """Give the TextObject its own copy of default_text if it is shared
+        with other TextObjects made from the same sprite, and return it.
+        """
+        if self.__asset is not None:
+            self.default_text = self.default_text.copy()
+            self.__asset = None
+            self.__changed()
+        return self.default_text
 
     @final
     def __load_text(
         self, text: Generic, colour: Colour, background: Colour,
-    ) -> RichText:
+    ) -> "SpriteAsset":
         """Loads inputted text into expected format for a text object.
-        Expected format:
-        [[[Position, Foreground Colour, Background Colour], [...], [...]]]
+        Expected format is a RichText, which stores every character as a
+        codepoint with palette indexed foreground and background colours.
+        Iterating it gives [[(Character, Foreground Colour, Background Colour)]]
         List 1st dimension represents the entire string,
              2nd dimension represents a line of text,
              3rd dimension represents character attributes
 
+        The RichText is interned in a SpriteAsset so identical sprites are
+        parsed once and shared until a TextObject changes its copy.
+
         Arguments:
         text -- Some text format, e.g. string or list of chars to be converted.
         colour -- (R, G, B) colour format for font.
         background -- (R, G, B) colour format for background.
         """
-        formatted_text = text
-        # If string we need to break into list of lines
-        if type(text) is str:
-            formatted_text = text.split("\n")
+        return sprite_assets.get(text, colour, background)
 
-        # Turns list into correctly formated RichText
-        rich_text = []
-        for i, line in enumerate(formatted_text):
-            rich_text.append([])
-            for char in line:
-                rich_text[i].append([char, colour, background])
+    @final
+    def __use_asset(self, asset: "SpriteAsset") -> NoReturn:
+        self.__asset = asset
+        self.default_text = asset.text
+        self.size = self.get_size()
+        self.__changed()
+        self.mark_moved()
 
-        return rich_text
+    @final
+    def __changed(self) -> NoReturn:
+        self.dirty = True
+        self.changed = True
+        self.__cells = None
+        if self.layer is not None:
+            self.layer.dirty = True
 
     @final
-    def render(self, surface: "pygame.Surface") -> NoReturn:
+    def render(
+        self, surface: "pygame.Surface", offset: Position = (0, 0)
+    ) -> NoReturn:
         """Render TextObject onto a pygame Surface. Due to the enforced
         limitations of this library every object uses the same font and font
         size. However, choice of colour is allowed. This is why a decision
         was made to pass font in as an argument rather than having each
         text object have its own font variable.
 
-        TODO:
-        * Have the TextObject pre render itself once and simply blit to correct
-        position at render time.
+        The TextObject is pre rendered once into its own surface and simply
+        blitted to the correct position at render time. The surface is only
+        rebuilt after the content of the object has changed.
 
         Arguments:
         surface -- A pygame surface object.
-        font -- A pygame font object.
+        offset -- Position of the camera, subtracted from the position.
+        """
+        x, y = self.get_draw_position()
+
+        if self.dirty:
+            self.__prerender()
+
+        surface.blit(self.__surface, (x - offset[0], y - offset[1]))
+
+    @final
+    def __prerender(self) -> NoReturn:
+        """Render every character of the TextObject onto a transparent surface
+        the size of the object. Shared sprites use the surface of their asset.
+        """
+        if self.__asset is not None:
+            self.__surface = self.__asset.get_surface()
+        else:
+            self.__surface = prerender(self.default_text)
+        self.dirty = False
+
+    @final
+    def get_cells(self) -> "Cells":
+        """Get the codepoint, foreground and background arrays used by the
+        cell renderer. Arrays are cached until the content changes.
         """
-        x, y = self.position
+        if self.__cells is None:
+            if self.__asset is not None:
+                self.__cells = self.__asset.get_cells()
+            else:
+                self.__cells = cells_from_rich_text(self.default_text)
+        return self.__cells
+
+    @final
+    def get_rect(self) -> "pygame.Rect":
+        """Get the area of the screen covered by the TextObject when rendered."""
+        return pygame.Rect(self.get_draw_position(), self.size)
+
+    @final
+    def get_draw_position(self) -> Position:
+        """Get the position the TextObject is drawn at. This is the render
+        position if one was interpolated, snapped to grid if needed.
+        """
+        if self.render_position is not None:
+            x, y = self.render_position
+        else:
+            x, y = self.position
 
         # Snap to grid
         if self.position_gridded:
-            x = x - (x % font.size(" ")[0])
-            y = y - (y % font.size(" ")[1])
-
-        # Must be stored for line restore point
-        initial_x = x
+            x = x - (x % config.cell_size[0])
+            y = y - (y % config.cell_size[1])
 
-        for line in self.default_text:
-            for char, colour, background in line:
-                if char is not None:
-                    surface.blit(font.render(char, False, colour, background), (x, y))
-                x += font.size(" ")[0]
-            # Reset x to start of object and move
-            # y to next line
-            x = initial_x
-            y += font.size(" ")[1]
+        return (x, y)
 
     @final
     def get_size(self) -> Size:
@@ -111,29 +309,100 @@ class TextObject:
         to get dimensions use the class var. This funtion is used to recalculate
         size of object when sprite is changed only.
         """
-        width = 0
-        height = len(self.default_text) * font.size(" ")[1]
-        for line in self.default_text:
-            width = max(width, len(line))
-        return (width * font.size(" ")[0], height)
+        return (
+            self.default_text.width * config.cell_size[0],
+            self.default_text.height * config.cell_size[1],
+        )
 
     @final
-    def set_colour(self, colour: Colour) -> NoReturn:
-        """NOT IMPLEMENTED. Set the colour of entire TextObject
+    def set_colour(
+        self, colour: Colour, region: Region = None, mask: Generic = None
+    ) -> NoReturn:
+        """Set the colour of entire TextObject, or of a region of it.
 
         Arguments:
         colour -- (R, G, B) colour format for font.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        mask -- Rows of flags over the region, only cells with a truthy flag
+                that is not a space are changed, e.g. a list of strings.
         """
-        pass
+        self.__check_colour(colour)
+        self.own_text().set_colour(colour, region, mask)
+        self.__changed()
 
     @final
-    def set_background(self, colour: Colour) -> NoReturn:
-        """NOT IMPLEMENTED. Set the background colour of entire TextObject.
+    def set_background(
+        self, colour: Colour, region: Region = None, mask: Generic = None
+    ) -> NoReturn:
+        """Set the background colour of entire TextObject, or of a region of it.
 
         Arguments:
-        colour -- (R, G, B) colour format for font.
+        colour -- (R, G, B) colour format for background, None for none.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        mask -- Rows of flags over the region, see set_colour.
         """
-        pass
+        if colour is not None:
+            self.__check_colour(colour)
+        self.own_text().set_background(colour, region, mask)
+        self.__changed()
+
+    @final
+    def fill(
+        self,
+        char: str,
+        region: Region = None,
+        colour: Colour = None,
+        background: Colour = None,
+        mask: Generic = None,
+    ) -> NoReturn:
+        """Fill the TextObject, or a region of it, with a character.
+
+        Arguments:
+        char -- Character to fill with, None to make the cells transparent.
+        region -- (Line, Column, Lines, Columns) area, None for everything.
+        colour -- (R, G, B) colour format for font, None to keep.
+        background -- (R, G, B) colour format for background, None to keep.
+        mask -- Rows of flags over the region, see set_colour.
+        """
+        if char is not None and (type(char) is not str or len(char) != 1):
+            raise ValueError("Fill character must be a single character!")
+        for fill_colour in (colour, background):
+            if fill_colour is not None:
+                self.__check_colour(fill_colour)
+        self.own_text().fill(char, region, colour, background, mask)
+        self.__changed()
+
+    @final
+    def blit(self, source: Generic, pos: Position = (0, 0)) -> NoReturn:
+        """Copy the characters of another TextObject or RichText on top of
+        this one. Missing characters of the source are skipped and anything
+        outside of this TextObject is cut off.
+
+        Arguments:
+        source -- The TextObject or RichText to copy.
+        pos -- Relative (Line, Column) to place the source at.
+        """
+        if isinstance(source, TextObject):
+            source = source.default_text
+        self.own_text().blit(source, pos)
+        self.__changed()
+
+    @final
+    def apply_mask(self, mask: Generic, pos: Position = (0, 0)) -> NoReturn:
+        """Remove the characters where a mask is falsy or a space, leaving
+        those cells transparent.
+
+        Arguments:
+        mask -- Rows of flags, e.g. a list of strings.
+        pos -- Relative (Line, Column) to place the mask at.
+        """
+        self.own_text().apply_mask(mask, pos)
+        self.__changed()
+
+    @staticmethod
+    def __check_colour(colour: Colour) -> NoReturn:
+        if type(colour) is not tuple or len(colour) != 3:
+            raise ValueError("Incorrect colour format!")
 
     @final
     def set_colour_at(self, pos: Position, colour: Colour) -> NoReturn:
@@ -149,7 +418,8 @@ class TextObject:
             and type(pos) is tuple
             and len(pos) == 2
         ):
-            self.default_text[pos[0]][pos[1]][1] = colour
+            self.own_text().set_colour_at(pos, colour)
+            self.__changed()
         else:
             raise ValueError("Incorrect colour or position format!")
 
@@ -167,7 +437,8 @@ class TextObject:
             and type(pos) is tuple
             and len(pos) == 2
         ):
-            self.default_text[pos[0]][pos[1]][2] = colour
+            self.own_text().set_background_at(pos, colour)
+            self.__changed()
         else:
             raise ValueError("Incorrect colour or position format!")
 
@@ -176,15 +447,19 @@ class TextObject:
         self, file: str, colour: Colour, background: Colour
     ) -> "TextObject":
         """Loads a TextObject from a file. Basic way of storing complex sprites.
+        Files are only read again once they have been modified.
 
         Arguments:
         file -- Location of file to load from.
         pos -- Coordinate to initially place TextObject.
         """
-        with open(file) as f:
-            self.default_text = self.__load_text(f.read(), colour, background)
+        self.__use_asset(sprite_assets.load(file, colour, background))
 
     def add_component(self, component):
         component.root = self
         self.components.append(component)
         self.__dict__[type(component).__name__.lower()] = component
+        # Attached when added back if removed from the window this frame
+        if self.window is not None and not self.removed:
+            component.attach(self.window)
+            self.window.scheduler.refresh(self)
@@ -0,0 +1,285 @@
+import os
+import mmap
+import threading
+from array import array
+from typing import Tuple, List, NoReturn
+from towpy.textobject import TextObject
+from towpy.framebuffer import np
+
+Position = Tuple[int, int]
+Size = Tuple[int, int]
+Colour = Tuple[int, int, int]
+
+# Bytes scanned for line breaks at a time by the indexing thread
+CHUNK_SIZE = 1 << 20
+
+
+class LineIndex:
+    """Sparse index of the line offsets of a memory mapped file, built in a
+    background thread. Only the offset of every stride-th line is kept, so
+    memory stays small however large the file is. Lines can be read while
+    the file is still being indexed.
+
+    Arguments:
+    file -- Location of the file.
+    stride -- Number of lines between indexed offsets.
+    encoding -- Encoding used to decode lines.
+    follow -- Keep watching the file for appended lines once indexed.
+    poll -- Time in seconds between checks for appended lines.
+    """
+
+    def __init__(
+        self,
+        file: str,
+        stride: int = 64,
+        encoding: str = "utf-8",
+        follow: bool = False,
+        poll: float = 0.25,
+    ):
+        if type(stride) is not int or stride < 1:
+            raise ValueError("Line index stride must be a positive int!")
+        self.file = file
+        self.stride = stride
+        self.encoding = encoding
+        self.follow = follow
+        self.poll = poll
+        # Increased every time lines are indexed or the file is remapped
+        self.version = 0
+        self.complete = False
+        self.__file = open(file, "rb")
+        self.__mm = None
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.__closed = threading.Event()
+        self.__thread = None
+        self.__reset()
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines indexed so far."""
+        return self.__line_count
+
+    def start(self) -> NoReturn:
+        """Start indexing in the background, if not already running."""
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__closed.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def close(self) -> NoReturn:
+        """Stop indexing and close the file."""
+        self.__closed.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        with self.__lock:
+            if self.__mm is not None:
+                self.__mm.close()
+                self.__mm = None
+            self.__file.close()
+
+    def get_lines(self, start: int, count: int) -> List[str]:
+        """Decode some lines of the file. Fewer lines are returned at the end
+        of the file.
+
+        Arguments:
+        start -- Number of the first line.
+        count -- Number of lines to get.
+        """
+        lines = []
+        with self.__lock:
+            mm = self.__mm
+            if mm is None or start < 0 or start >= self.line_count:
+                return lines
+
+            checkpoint = start // self.stride
+            pos = self.__checkpoints[checkpoint]
+            for _ in range(start - checkpoint * self.stride):
+                pos = mm.find(b"\n", pos) + 1
+
+            size = self.__size
+            while len(lines) < count and pos < size:
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = size
+                line = mm[pos:end].decode(self.encoding, errors="replace")
+                lines.append(line.rstrip("\r").expandtabs())
+                pos = end + 1
+        return lines
+
+    def __reset(self) -> NoReturn:
+        # Offset of the first line of every stride lines
+        self.__checkpoints = array("Q", [0])
+        self.__newlines = 0
+        self.__scanned = 0
+        # Offset of the line after the last line break found
+        self.__line_start = 0
+        self.__line_count = 0
+        self.complete = False
+        self.version += 1
+
+    def __run(self) -> NoReturn:
+        while not self.__closed.is_set():
+            size = os.fstat(self.__file.fileno()).st_size
+            if size != self.__size:
+                self.__remap(size)
+
+            if self.__scanned < self.__size:
+                self.__scan(min(self.__scanned + CHUNK_SIZE, self.__size))
+                continue
+
+            self.complete = True
+            if not self.follow:
+                return
+            self.__closed.wait(self.poll)
+
+    def __remap(self, size: int) -> NoReturn:
+        """Map the file again after it grew, starting over if it shrank."""
+        with self.__lock:
+            if self.__mm is not None:
+                self.__mm.close()
+            self.__mm = None
+            if size > 0:
+                self.__mm = mmap.mmap(
+                    self.__file.fileno(), size, access=mmap.ACCESS_READ
+                )
+            if size < self.__size:
+                self.__reset()
+            self.__size = size
+            self.complete = False
+            self.version += 1
+
+    def __scan(self, end: int) -> NoReturn:
+        """Index the line breaks between the scanned offset and end."""
+        start = self.__scanned
+        # Held throughout, so readers never see the offsets half updated
+        with self.__lock:
+            breaks = self.__find_breaks(self.__mm, start, end)
+            if len(breaks):
+                # Every stride-th line break starts an indexed line
+                first = self.stride - 1 - self.__newlines % self.stride
+                for offset in breaks[first :: self.stride]:
+                    self.__checkpoints.append(int(offset) + 1)
+                self.__newlines += len(breaks)
+                self.__line_start = int(breaks[-1]) + 1
+            self.__scanned = end
+            self.__line_count = self.__newlines + (end > self.__line_start)
+            self.version += 1
+
+    @staticmethod
+    def __find_breaks(mm: mmap.mmap, start: int, end: int) -> List[int]:
+        if np is not None:
+            chunk = np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start)
+            breaks = np.flatnonzero(chunk == 10) + start
+            del chunk
+            return breaks
+
+        breaks = []
+        pos = mm.find(b"\n", start, end)
+        while pos != -1:
+            breaks.append(pos)
+            pos = mm.find(b"\n", pos + 1, end)
+        return breaks
+
+
+class TextViewer(TextObject):
+    """Scrollable view of a text file of any size. The file is memory mapped
+    and indexed in the background, and only the lines in view are decoded
+    and rendered, so memory use does not depend on the size of the file.
+    In follow mode the view stays on the last lines as the file grows. The
+    viewer owns the file and closes it once removed from its window.
+
+    Arguments:
+    file -- Location of the file to view.
+    pos -- Coordinate to place the viewer.
+    size -- Size of the view in characters (Columns, Rows).
+    colour -- (R, G, B) colour format for font.
+    background -- (R, G, B) colour format for background.
+    follow -- Stay on the last lines of the file as it grows, like tail -f.
+    """
+
+    def __init__(
+        self,
+        file: str,
+        pos: Position,
+        size: Size,
+        colour: Colour = (255, 255, 255),
+        background: Colour = None,
+        follow: bool = False,
+    ):
+        self.columns, self.rows = size
+        self.colour = colour
+        self.background = background
+        self.top = 0
+        self.left = 0
+        self.index = LineIndex(file, follow=follow)
+        self.__view = None
+        TextObject.__init__(self, self.__page([]), pos, colour, background)
+        self.index.start()
+
+    @property
+    def follow(self) -> bool:
+        return self.index.follow
+
+    @follow.setter
+    def follow(self, follow: bool) -> NoReturn:
+        self.index.follow = follow
+        if follow:
+            self.index.start()
+
+    def update(self, dt: int) -> NoReturn:
+        """Show the lines in view if they changed since the last update."""
+        if self.follow:
+            self.top = max(0, self.index.line_count - self.rows)
+        self.refresh()
+
+    def refresh(self) -> NoReturn:
+        """Decode and show the lines in view, if the view or the file changed."""
+        view = (self.top, self.left, self.index.version)
+        if view == self.__view:
+            return
+        self.__view = view
+        lines = self.index.get_lines(self.top, self.rows)
+        self.set_sprite(self.__page(lines), self.colour, self.background)
+
+    def scroll(self, lines: int, columns: int = 0) -> NoReturn:
+        """Scroll the view, stopping at the start of the file.
+
+        Arguments:
+        lines -- Lines to scroll down, negative to scroll up.
+        columns -- Columns to scroll right, negative to scroll left.
+        """
+        self.scroll_to(self.top + lines, self.left + columns)
+
+    def scroll_to(self, line: int, column: int = 0) -> NoReturn:
+        """Show the file from a line and column.
+
+        Arguments:
+        line -- Number of the first line in view.
+        column -- Number of the first column in view.
+        """
+        last = max(0, self.index.line_count - self.rows)
+        self.top = min(max(0, line), last)
+        self.left = max(0, column)
+
+    def page(self, pages: int) -> NoReturn:
+        """Scroll by a number of screens.
+
+        Arguments:
+        pages -- Pages to scroll down, negative to scroll up.
+        """
+        self.scroll(pages * self.rows)
+
+    def close(self) -> NoReturn:
+        """Stop indexing and close the file."""
+        self.index.close()
+
+    def on_remove(self) -> NoReturn:
+        self.close()
+
+    def __page(self, lines: List[str]) -> List[str]:
+        """Cut lines to the view, padded so the size of the viewer is fixed."""
+        left, right = self.left, self.left + self.columns
+        page = [line[left:right].ljust(self.columns) for line in lines]
+        page += [" " * self.columns] * (self.rows - len(page))
+        return page
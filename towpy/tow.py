@@ -1,82 +1,882 @@
 import pygame
+import asyncio
+import inspect
 from sys import exit
-from typing import Tuple, NoReturn
+from typing import Tuple, List, Iterator, Generic, NoReturn
 from towpy.textobject import TextObject
-from towpy.config import font
+from towpy import config
+from towpy.framebuffer import CellFramebuffer
+from towpy.collision import CollisionWorld
+from towpy.motion import MotionSystem
+from towpy.camera import Camera
+from towpy.layer import Layer
+from towpy.backend import Backend, PygameBackend
+from towpy.profiler import FrameProfiler
+from towpy.keyboard import Keyboard
+from towpy.recording import Recorder
+from towpy.pacing import FramePacer, UNCHANGED
+from towpy.scheduler import Scheduler
+from time import perf_counter
 
 
 Size = Tuple[int, int]
+Position = Tuple[int, int]
 Colour = Tuple[int, int, int]
+LayerObjects = List[Tuple[Layer, List[TextObject]]]
 
 
 class TextOnlyWindow:
     def __init__(
-        self, size: Size = (64, 32), caption: str = "TOW.PY", size_is_cells: bool = True
+        self,
+        size: Size = (64, 32),
+        caption: str = "TOW.PY",
+        size_is_cells: bool = True,
+        dirty_rects: bool = False,
+        renderer: str = None,
+        broadphase: bool = False,
+        vectorised_motion: bool = False,
+        backend: Backend = None,
+        camera: bool = False,
     ):
-        if not pygame.get_init():
-            pygame.init()
-
         self.running = True
 
         if size_is_cells:
-            size = (size[0] * font.size(" ")[0], size[1] * font.size(" ")[1])
+            cell_width, cell_height = config.cell_size
+            size = (size[0] * cell_width, size[1] * cell_height)
 
-        self.surface = pygame.display.set_mode(size)
-        pygame.display.set_caption(caption)
+        # Where frames are presented, a pygame window unless told otherwise
+        self.backend = backend if backend is not None else PygameBackend()
+        self.surface = self.backend.open(size, caption)
 
         self.clock = pygame.time.Clock()
         self.run_time = 0
         self.target_FPS = 30
         self.dt = 0
 
+        # Fixed simulation step in ms, None to step by the frame time
+        self.fixed_step = None
+        self.max_steps = 5
+        self.interpolate = True
+        self.interpolation = 0
+        self.__accumulator = 0
+
+        # Futures waiting for the next frame of run_async
+        self.__frame_waiters = []
+
         self.background_colour = (0, 0, 0)
-        self.text_objects = []
+        # Dict used as an ordered set, so TextObjects are removed in O(1)
+        self.__objects = {}
+        # TextObjects to remove at the end of the frame, see remove_object
+        self.__removed = {}
+
+        # Which TextObjects and components are updated every step
+        self.scheduler = Scheduler()
+
+        # Key state taken once per frame and key event dispatch
+        self.keyboard = Keyboard()
+        self.events = []
+
+        # Opt-in Recorder of every rendered frame, see start_recording
+        self.recorder = None
+
+        # Opt-in FrameProfiler, see enable_profiler
+        self.profiler = None
+
+        # Opt-in FramePacer skipping renders and sleeping while idle, see
+        # enable_pacing. Scene is what was on screen at the last render.
+        self.pacer = None
+        self.__scene = None
 
-        self.WIDTH, self.HEIGHT = self.surface.get_size()
+        # Collisions of every ColliderComponent found through a spatial hash
+        self.collision_world = CollisionWorld() if broadphase else None
+
+        # Movement and physics of every object integrated in one numpy step
+        self.motion_system = MotionSystem() if vectorised_motion else None
+
+        # Only redraw and present areas of the window that changed
+        self.dirty_rects = dirty_rects
+        self.__presented_rects = {}
+        # Areas of removed TextObjects still to be cleared
+        self.__cleared_rects = []
+        self.__full_redraw = True
+
+        # Named layers drawn in z order, objects go to "default" unless told
+        self.layers = {}
+        self.add_layer("default")
+
+        self.WIDTH, self.HEIGHT = size
+
+        # Viewport over a world larger than the window, only TextObjects in
+        # view are rendered
+        self.camera = Camera(size) if camera else None
+        self.__last_offset = (0, 0)
+
+        # "surface" draws every TextObject with pygame, "cells" composites
+        # TextObjects into a character grid and only draws changed cells.
+        # Backends without a surface can only show cells.
+        if renderer is None:
+            renderer = "surface" if self.backend.has_surface else "cells"
+        if renderer not in ("surface", "cells"):
+            raise ValueError("Renderer must be 'surface' or 'cells'!")
+        if renderer == "surface" and not self.backend.has_surface:
+            raise ValueError("Backend can only be used with the cells renderer!")
+        self.renderer = renderer
+        self.framebuffer = None
+        if renderer == "cells":
+            cell_width, cell_height = config.cell_size
+            self.framebuffer = CellFramebuffer(
+                self.WIDTH // cell_width, self.HEIGHT // cell_height
+            )
+
+    @property
+    def text_objects(self) -> List[TextObject]:
+        """TextObjects in the window, in the order they were added."""
+        return list(self.__objects)
 
     def update(self) -> NoReturn:
-        """Update window and handle any events. Also push events to TextObjects."""
-        self.dt = self.clock.tick(self.target_FPS)
-        self.run_time += self.dt
+        """Update window and handle any events. Also push events to TextObjects.
+        With a fixed timestep the simulation is stepped as many times as
+        needed to catch up with the frame time, up to max_steps.
+        """
+        self.__begin_update(self.target_FPS)
+        for dt in self.__steps():
+            self.step(dt)
+        self.__remove_pending()
 
-        events = pygame.event.get()
+    async def update_async(self) -> NoReturn:
+        """Same as update, but awaits coroutine updates, see step_async. The
+        frame rate is not limited, run_async waits between frames instead.
+        """
+        self.__begin_update(0, idle_wait=False)
+        for dt in self.__steps():
+            await self.step_async(dt)
+        self.__remove_pending()
+
+    def __begin_update(self, target_FPS: int, idle_wait: bool = True) -> NoReturn:
+        """Start a new frame, taking the frame time and handling events.
+
+        Arguments:
+        target_FPS -- Frames per second to limit to, 0 to not wait.
+        idle_wait -- Sleep until the next event or wake up if idle.
+        """
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+
+        slept = 0
+        if self.pacer is not None and idle_wait and self.pacer.idle:
+            # Sleep no longer than until the next scheduled update
+            due = self.scheduler.next_due()
+            if due is not None:
+                self.pacer.wake_in(due)
+            wait = self.pacer.idle_wait()
+            if wait:
+                start = perf_counter()
+                self.backend.wait_events(wait)
+                slept = round((perf_counter() - start) * 1000)
+                self.pacer.slept(slept)
+                # Scheduled updates still come due over the sleep
+                self.scheduler.skip(slept)
+
+        # Time slept is left out, so nothing moves by the whole sleep at once
+        self.dt = max(0, self.backend.tick(self.clock, target_FPS) - slept)
+        self.run_time += self.dt + slept
+        if self.profiler is not None:
+            self.profiler.mark("tick")
+
+        events = self.poll_events()
+        if self.profiler is not None:
+            self.profiler.mark("events")
+        if self.pacer is not None:
+            self.pacer.begin_frame(bool(events))
+
+    def __steps(self) -> Iterator[int]:
+        """Iterate over the simulation steps of the frame, in ms."""
+        if self.fixed_step is None:
+            yield self.dt
+            return
+
+        self.__accumulator += self.dt
+        steps = 0
+        while self.__accumulator >= self.fixed_step and steps < self.max_steps:
+            for text_object in self.__objects:
+                text_object.previous_position = tuple(text_object.position)
+            yield self.fixed_step
+            self.__accumulator -= self.fixed_step
+            steps += 1
+
+        # Too far behind, drop the time that could not be simulated
+        if self.__accumulator >= self.fixed_step:
+            self.__accumulator %= self.fixed_step
+        self.interpolation = self.__accumulator / self.fixed_step
+
+    def poll_events(self) -> List["pygame.event.Event"]:
+        """Get events from the backend, handle any window events and dispatch
+        key events to their handlers.
+        """
+        events = self.backend.poll_events()
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
+        self.keyboard.update(events, self.backend.get_pressed())
+        self.events = events
+        return events
+
+    def step(self, dt: int) -> NoReturn:
+        """Advance the simulation of every active TextObject, due component
+        and system.
+
+        Arguments:
+        dt -- Difference in ms to simulate.
+        """
+        self.__step_updates(dt)
+        self.__step_systems(dt)
+
+    async def step_async(self, dt: int) -> NoReturn:
+        """Same as step, but updates of TextObjects and components may be
+        coroutines. Every coroutine update of the step runs concurrently and
+        is awaited before the systems are stepped.
+
+        Arguments:
+        dt -- Difference in ms to simulate.
+        """
+        pending = []
+        self.__step_updates(dt, pending)
+        if pending:
+            await asyncio.gather(*pending)
+            if self.profiler is not None:
+                self.profiler.mark("update")
+        self.__step_systems(dt)
+
+    def __step_updates(self, dt: int, pending: List = None) -> NoReturn:
+        """Update every active TextObject and due component. With the
+        profiler enabled the cost of every TextObject and component type is
+        recorded.
+
+        Arguments:
+        dt -- Difference in ms to simulate.
+        pending -- List to keep awaitable results in, None to ignore them.
+        """
+        profiler = self.profiler
+        active = self.scheduler.active()
+        if profiler is None and pending is None:
+            # Nothing to measure or await, so the plain loop
+            for text_object in active:
+                text_object.update(dt)
+                text_object.handle_components(dt)
+            for component, elapsed in self.scheduler.advance(dt):
+                component.update(elapsed)
+            return
+
+        if profiler is not None:
+            profiler.mark()
+            profiler.count("active_objects", len(active))
+        update_time = component_time = 0
+        for text_object in active:
+            start = perf_counter()
+            self.__call_update(text_object, dt, pending)
+            updated = perf_counter()
+
+            # Components are updated one by one when the TextObject leaves
+            # that to the default handle_components, so each can be measured
+            # and awaited
+            if type(text_object).handle_components is TextObject.handle_components:
+                for component in text_object.components:
+                    if component.interval is None:
+                        component_time += self.__call_update(component, dt, pending)
+            else:
+                result = text_object.handle_components(dt)
+                if pending is not None and inspect.isawaitable(result):
+                    pending.append(result)
+            end = perf_counter()
+
+            update_time += updated - start
+            if profiler is not None:
+                profiler.add_object_cost(text_object, end - start)
+
+        for component, elapsed in self.scheduler.advance(dt):
+            cost = self.__call_update(component, elapsed, pending)
+            component_time += cost
+            if profiler is not None:
+                profiler.add_object_cost(component.root, cost)
+
+        if profiler is not None:
+            profiler.add("update", update_time)
+            profiler.add("components", component_time)
+            profiler.mark()
+
+    def __call_update(
+        self, updated: Generic, dt: int, pending: List = None
+    ) -> float:
+        """Update a TextObject or component, keeping its result if awaitable.
+        Returns the time the update took in seconds, recorded by the profiler
+        for components.
+        """
+        start = perf_counter()
+        result = updated.update(dt)
+        if pending is not None and inspect.isawaitable(result):
+            pending.append(result)
+        cost = perf_counter() - start
+        if self.profiler is not None and not isinstance(updated, TextObject):
+            self.profiler.add_component_cost(updated, cost)
+        return cost
+
+    def __step_systems(self, dt: int) -> NoReturn:
+        """Step the motion system and collision world of the window."""
+        profiler = self.profiler
+        if self.motion_system is not None:
+            self.motion_system.step(dt)
+            if profiler is not None:
+                profiler.mark("motion")
+
+        if self.collision_world is not None:
+            self.collision_world.step()
+            if profiler is not None:
+                profiler.mark("collision")
+
+    def enable_profiler(self, window_size: int = 300) -> FrameProfiler:
+        """Start recording where frames go. Until enabled the profiler costs
+        nothing.
+
+        Arguments:
+        window_size -- Number of frames the rolling statistics cover.
+        """
+        if self.profiler is None:
+            self.profiler = FrameProfiler(window_size)
+        return self.profiler
+
+    def disable_profiler(self) -> NoReturn:
+        self.profiler = None
+
+    def enable_pacing(
+        self,
+        target_FPS: int = None,
+        skip_unchanged: bool = True,
+        idle_frames: int = 2,
+        idle_timeout: int = 1000,
+        frame_budget: float = None,
+        max_dropped: int = 2,
+    ) -> FramePacer:
+        """Stop rendering frames that would show nothing new and sleep while
+        idle, instead of redrawing at the target frame rate. Under load
+        render frames can be dropped to keep the simulation up to speed.
+        Sleeping while idle is left to the blocking update, run_async only
+        skips and drops frames.
+
+        Arguments:
+        target_FPS -- Frames per second to limit to, None to keep the current.
+        skip_unchanged -- Skip rendering frames where nothing on screen changed.
+        idle_frames -- Unchanged frames without events before sleeping, None to
+                       never sleep.
+        idle_timeout -- Longest time in ms to sleep for.
+        frame_budget -- Time in ms a frame should take, e.g. 1000 / target_FPS,
+                        None to never drop frames.
+        max_dropped -- Most render frames to drop in a row.
+        """
+        if target_FPS is not None:
+            self.target_FPS = target_FPS
+        self.pacer = FramePacer(
+            skip_unchanged, idle_frames, idle_timeout, frame_budget, max_dropped
+        )
+        self.__scene = None
+        return self.pacer
+
+    def disable_pacing(self) -> NoReturn:
+        self.pacer = None
+
+    def wake_in(self, ms: float) -> NoReturn:
+        """Make sure the window is updating within some time even if idle,
+        e.g. for a TextObject that blinks. Does nothing without pacing.
+
+        Arguments:
+        ms -- Time in ms until the window should wake up.
+        """
+        if self.pacer is not None:
+            self.pacer.wake_in(ms)
 
-        for text_object in self.text_objects:
-            text_object.update(self.dt)
-            text_object.handle_components(self.dt)
+    def start_recording(self, file: Generic, keyframe_interval: int = 300) -> Recorder:
+        """Record every frame from now on, to be replayed by a Player. Frames
+        the pacer skips rendering are recorded unchanged.
+
+        Arguments:
+        file -- Path or writable binary file.
+        keyframe_interval -- Number of frames between keyframes.
+        """
+        self.stop_recording()
+        cell_width, cell_height = config.cell_size
+        columns, rows = self.WIDTH // cell_width, self.HEIGHT // cell_height
+        self.recorder = Recorder(file, columns, rows, keyframe_interval)
+        return self.recorder
+
+    def stop_recording(self) -> NoReturn:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def set_fixed_timestep(
+        self, step: int = None, max_steps: int = 5, interpolate: bool = True
+    ) -> NoReturn:
+        """Decouple simulation from rendering. The simulation is always
+        advanced in steps of the same size, whatever the frame time, so it
+        stays deterministic when rendering stalls. To simulate as fast as
+        possible use a HeadlessBackend with a frame_time equal to step.
+
+        Arguments:
+        step -- Size of a simulation step in ms, None to step by frame time.
+        max_steps -- Most steps to catch up on in a single frame.
+        interpolate -- Render positions interpolated between the last two steps.
+        """
+        if step is not None and step <= 0:
+            raise ValueError("Fixed timestep must be positive!")
+        if type(max_steps) is not int or max_steps < 1:
+            raise ValueError("Max steps must be a positive int!")
+        self.fixed_step = step
+        self.max_steps = max_steps
+        self.interpolate = interpolate
+        self.interpolation = 0
+        self.__accumulator = 0
+        for text_object in self.__objects:
+            text_object.previous_position = None
+            text_object.render_position = None
+
+    def __interpolate_positions(self) -> NoReturn:
+        alpha = self.interpolation
+        for text_object in self.__objects:
+            previous = text_object.previous_position
+            if previous is None:
+                continue
+            x, y = text_object.position
+            render_position = (
+                previous[0] + (x - previous[0]) * alpha,
+                previous[1] + (y - previous[1]) * alpha,
+            )
+            if render_position != text_object.render_position:
+                text_object.render_position = render_position
+                text_object.mark_moved()
+
+    def __track_moves(self) -> NoReturn:
+        """Tell TextObjects moved through the MotionSystem arrays they moved."""
+        if self.motion_system is not None:
+            for text_object in self.motion_system.moved():
+                text_object.mark_moved()
 
     def render(self) -> NoReturn:
         """Clear surface, Render TextObjects, Update window"""
+        self.__remove_pending()
+        if self.fixed_step is not None and self.interpolate:
+            self.__interpolate_positions()
+        self.__track_moves()
+
+        if self.camera is not None:
+            layers = self.__layer_objects(self.camera.visible())
+            offset = self.camera.get_offset()
+            if offset != self.__last_offset:
+                self.__full_redraw = True
+                self.__last_offset = offset
+        else:
+            layers = self.__layer_objects()
+            offset = (0, 0)
+
+        # Static layers are cached as a whole, not tracked per TextObject
+        for layer, _ in layers:
+            if layer.static and layer.dirty:
+                self.__full_redraw = True
+
+        if self.pacer is not None:
+            skipped = self.pacer.should_render(self.__scene_changed(layers, offset))
+            if skipped is not None:
+                # Nothing was shown, so the next frame must compare against
+                # what is still on screen
+                if skipped != UNCHANGED:
+                    self.__scene = None
+                # Still recorded, so playback keeps the timing and events
+                if self.recorder is not None:
+                    self.recorder.capture(self, skipped=True)
+                self.pacer.end_frame(skipped)
+                if self.profiler is not None:
+                    self.profiler.count("skipped_frames")
+                    self.profiler.end_frame()
+                return
+            self.pacer.begin_render()
+
+        if self.framebuffer is not None:
+            self.__render_cells(layers, offset)
+        elif self.dirty_rects and not self.__full_redraw:
+            self.__render_dirty(layers, offset)
+        else:
+            self.__render_full(layers, offset)
+
+        if self.recorder is not None:
+            self.recorder.capture(self)
+            if self.profiler is not None:
+                self.profiler.mark("record")
+
+        if self.pacer is not None:
+            for _, text_objects in layers:
+                for text_object in text_objects:
+                    text_object.changed = False
+            self.pacer.end_frame()
+
+        if self.profiler is not None:
+            self.profiler.end_frame()
+
+    def __scene_changed(self, layers: LayerObjects, offset: Position) -> bool:
+        """Whether anything to draw changed since the last render, keeping
+        where every TextObject is drawn to compare against next time.
+        """
+        changed = False
+        scene = [offset]
+        for layer, text_objects in layers:
+            if layer.static and layer.dirty:
+                changed = True
+            for text_object in text_objects:
+                if text_object.changed:
+                    changed = True
+                position = None
+                if not text_object.hidden:
+                    position = text_object.get_draw_position()
+                scene.append((text_object, position))
+        if scene != self.__scene:
+            changed = True
+            self.__scene = scene
+        return changed
+
+    def compose_cells(self, framebuffer: CellFramebuffer) -> NoReturn:
+        """Composite the current frame into a cell framebuffer, whatever the
+        renderer of the window, e.g. to record it.
+
+        Arguments:
+        framebuffer -- CellFramebuffer the size of the window in cells.
+        """
+        self.__track_moves()
+        if self.camera is not None:
+            layers = self.__layer_objects(self.camera.visible())
+            offset = self.camera.get_offset()
+        else:
+            layers = self.__layer_objects()
+            offset = (0, 0)
+        framebuffer.clear(self.background_colour)
+        for _, text_objects in layers:
+            framebuffer.draw(text_objects, offset)
+
+    def __layer_objects(self, visible: List = None) -> LayerObjects:
+        """Get every layer in draw order, each with its TextObjects to draw.
+
+        Arguments:
+        visible -- TextObjects in view of the camera in draw order, None for
+                   every TextObject.
+        """
+        layers = sorted(self.layers.values(), key=lambda layer: layer.z)
+        if visible is None:
+            return [(layer, layer.text_objects) for layer in layers]
+
+        grouped = {layer: [] for layer in layers}
+        for text_object in visible:
+            grouped[text_object.layer].append(text_object)
+        return list(grouped.items())
+
+    def __layer_surface(
+        self, layer: Layer, text_objects: List, offset: Position
+    ) -> "pygame.Surface":
+        """Get the cached surface of a static layer, redrawing it if needed."""
+        if layer.dirty or layer.cache is None or layer.cache_offset != offset:
+            if layer.cache is None:
+                layer.cache = pygame.Surface(
+                    (self.WIDTH, self.HEIGHT), pygame.SRCALPHA
+                )
+            layer.cache.fill((0, 0, 0, 0))
+            for text_object in text_objects:
+                if not text_object.hidden:
+                    text_object.render(layer.cache, offset)
+            layer.dirty = False
+            layer.cache_offset = offset
+        return layer.cache
+
+    def __layer_cells(self, layer: Layer, text_objects: List, offset: Position):
+        """Get the cached cells of a static layer, redrawing them if needed."""
+        if layer.dirty or layer.cache is None or layer.cache_offset != offset:
+            if layer.cache is None:
+                layer.cache = CellFramebuffer(
+                    self.framebuffer.columns, self.framebuffer.rows
+                )
+            layer.cache.clear(None)
+            layer.cache.draw(text_objects, offset)
+            layer.dirty = False
+            layer.cache_offset = offset
+        return layer.cache.get_cells()
+
+    def __screen_rect(
+        self, text_object: TextObject, offset: Position
+    ) -> "pygame.Rect":
+        if text_object.hidden:
+            return None
+        return text_object.get_rect().move(-offset[0], -offset[1])
+
+    def __render_full(self, layers: LayerObjects, offset: Position) -> NoReturn:
+        """Clear the whole surface and redraw every TextObject."""
         self.surface.fill(self.background_colour)
 
-        for text_object in self.text_objects:
-            if not text_object.hidden:
-                text_object.render(self.surface)
+        blits = 0
+        for layer, text_objects in layers:
+            if layer.static:
+                self.surface.blit(
+                    self.__layer_surface(layer, text_objects, offset), (0, 0)
+                )
+                blits += 1
+                continue
+            for text_object in text_objects:
+                if not text_object.hidden:
+                    text_object.render(self.surface, offset)
+                    blits += 1
+        if self.profiler is not None:
+            self.profiler.count("blits", blits)
+            self.profiler.mark("render")
+
+        self.backend.present_surface()
+        if self.profiler is not None:
+            self.profiler.mark("present")
+
+        if self.dirty_rects:
+            self.__cleared_rects = []
+            self.__presented_rects = {
+                text_object: self.__screen_rect(text_object, offset)
+                for layer, text_objects in layers
+                if not layer.static
+                for text_object in text_objects
+            }
+            for text_object in self.__presented_rects:
+                text_object.changed = False
+            self.__full_redraw = False
+
+    def __render_dirty(self, layers: LayerObjects, offset: Position) -> NoReturn:
+        """Clear and redraw only the areas covered by TextObjects that moved,
+        changed or were hidden since the last frame, then update only those
+        areas of the window.
+        """
+        dynamic = [
+            text_object
+            for layer, text_objects in layers
+            if not layer.static
+            for text_object in text_objects
+        ]
+
+        dirty, self.__cleared_rects = self.__cleared_rects, []
+        if self.camera is not None:
+            # Clear TextObjects that left the view
+            in_view = set(dynamic)
+            for text_object in [
+                text_object
+                for text_object in self.__presented_rects
+                if text_object not in in_view
+            ]:
+                last_rect = self.__presented_rects.pop(text_object)
+                if last_rect is not None:
+                    dirty.append(last_rect)
 
-        pygame.display.update()
+        for text_object in dynamic:
+            rect = self.__screen_rect(text_object, offset)
+            last_rect = self.__presented_rects.get(text_object)
+            if text_object.changed or rect != last_rect:
+                if last_rect is not None:
+                    dirty.append(last_rect)
+                if rect is not None:
+                    dirty.append(rect)
+                self.__presented_rects[text_object] = rect
+                text_object.changed = False
+
+        if not dirty:
+            return
+
+        for rect in dirty:
+            self.surface.fill(self.background_colour, rect)
+
+        # Redraw everything overlapping a dirty area, clipped to that area so
+        # draw order is kept
+        blits = 0
+        for layer, text_objects in layers:
+            if layer.static:
+                cache = self.__layer_surface(layer, text_objects, offset)
+                for rect in dirty:
+                    self.surface.blit(cache, rect, rect)
+                blits += len(dirty)
+                continue
+            for text_object in text_objects:
+                # None for hidden TextObjects, which may never have been drawn
+                rect = self.__presented_rects.get(text_object)
+                if rect is None:
+                    continue
+                for i in rect.collidelistall(dirty):
+                    self.surface.set_clip(dirty[i])
+                    text_object.render(self.surface, offset)
+                    blits += 1
+        self.surface.set_clip(None)
+        if self.profiler is not None:
+            self.profiler.count("blits", blits)
+            self.profiler.mark("render")
+
+        self.backend.present_surface(dirty)
+        if self.profiler is not None:
+            self.profiler.mark("present")
+
+    def __render_cells(self, layers: LayerObjects, offset: Position) -> NoReturn:
+        """Composite TextObjects into the cell framebuffer and only draw and
+        update the cells that differ from the last frame.
+        """
+        self.framebuffer.clear(self.background_colour)
+        for layer, text_objects in layers:
+            if layer.static:
+                self.framebuffer.blit(
+                    self.__layer_cells(layer, text_objects, offset), (0, 0)
+                )
+            else:
+                self.framebuffer.draw(text_objects, offset)
+        changed = self.framebuffer.diff()
+        if self.profiler is not None:
+            self.profiler.mark("render")
+
+        if changed.any():
+            self.backend.present_cells(self.framebuffer, changed)
+            if self.profiler is not None:
+                self.profiler.count("blits", int(changed.sum()))
+                self.profiler.mark("present")
 
     def run(self) -> NoReturn:
         """Puts TOW into a update and render loop"""
-        while self.running:
-            self.update()
-            self.render()
-        self.quit()
+        # Quit however the loop ends, e.g. Ctrl-C, so the backend is restored
+        try:
+            while self.running:
+                self.update()
+                self.render()
+        finally:
+            self.quit()
+
+    async def run_async(self) -> NoReturn:
+        """Same as run, but as a coroutine for an asyncio event loop. Other
+        tasks run while the window waits for the next frame, so they can
+        change TextObjects between frames without locks.
+
+            asyncio.run(tow.run_async())
+        """
+        loop = asyncio.get_running_loop()
+        next_frame = loop.time()
+        try:
+            while self.running:
+                await self.update_async()
+                self.render()
+                self.__end_frame()
+
+                # Wait for the next frame without falling behind forever
+                if self.target_FPS:
+                    next_frame += 1 / self.target_FPS
+                next_frame = max(next_frame, loop.time())
+                await asyncio.sleep(next_frame - loop.time())
+        finally:
+            self.__end_frame()
+            self.quit()
+
+    def next_frame(self) -> "asyncio.Future":
+        """Get a future resolved with the run time once run_async has
+        rendered the next frame.
+
+            await tow.next_frame()
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.__frame_waiters.append(future)
+        return future
+
+    def __end_frame(self) -> NoReturn:
+        waiters, self.__frame_waiters = self.__frame_waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(self.run_time)
 
     def quit(self) -> NoReturn:
-        """Uninitialises pygame library if needed."""
-        if pygame.get_init():
-            pygame.quit()
+        """Closes the backend, uninitialising pygame library if needed."""
+        self.stop_recording()
+        self.backend.close()
+
+    def add_layer(self, name: str, z: int = 0, static: bool = False) -> Layer:
+        """Adds a new named layer to draw TextObjects in.
 
-    def add_object(self, text_object: TextObject) -> NoReturn:
+        Arguments:
+        name -- Name of the layer.
+        z -- Layers with a higher z are drawn on top, the default layer is 0.
+        static -- Cache the layer and draw it in a single blit until it
+                  changes, e.g. for backgrounds.
+        """
+        if name in self.layers:
+            raise ValueError("Layer %r already exists!" % name)
+        layer = Layer(name, z, static)
+        self.layers[name] = layer
+        self.__full_redraw = True
+        self.__scene = None
+        return layer
+
+    def add_object(self, text_object: TextObject, layer: str = "default") -> NoReturn:
         """Adds a new TextObject to the window.
 
         Arguments:
         text_object -- The TextObject to add to window.
+        layer -- Name of the layer to draw it in.
+        """
+        if layer not in self.layers:
+            raise ValueError("No layer named %r!" % layer)
+        text_object.removed = False
+        if text_object in self.__removed:
+            # Removed this frame, keep it instead
+            del self.__removed[text_object]
+            for component in text_object.components:
+                component.attach(self)
+            self.scheduler.add(text_object)
+            return
+        if text_object in self.__objects:
+            return
+        self.layers[layer].add(text_object)
+        self.__objects[text_object] = None
+        text_object.window = self
+        text_object.track_moves(self.camera is not None or self.layers[layer].static)
+        for component in text_object.components:
+            component.attach(self)
+        self.scheduler.add(text_object)
+        if self.camera is not None:
+            self.camera.add(text_object)
+
+    def remove_object(self, text_object: TextObject) -> NoReturn:
+        """Removes a TextObject from the window. It is not updated, moved or
+        collided with from now on and leaves the window at the end of the
+        frame, so TextObjects can be removed while the window is updating
+        them. TextObjects from an ObjectPool go back to their pool once removed.
+
+        Arguments:
+        text_object -- The TextObject to remove.
         """
-        self.text_objects.append(text_object)
+        if text_object.window is not self or text_object in self.__removed:
+            return
+        self.__removed[text_object] = None
+        text_object.removed = True
+        self.scheduler.remove(text_object)
+        for component in text_object.components:
+            component.detach(self)
+
+    def __remove_pending(self) -> NoReturn:
+        """Remove every TextObject given to remove_object this frame."""
+        if not self.__removed:
+            return
+        removed, self.__removed = self.__removed, {}
+        for text_object in removed:
+            del self.__objects[text_object]
+            text_object.layer.remove(text_object)
+            if self.camera is not None:
+                self.camera.remove(text_object)
+            rect = self.__presented_rects.pop(text_object, None)
+            if rect is not None:
+                self.__cleared_rects.append(rect)
+            text_object.window = None
+            # So it is not interpolated from where it was if added again
+            text_object.previous_position = None
+            text_object.render_position = None
+            text_object.on_remove()
+            if text_object.pool is not None:
+                text_object.pool.recycle(text_object)
 
     def set_background_colour(self, colour: Tuple) -> NoReturn:
         """Sets the background colour of the window.
@@ -86,5 +886,9 @@ class TextOnlyWindow:
         """
         if type(colour) is tuple and len(colour) == 3:
             self.background_colour = colour
+            self.__full_redraw = True
+            self.__scene = None
+            if self.framebuffer is not None:
+                self.framebuffer.invalidate()
         else:
             raise TypeError("Incorrect background colour format!")
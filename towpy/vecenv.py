@@ -0,0 +1,328 @@
+import os
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Tuple, List, Callable, Sequence, NoReturn
+import pygame
+from towpy.tow import TextOnlyWindow
+from towpy.backend import HeadlessBackend
+from towpy.framebuffer import np, require_numpy
+
+Size = Tuple[int, int]
+
+
+class Environment:
+    """A game simulated without a display, to be stepped by a VecEnv.
+    Subclasses add their TextObjects to the window in build and may score
+    steps with reward and end episodes with done. Every step simulates one
+    frame of frame_time ms, as fast as possible.
+
+    Actions are indices into the actions list, each entry being the keys
+    held down during the step. Pressing and releasing keys posts key events,
+    so ControlComponents work as they do with a keyboard.
+
+    Arguments:
+    size -- Size of the window in cells (Columns, Rows).
+    frame_time -- Time in ms simulated by every step.
+    """
+
+    actions = [()]
+
+    def __init__(self, size: Size = (64, 32), frame_time: int = 16):
+        self.size = tuple(size)
+        self.frame_time = frame_time
+        self.window = None
+        self.__held = set()
+
+    def build(self, window: TextOnlyWindow) -> NoReturn:
+        """Add the TextObjects of a new episode to the window.
+
+        Arguments:
+        window -- Empty window of the episode.
+        """
+        raise NotImplementedError("This should be an overrided method.")
+
+    def reward(self) -> float:
+        """Get the reward of the last step."""
+        return 0.0
+
+    def done(self) -> bool:
+        """Whether the episode ended with the last step."""
+        return False
+
+    def reset(self) -> NoReturn:
+        """Start a new episode in a new headless window."""
+        self.window = TextOnlyWindow(
+            self.size,
+            renderer="cells",
+            backend=HeadlessBackend(frame_time=self.frame_time),
+        )
+        self.__held = set()
+        self.build(self.window)
+        self.window.render()
+
+    def step(self, action: int) -> Tuple[float, bool]:
+        """Hold the keys of an action for one frame. Returns the reward of
+        the step and whether the episode ended.
+
+        Arguments:
+        action -- Index into actions.
+        """
+        keys = set(self.actions[action])
+        backend = self.window.backend
+        for key in self.__held - keys:
+            backend.post(pygame.event.Event(pygame.KEYUP, key=key))
+        for key in keys - self.__held:
+            backend.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        self.__held = keys
+
+        self.window.update()
+        self.window.render()
+        return self.reward(), self.done()
+
+    def observe(self) -> "Cells":
+        """Get the codepoint, foreground and background grids of the window."""
+        return self.window.framebuffer.get_cells()
+
+
+class EnvBatch:
+    """Environments stepped together, writing their observations, rewards
+    and dones into rows of shared arrays. Episodes that end are reset
+    straight away, the observation is then of the new episode.
+
+    Arguments:
+    envs -- The Environments.
+    rows -- Index of the row of every Environment in the arrays.
+    arrays -- Observations, rewards, dones and actions arrays.
+    """
+
+    def __init__(self, envs: List[Environment], rows: Sequence, arrays: Tuple):
+        self.envs = envs
+        self.rows = rows
+        self.observations, self.rewards, self.dones, self.actions = arrays
+
+    def reset(self) -> NoReturn:
+        for env, row in zip(self.envs, self.rows):
+            env.reset()
+            self.__observe(env, row)
+            self.rewards[row] = 0
+            self.dones[row] = False
+
+    def step(self) -> NoReturn:
+        for env, row in zip(self.envs, self.rows):
+            reward, done = env.step(int(self.actions[row]))
+            if done:
+                env.reset()
+            self.__observe(env, row)
+            self.rewards[row] = reward
+            self.dones[row] = done
+
+    def __observe(self, env: Environment, row: int) -> NoReturn:
+        observation = self.observations[row]
+        for i, grid in enumerate(env.observe()):
+            observation[i] = grid
+
+
+def _shared_arrays(
+    buffer: memoryview, num_envs: int, size: Size
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Lay out the observations, rewards, dones and actions arrays of a
+    VecEnv in one buffer.
+    """
+    columns, rows = size
+    shapes = (
+        ((num_envs, 3, rows, columns), np.uint32),
+        ((num_envs,), np.float64),
+        ((num_envs,), np.bool_),
+        ((num_envs,), np.int64),
+    )
+    if buffer is None:
+        return tuple(np.zeros(shape, dtype) for shape, dtype in shapes)
+
+    # Every array is a view of one array over the buffer, which holds on to
+    # the buffer for as long as any of them is alive
+    data = np.frombuffer(buffer, np.uint8)
+    arrays = []
+    offset = 0
+    for shape, dtype in shapes:
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        array = data[offset : offset + nbytes].view(dtype).reshape(shape)
+        arrays.append(array)
+        # Keep every array 8 byte aligned
+        offset += -(-array.nbytes // 8) * 8
+    return tuple(arrays)
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    """Shared memory that may outlive its VecEnv while arrays still view it."""
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            # Still viewed, the mapping is freed along with the last view
+            pass
+
+
+def _shared_size(num_envs: int, size: Size) -> int:
+    columns, rows = size
+    return num_envs * (3 * rows * columns * 4 + 8 + 8 + 8) + 8
+
+
+def _worker(
+    conn: "multiprocessing.connection.Connection",
+    make_env: Callable,
+    rows: range,
+    name: str,
+    num_envs: int,
+    size: Size,
+) -> NoReturn:
+    """Step a batch of Environments whenever told to by the VecEnv."""
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        batch = EnvBatch(
+            [make_env() for _ in rows],
+            rows,
+            _shared_arrays(memory.buf, num_envs, size),
+        )
+        while True:
+            command = conn.recv()
+            if command == "close":
+                break
+            try:
+                getattr(batch, command)()
+                conn.send(None)
+            except Exception:
+                conn.send(traceback.format_exc())
+    finally:
+        batch = None
+        memory.close()
+        conn.close()
+
+
+class VecEnv:
+    """Steps many headless Environments in lockstep on a pool of worker
+    processes. Every step takes a batch of actions, one per environment, and
+    gives back the observations stacked into one array, which lives in
+    shared memory so nothing is copied between processes.
+
+    Observations have the shape (Environments, 3, Rows, Columns) and hold
+    the codepoint, packed foreground and packed background grids of every
+    window. The arrays returned are overwritten by the next step.
+
+    Arguments:
+    make_env -- Function creating an Environment. It is called in the
+                workers, so must be picklable if processes are spawned.
+    num_envs -- Number of environments.
+    processes -- Number of worker processes, by default one per CPU. With 0
+                 environments are stepped in this process.
+    """
+
+    def __init__(self, make_env: Callable, num_envs: int, processes: int = None):
+        require_numpy("VecEnv")
+        if type(num_envs) is not int or num_envs < 1:
+            raise ValueError("Number of environments must be a positive int!")
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.num_envs = num_envs
+        self.size = make_env().size
+        self.processes = min(processes, num_envs)
+        self.__memory = None
+        self.__batch = None
+        self.__workers = []
+        self.closed = False
+
+        if self.processes == 0:
+            arrays = _shared_arrays(None, num_envs, self.size)
+            envs = [make_env() for _ in range(num_envs)]
+            self.__batch = EnvBatch(envs, range(num_envs), arrays)
+        else:
+            self.__memory = _SharedMemory(
+                create=True, size=_shared_size(num_envs, self.size)
+            )
+            arrays = _shared_arrays(self.__memory.buf, num_envs, self.size)
+            self.__start_workers(make_env)
+        self.observations, self.rewards, self.dones, self.actions = arrays
+
+    def __enter__(self) -> "VecEnv":
+        return self
+
+    def __exit__(self, *exc) -> NoReturn:
+        self.close()
+
+    def reset(self) -> "np.ndarray":
+        """Start a new episode in every environment. Returns observations."""
+        self.__run("reset")
+        return self.observations
+
+    def step(
+        self, actions: Sequence[int]
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Step every environment by one frame. Returns (Observations,
+        Rewards, Dones). Environments that are done are reset.
+
+        Arguments:
+        actions -- Index of the action of every environment.
+        """
+        self.actions[:] = actions
+        self.__run("step")
+        return self.observations, self.rewards, self.dones
+
+    def close(self) -> NoReturn:
+        """Stop the workers and free the shared memory. Observations already
+        returned stay readable, they hold the last step.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for conn, process in self.__workers:
+            conn.send("close")
+            process.join()
+            conn.close()
+        self.__workers = []
+        if self.__memory is not None:
+            self.__memory.unlink()
+            try:
+                self.__memory.close()
+            except BufferError:
+                # Observations returned still view it, it is unmapped along
+                # with the last of them
+                pass
+            self.__memory = None
+
+    def __start_workers(self, make_env: Callable) -> NoReturn:
+        per_worker, extra = divmod(self.num_envs, self.processes)
+        start = 0
+        for i in range(self.processes):
+            end = start + per_worker + (i < extra)
+            conn, worker_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(
+                    worker_conn,
+                    make_env,
+                    range(start, end),
+                    self.__memory.name,
+                    self.num_envs,
+                    self.size,
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_conn.close()
+            self.__workers.append((conn, process))
+            start = end
+
+    def __run(self, command: str) -> NoReturn:
+        if self.closed:
+            raise ValueError("VecEnv is closed!")
+        if self.__batch is not None:
+            getattr(self.__batch, command)()
+            return
+
+        for conn, _ in self.__workers:
+            conn.send(command)
+        errors = [conn.recv() for conn, _ in self.__workers]
+        for error in errors:
+            if error is not None:
+                raise RuntimeError("Environment failed in worker:\n" + error)